@@ -0,0 +1,29 @@
+"""add profile embedding revision
+
+Revision ID: 5a7d3e9b1c2f
+Revises: 4e2b7c9d1a6f
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5a7d3e9b1c2f"
+down_revision: Union[str, Sequence[str], None] = "4e2b7c9d1a6f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("profiles", sa.Column("embedding_revision", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("profiles", sa.Column("embedding_built_revision", sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("profiles", "embedding_built_revision")
+    op.drop_column("profiles", "embedding_revision")
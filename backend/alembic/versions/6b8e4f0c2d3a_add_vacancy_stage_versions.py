@@ -0,0 +1,33 @@
+"""add vacancy stage versions
+
+Revision ID: 6b8e4f0c2d3a
+Revises: 5a7d3e9b1c2f
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6b8e4f0c2d3a"
+down_revision: Union[str, Sequence[str], None] = "5a7d3e9b1c2f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("vacancy_parsed", sa.Column("requirements_version", sa.String(length=80), nullable=True))
+    op.add_column("vacancy_parsed", sa.Column("features_version", sa.String(length=50), nullable=True))
+    op.add_column("vacancy_embeddings_v2", sa.Column("text_version", sa.String(length=50), nullable=True))
+    op.add_column("vacancy_embeddings_v2", sa.Column("text_hash", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("vacancy_embeddings_v2", "text_hash")
+    op.drop_column("vacancy_embeddings_v2", "text_version")
+    op.drop_column("vacancy_parsed", "features_version")
+    op.drop_column("vacancy_parsed", "requirements_version")
@@ -0,0 +1,40 @@
+"""create vacancy parse cache
+
+Revision ID: 7c9f5a1d3e4b
+Revises: 6b8e4f0c2d3a
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7c9f5a1d3e4b"
+down_revision: Union[str, Sequence[str], None] = "6b8e4f0c2d3a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "vacancy_parse_cache",
+        sa.Column("description_hash", sa.String(length=64), nullable=False),
+        sa.Column("parser_version", sa.String(length=50), nullable=False),
+        sa.Column("plain_text", sa.Text(), nullable=False),
+        sa.Column("sections_json", postgresql.JSONB(astext_type=sa.Text()), server_default="{}", nullable=False),
+        sa.Column("quality_score", sa.Float(), server_default="0", nullable=False),
+        sa.Column("requirements_version", sa.String(length=80), nullable=False),
+        sa.Column("section_requirements", postgresql.JSONB(astext_type=sa.Text()), server_default="[]", nullable=False),
+        sa.Column("text_requirements", postgresql.JSONB(astext_type=sa.Text()), server_default="[]", nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("description_hash", "parser_version"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("vacancy_parse_cache")
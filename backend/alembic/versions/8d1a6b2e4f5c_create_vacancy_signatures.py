@@ -0,0 +1,45 @@
+"""create vacancy signatures
+
+Revision ID: 8d1a6b2e4f5c
+Revises: 7c9f5a1d3e4b
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8d1a6b2e4f5c"
+down_revision: Union[str, Sequence[str], None] = "7c9f5a1d3e4b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "vacancy_signatures",
+        sa.Column("vacancy_id", sa.Integer(), nullable=False),
+        sa.Column("minhash", postgresql.ARRAY(sa.BigInteger()), nullable=False),
+        sa.Column("lsh_bands", postgresql.ARRAY(sa.BigInteger()), nullable=False),
+        sa.Column("cluster_id", sa.Integer(), nullable=False),
+        sa.Column("text_hash", sa.String(length=64), nullable=False),
+        sa.Column("version", sa.String(length=50), nullable=False),
+        sa.Column("computed_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["vacancy_id"], ["vacancies.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("vacancy_id"),
+    )
+    op.create_index(op.f("ix_vacancy_signatures_cluster_id"), "vacancy_signatures", ["cluster_id"], unique=False)
+    op.create_index(
+        "ix_vacancy_signatures_lsh_bands", "vacancy_signatures", ["lsh_bands"], unique=False, postgresql_using="gin"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_vacancy_signatures_lsh_bands", table_name="vacancy_signatures")
+    op.drop_index(op.f("ix_vacancy_signatures_cluster_id"), table_name="vacancy_signatures")
+    op.drop_table("vacancy_signatures")
@@ -0,0 +1,34 @@
+"""add vacancy listing indexes
+
+Revision ID: 9b2c7d4e6f1a
+Revises: 8d1a6b2e4f5c
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9b2c7d4e6f1a"
+down_revision: Union[str, Sequence[str], None] = "8d1a6b2e4f5c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_vacancies_source_status_id", "vacancies", ["source", "status", "id"], unique=False)
+    op.create_index(
+        "ix_vacancies_status_published_at_id", "vacancies", ["status", "published_at", "id"], unique=False
+    )
+    op.create_index("ix_vacancies_location_id", "vacancies", ["location", "id"], unique=False)
+    op.create_index("ix_vacancies_published_at_id", "vacancies", ["published_at", "id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_vacancies_published_at_id", table_name="vacancies")
+    op.drop_index("ix_vacancies_location_id", table_name="vacancies")
+    op.drop_index("ix_vacancies_status_published_at_id", table_name="vacancies")
+    op.drop_index("ix_vacancies_source_status_id", table_name="vacancies")
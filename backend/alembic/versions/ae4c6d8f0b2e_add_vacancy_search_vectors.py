@@ -0,0 +1,54 @@
+"""add vacancy search vectors
+
+Revision ID: ae4c6d8f0b2e
+Revises: 9b2c7d4e6f1a
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "ae4c6d8f0b2e"
+down_revision: Union[str, Sequence[str], None] = "9b2c7d4e6f1a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TITLE_TSVECTOR_SQL = (
+    "setweight(to_tsvector('russian'::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A')"
+)
+TEXT_TSVECTOR_SQL = (
+    "setweight(to_tsvector('russian'::regconfig, coalesce(plain_text, '')), 'B') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(plain_text, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    op.add_column(
+        "vacancies",
+        sa.Column("search_vector", postgresql.TSVECTOR(), sa.Computed(TITLE_TSVECTOR_SQL, persisted=True), nullable=True),
+    )
+    op.add_column(
+        "vacancy_parsed",
+        sa.Column("search_vector", postgresql.TSVECTOR(), sa.Computed(TEXT_TSVECTOR_SQL, persisted=True), nullable=True),
+    )
+    op.create_index(
+        "ix_vacancies_search_vector", "vacancies", ["search_vector"], unique=False, postgresql_using="gin"
+    )
+    op.create_index(
+        "ix_vacancy_parsed_search_vector", "vacancy_parsed", ["search_vector"], unique=False, postgresql_using="gin"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_vacancy_parsed_search_vector", table_name="vacancy_parsed")
+    op.drop_index("ix_vacancies_search_vector", table_name="vacancies")
+    op.drop_column("vacancy_parsed", "search_vector")
+    op.drop_column("vacancies", "search_vector")
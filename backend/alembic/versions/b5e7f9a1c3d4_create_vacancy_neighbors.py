@@ -0,0 +1,42 @@
+"""create vacancy neighbors
+
+Revision ID: b5e7f9a1c3d4
+Revises: ae4c6d8f0b2e
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b5e7f9a1c3d4"
+down_revision: Union[str, Sequence[str], None] = "ae4c6d8f0b2e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "vacancy_neighbors",
+        sa.Column("vacancy_id", sa.Integer(), nullable=False),
+        sa.Column("neighbor_id", sa.Integer(), nullable=False),
+        sa.Column("rank", sa.Integer(), nullable=False),
+        sa.Column("similarity", sa.Float(), nullable=False),
+        sa.Column("model_name", sa.String(length=120), nullable=False),
+        sa.Column("computed_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["vacancy_id"], ["vacancies.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["neighbor_id"], ["vacancies.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("vacancy_id", "neighbor_id"),
+    )
+    op.create_index(op.f("ix_vacancy_neighbors_neighbor_id"), "vacancy_neighbors", ["neighbor_id"], unique=False)
+    op.create_index("ix_vacancy_neighbors_vacancy_rank", "vacancy_neighbors", ["vacancy_id", "rank"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_vacancy_neighbors_vacancy_rank", table_name="vacancy_neighbors")
+    op.drop_index(op.f("ix_vacancy_neighbors_neighbor_id"), table_name="vacancy_neighbors")
+    op.drop_table("vacancy_neighbors")
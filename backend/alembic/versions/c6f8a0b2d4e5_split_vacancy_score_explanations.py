@@ -0,0 +1,59 @@
+"""split vacancy score explanations
+
+Revision ID: c6f8a0b2d4e5
+Revises: b5e7f9a1c3d4
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c6f8a0b2d4e5"
+down_revision: Union[str, Sequence[str], None] = "b5e7f9a1c3d4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "vacancy_score_explanations",
+        sa.Column("score_id", sa.Integer(), nullable=False),
+        sa.Column("explanation", postgresql.JSONB(astext_type=sa.Text()), server_default=sa.text("'{}'::jsonb"), nullable=False),
+        sa.ForeignKeyConstraint(["score_id"], ["vacancy_scores.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("score_id"),
+    )
+    op.execute(
+        "INSERT INTO vacancy_score_explanations (score_id, explanation) SELECT id, explanation FROM vacancy_scores"
+    )
+    op.drop_column("vacancy_scores", "explanation")
+
+    op.create_index(
+        "ix_vacancy_scores_profile_final_score",
+        "vacancy_scores",
+        ["profile_id", sa.text("final_score DESC")],
+        unique=False,
+        postgresql_include=["vacancy_id", "verdict", "computed_at"],
+    )
+    # Покрывается новым индексом и uq_vacancy_scores_profile_vacancy.
+    op.drop_index(op.f("ix_vacancy_scores_profile_id"), table_name="vacancy_scores")
+
+
+def downgrade() -> None:
+    op.create_index(op.f("ix_vacancy_scores_profile_id"), "vacancy_scores", ["profile_id"], unique=False)
+    op.drop_index("ix_vacancy_scores_profile_final_score", table_name="vacancy_scores")
+
+    op.add_column(
+        "vacancy_scores",
+        sa.Column("explanation", postgresql.JSONB(astext_type=sa.Text()), server_default=sa.text("'{}'::jsonb"), nullable=False),
+    )
+    op.execute(
+        "UPDATE vacancy_scores AS s SET explanation = e.explanation "
+        "FROM vacancy_score_explanations AS e WHERE e.score_id = s.id"
+    )
+    op.drop_table("vacancy_score_explanations")
@@ -0,0 +1,54 @@
+"""add vacancy score components
+
+Revision ID: d8a0c2e4f6b1
+Revises: c6f8a0b2d4e5
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d8a0c2e4f6b1"
+down_revision: Union[str, Sequence[str], None] = "c6f8a0b2d4e5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("vacancy_scores", sa.Column("hard_coverage", sa.Float(), server_default="0", nullable=False))
+    op.add_column("vacancy_scores", sa.Column("nice_coverage", sa.Float(), server_default="0", nullable=False))
+    op.add_column("vacancy_scores", sa.Column("eligible", sa.Boolean(), server_default="true", nullable=False))
+    op.add_column("vacancy_scores", sa.Column("overqualified", sa.Boolean(), server_default="false", nullable=False))
+    op.add_column("vacancy_scores", sa.Column("salary_warning", sa.Boolean(), server_default="false", nullable=False))
+    op.add_column("vacancy_scores", sa.Column("no_requirements", sa.Boolean(), server_default="false", nullable=False))
+    op.add_column("vacancy_scores", sa.Column("weights_version", sa.String(length=50), server_default="v1", nullable=False))
+
+    # Компоненты уже посчитанных пар восстанавливаются из explanation (final.components, final.penalties).
+    op.execute(
+        """
+        UPDATE vacancy_scores AS s
+        SET hard_coverage = COALESCE((e.explanation #>> '{final,components,hard}')::float, 0),
+            nice_coverage = COALESCE((e.explanation #>> '{final,components,nice}')::float, 0),
+            eligible = COALESCE((e.explanation #>> '{eligibility,ok}')::boolean, true),
+            overqualified = COALESCE(e.explanation -> 'final' -> 'penalties' ? 'overqualified', false),
+            salary_warning = COALESCE(e.explanation -> 'final' -> 'penalties' ? 'salary_warning', false),
+            no_requirements = COALESCE(e.explanation -> 'final' -> 'penalties' ? 'no_skill_requirements_cap', false)
+        FROM vacancy_score_explanations AS e
+        WHERE e.score_id = s.id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("vacancy_scores", "weights_version")
+    op.drop_column("vacancy_scores", "no_requirements")
+    op.drop_column("vacancy_scores", "salary_warning")
+    op.drop_column("vacancy_scores", "overqualified")
+    op.drop_column("vacancy_scores", "eligible")
+    op.drop_column("vacancy_scores", "nice_coverage")
+    op.drop_column("vacancy_scores", "hard_coverage")
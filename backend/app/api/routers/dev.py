@@ -1,9 +1,10 @@
 from celery import chain
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query, status
 
 from app.schemas.tasks import RecomputeAllTasksResponse, TaskEnqueueResponse
 from app.tasks.embedding_tasks import build_profile_embedding
-from app.tasks.matching_tasks import compute_profile_recommendations
+from app.services.matching.weights import get_weights
+from app.tasks.matching_tasks import apply_scoring_weights, compute_profile_recommendations
 from app.tasks.profile_backfill_tasks import backfill_profile
 
 router = APIRouter(prefix="/dev", tags=["dev"])
@@ -39,3 +40,17 @@ def recompute_profile_all(
             "compute_profile_recommendations": recommendation_task_id,
         }
     )
+
+
+@router.post("/matching/weights/apply")
+def apply_matching_weights(
+    version: str | None = Query(default=None, description="weights version; default is the active one"),
+    batch_size: int = Query(default=5000, ge=1, le=100000),
+) -> dict[str, str | int]:
+    try:
+        weights = get_weights(version)
+    except KeyError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc.args[0])) from exc
+
+    task = apply_scoring_weights.delay(weights.version, batch_size)
+    return {"status": "enqueued", "task_id": task.id, "weights_version": weights.version, "batch_size": batch_size}
@@ -5,7 +5,8 @@ from sqlalchemy.orm import Session
 from app.db.models import Profile, ProfileEmbedding, Vacancy, VacancyEmbedding
 from app.db.session import get_db
 from app.tasks.embedding_tasks import build_profile_embedding, build_vacancy_embedding
-from app.tasks.vacancy_parsing_tasks import backfill_hh_parsed
+from app.tasks.neighbor_tasks import rebuild_vacancy_neighbors
+from app.tasks.vacancy_parsing_tasks import backfill_hh_parsed, rebuild_vacancy_clusters
 
 router = APIRouter(tags=["embeddings"])
 
@@ -96,6 +97,8 @@ def backfill_hh_vacancies_parsed(
     schedule_recommendations: bool = Query(default=True),
     embedding_batch_size: int = Query(default=256, ge=1, le=5000),
     recommendations_limit: int = Query(default=50, ge=1, le=500),
+    chunk_size: int = Query(default=1000, ge=1, le=20000),
+    schedule_scores: bool = Query(default=True),
 ) -> dict[str, str | int | bool | None]:
     task = backfill_hh_parsed.delay(
         limit=limit,
@@ -104,6 +107,8 @@ def backfill_hh_vacancies_parsed(
         schedule_recommendations=schedule_recommendations,
         embedding_batch_size=embedding_batch_size,
         recommendations_limit=recommendations_limit,
+        chunk_size=chunk_size,
+        schedule_scores=schedule_scores,
     )
     return {
         "status": "enqueued",
@@ -114,4 +119,22 @@ def backfill_hh_vacancies_parsed(
         "schedule_recommendations": schedule_recommendations,
         "embedding_batch_size": embedding_batch_size,
         "recommendations_limit": recommendations_limit,
+        "chunk_size": chunk_size,
+        "schedule_scores": schedule_scores,
     }
+
+
+@router.post("/dev/vacancies/dedup/rebuild")
+def rebuild_vacancy_duplicate_clusters(
+    batch_size: int = Query(default=1000, ge=1, le=20000),
+) -> dict[str, str | int]:
+    task = rebuild_vacancy_clusters.delay(batch_size=batch_size)
+    return {"status": "enqueued", "task_id": task.id, "batch_size": batch_size}
+
+
+@router.post("/dev/vacancies/neighbors/rebuild")
+def rebuild_similar_vacancies(
+    batch_size: int = Query(default=500, ge=1, le=20000),
+) -> dict[str, str | int]:
+    task = rebuild_vacancy_neighbors.delay(batch_size=batch_size)
+    return {"status": "enqueued", "task_id": task.id, "batch_size": batch_size}
@@ -0,0 +1,41 @@
+from typing import Optional
+
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+
+from app.services.data_export import BATCH_SIZE, ExportDataset, stream_with_session
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+
+def _attachment(filename: str) -> dict[str, str]:
+    return {"Content-Disposition": f'attachment; filename="{filename}"'}
+
+
+# Сессия создаётся внутри генератора: зависимость get_db закрывается до начала отдачи тела.
+@router.get("/{dataset}.ndjson")
+def export_ndjson(
+    dataset: ExportDataset,
+    profile_id: Optional[int] = Query(default=None, description="vacancy_scores: only this profile"),
+    model_name: Optional[str] = Query(default=None, description="vacancy_embeddings: only this model"),
+    batch_size: int = Query(default=BATCH_SIZE, ge=100, le=50000),
+) -> StreamingResponse:
+    return StreamingResponse(
+        stream_with_session(
+            dataset, "ndjson", profile_id=profile_id, model_name=model_name, batch_size=batch_size
+        ),
+        media_type="application/x-ndjson",
+        headers=_attachment(f"{dataset}.ndjson"),
+    )
+
+
+@router.get("/vacancy_embeddings.npy")
+def export_embeddings_npy(
+    model_name: Optional[str] = Query(default=None),
+    batch_size: int = Query(default=BATCH_SIZE, ge=100, le=50000),
+) -> StreamingResponse:
+    return StreamingResponse(
+        stream_with_session("vacancy_embeddings", "npy", model_name=model_name, batch_size=batch_size),
+        media_type="application/octet-stream",
+        headers=_attachment("vacancy_embeddings.npy"),
+    )
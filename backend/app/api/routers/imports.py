@@ -1,7 +1,7 @@
 from typing import Any
 from urllib.parse import parse_qs, urlparse
 
-from celery.result import AsyncResult
+from celery.result import AsyncResult, GroupResult
 from fastapi import APIRouter
 
 from app.celery_app import celery_app
@@ -70,9 +70,50 @@ def get_task_status(task_id: str) -> TaskStatusResponse:
     task_result: AsyncResult = celery_app.AsyncResult(task_id)
 
     if task_result.state == "SUCCESS":
-        return TaskStatusResponse(task_id=task_id, state=task_result.state, result=task_result.result)
+        return TaskStatusResponse(
+            task_id=task_id,
+            state=task_result.state,
+            result=task_result.result,
+            progress=_group_progress(task_result.result),
+        )
 
     if task_result.state == "FAILURE":
         return TaskStatusResponse(task_id=task_id, state=task_result.state, error=str(task_result.result))
 
     return TaskStatusResponse(task_id=task_id, state=task_result.state)
+
+
+def _group_progress(result: Any) -> dict[str, Any] | None:
+    """Aggregated progress of a fanned-out task (result with ``group_id``), e.g. backfill_hh_parsed."""
+
+    if not isinstance(result, dict) or not result.get("group_id"):
+        return None
+
+    group_result = GroupResult.restore(result["group_id"], app=celery_app)
+    if group_result is None:
+        return None
+
+    chunks_done = 0
+    chunks_failed = 0
+    processed = 0
+    errors = 0
+    for chunk in group_result.results:
+        if chunk.state == "SUCCESS":
+            chunks_done += 1
+            chunk_payload = chunk.result if isinstance(chunk.result, dict) else {}
+            processed += int(chunk_payload.get("processed") or 0)
+            errors += int(chunk_payload.get("errors") or 0)
+        elif chunk.state == "FAILURE":
+            chunks_failed += 1
+
+    chunks_total = len(group_result.results)
+    return {
+        "targeted": result.get("targeted"),
+        "chunks_total": chunks_total,
+        "chunks_done": chunks_done,
+        "chunks_failed": chunks_failed,
+        "processed": processed,
+        "errors": errors,
+        "finished": chunks_done + chunks_failed == chunks_total,
+        "finalize_task_id": result.get("finalize_task_id"),
+    }
@@ -1,9 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import select
+from typing import Any
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from sqlalchemy import Text, cast, func, literal, or_, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.models import Profile, ResumeEvidence, Vacancy, VacancyScore
-from app.db.session import get_db
+from app.db.models import (
+    Profile,
+    ResumeEvidence,
+    Vacancy,
+    VacancyScore,
+    VacancyScoreExplanation,
+    VacancySignature,
+)
+from app.db.session import get_async_db, get_async_read_db, get_db
 from app.schemas.matching import (
     RecommendationItem,
     RecommendationsResponse,
@@ -11,45 +22,176 @@ from app.schemas.matching import (
     TailoringResponse,
 )
 from app.services.matching.matching_service import MatchingService
+from app.services.matching.weights import ScoringWeights, final_score_sql, get_weights, verdict_sql, with_final
+from app.services.response_cache import cached_json_response, invalidate_profiles_async, make_etag
 from app.tasks.matching_tasks import compute_profile_recommendations
 
 router = APIRouter(prefix="/profiles", tags=["matching"])
 
 
-@router.get("/{profile_id}/recommendations", response_model=RecommendationsResponse)
-def get_recommendations(
+# Только поля карточки: description и прочие широкие колонки вакансии не читаются.
+_VACANCY_CARD_COLUMNS = (Vacancy.id, Vacancy.title, Vacancy.company_name, Vacancy.location, Vacancy.url)
+
+
+def _recommendation_item(row: Any, duplicate_ids: list[int] | None = None) -> RecommendationItem:
+    return RecommendationItem(
+        id=row.id,
+        title=row.title,
+        company_name=row.company_name,
+        location=row.location,
+        url=row.url,
+        final_score=row.final_score,
+        verdict=row.verdict,
+        duplicate_ids=duplicate_ids or [],
+    )
+
+
+async def _load_recommendations(
+    db: AsyncSession,
     profile_id: int,
-    limit: int = Query(default=50, ge=1, le=500),
-    db: Session = Depends(get_db),
-):
-    profile = db.get(Profile, profile_id)
-    if profile is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    limit: int,
+    collapse_duplicates: bool,
+    weights: ScoringWeights | None = None,
+) -> RecommendationsResponse:
+    # Без weights читаются только колонки ix_vacancy_scores_profile_final_score (index-only scan);
+    # с weights final_score и verdict пересчитываются из компонентов прямо в запросе.
+    final_score = VacancyScore.final_score if weights is None else final_score_sql(weights)
+    verdict = VacancyScore.verdict if weights is None else verdict_sql(weights, final_score)
+    if not collapse_duplicates:
+        top = (
+            select(VacancyScore.vacancy_id, final_score.label("final_score"), verdict.label("verdict"))
+            .where(VacancyScore.profile_id == profile_id)
+            .order_by(final_score.desc(), VacancyScore.vacancy_id.asc())
+            .limit(limit)
+            .subquery()
+        )
+        rows = (
+            await db.execute(
+                select(top.c.final_score, top.c.verdict, *_VACANCY_CARD_COLUMNS)
+                .join(Vacancy, Vacancy.id == top.c.vacancy_id)
+                .order_by(top.c.final_score.desc(), top.c.vacancy_id.asc())
+            )
+        ).all()
+        items = [_recommendation_item(row) for row in rows]
+        return RecommendationsResponse(profile_id=profile_id, items=items)
 
-    rows = db.execute(
-        select(VacancyScore, Vacancy)
-        .join(Vacancy, Vacancy.id == VacancyScore.vacancy_id)
+    # Из каждого кластера near-duplicate показываем лучшую по score вакансию, остальные — в duplicate_ids.
+    cluster_key = func.coalesce(VacancySignature.cluster_id, VacancyScore.vacancy_id)
+    ranked = (
+        select(
+            VacancyScore.vacancy_id,
+            final_score.label("final_score"),
+            verdict.label("verdict"),
+            cluster_key.label("cluster_key"),
+            func.row_number()
+            .over(partition_by=cluster_key, order_by=(final_score.desc(), VacancyScore.vacancy_id.asc()))
+            .label("rank"),
+        )
+        .outerjoin(VacancySignature, VacancySignature.vacancy_id == VacancyScore.vacancy_id)
         .where(VacancyScore.profile_id == profile_id)
-        .order_by(VacancyScore.final_score.desc(), VacancyScore.id.asc())
-        .limit(limit)
+        .subquery()
+    )
+    rows = (
+        await db.execute(
+            select(ranked.c.final_score, ranked.c.verdict, ranked.c.cluster_key, *_VACANCY_CARD_COLUMNS)
+            .join(Vacancy, Vacancy.id == ranked.c.vacancy_id)
+            .where(ranked.c.rank == 1)
+            .order_by(ranked.c.final_score.desc(), ranked.c.vacancy_id.asc())
+            .limit(limit)
+        )
     ).all()
 
+    members_by_cluster: dict[int, list[int]] = {}
+    cluster_keys = [row.cluster_key for row in rows]
+    if cluster_keys:
+        for vacancy_id, cluster_id in await db.execute(
+            select(VacancySignature.vacancy_id, VacancySignature.cluster_id)
+            .where(VacancySignature.cluster_id.in_(cluster_keys))
+            .order_by(VacancySignature.vacancy_id.asc())
+        ):
+            members_by_cluster.setdefault(cluster_id, []).append(vacancy_id)
+
     items = [
-        RecommendationItem(
-            id=vacancy.id,
-            title=vacancy.title,
-            company_name=vacancy.company_name,
-            location=vacancy.location,
-            url=vacancy.url,
-            final_score=score.final_score,
-            verdict=score.verdict,
+        _recommendation_item(
+            row,
+            duplicate_ids=[
+                vacancy_id for vacancy_id in members_by_cluster.get(row.cluster_key, []) if vacancy_id != row.id
+            ],
         )
-        for score, vacancy in rows
+        for row in rows
     ]
 
     return RecommendationsResponse(profile_id=profile_id, items=items)
 
 
+def _card_validators(profile_id: int, collapse_duplicates: bool) -> list:
+    """ETag parts for what the items embed besides scores: vacancy card fields and cluster membership."""
+
+    scored_ids = select(VacancyScore.vacancy_id).where(VacancyScore.profile_id == profile_id)
+    validators = [select(func.max(Vacancy.updated_at)).where(Vacancy.id.in_(scored_ids)).scalar_subquery()]
+    if collapse_duplicates:
+        # duplicate_ids зависят и от участников кластеров, у которых нет своего score.
+        membership = cast(VacancySignature.vacancy_id, Text) + ":" + cast(VacancySignature.cluster_id, Text)
+        validators.append(
+            select(func.md5(func.string_agg(membership, aggregate_order_by(literal(","), VacancySignature.vacancy_id))))
+            .where(or_(VacancySignature.vacancy_id.in_(scored_ids), VacancySignature.cluster_id.in_(scored_ids)))
+            .scalar_subquery()
+        )
+    return validators
+
+
+def _query_weights(weights_version: str | None) -> ScoringWeights | None:
+    if weights_version is None:
+        return None
+    try:
+        return get_weights(weights_version)
+    except KeyError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc.args[0])) from exc
+
+
+_WEIGHTS_QUERY = Query(
+    default=None, alias="weights", description="re-derive final score and verdict with this scoring weights version"
+)
+
+
+@router.get("/{profile_id}/recommendations", response_model=RecommendationsResponse)
+async def get_recommendations(
+    profile_id: int,
+    limit: int = Query(default=50, ge=1, le=500),
+    collapse_duplicates: bool = Query(default=True),
+    weights_version: str | None = _WEIGHTS_QUERY,
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    weights = _query_weights(weights_version)
+
+    # Валидаторы ETag — один запрос без рендеринга; join'ы выполняются только если ответ изменился.
+    validators = (
+        await db.execute(
+            select(
+                Profile.updated_at,
+                Profile.embedding_revision,
+                select(func.max(VacancyScore.computed_at))
+                .where(VacancyScore.profile_id == profile_id)
+                .scalar_subquery(),
+                select(func.count()).where(VacancyScore.profile_id == profile_id).scalar_subquery(),
+                *_card_validators(profile_id, collapse_duplicates),
+            ).where(Profile.id == profile_id)
+        )
+    ).one_or_none()
+    if validators is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+
+    etag = make_etag("recommendations", profile_id, *validators, limit, collapse_duplicates, weights)
+    return await cached_json_response(
+        profile_id,
+        f"recommendations:{limit}:{int(collapse_duplicates)}:{weights_version or ''}",
+        etag,
+        if_none_match,
+        lambda: _load_recommendations(db, profile_id, limit, collapse_duplicates, weights),
+    )
+
+
 @router.post("/{profile_id}/recommendations/recompute", response_model=RecomputeTaskResponse)
 def recompute_recommendations(
     profile_id: int,
@@ -64,50 +206,76 @@ def recompute_recommendations(
     return RecomputeTaskResponse(task_id=task.id)
 
 
+def _compute_pair(db: Session, profile_id: int, vacancy_id: int) -> VacancyScore:
+    return MatchingService(db).compute_for_pair(profile_id=profile_id, vacancy_id=vacancy_id)
+
+
 @router.get("/{profile_id}/vacancies/{vacancy_id}/tailoring", response_model=TailoringResponse)
-def get_tailoring(
+async def get_tailoring(
     profile_id: int,
     vacancy_id: int,
-    db: Session = Depends(get_db),
+    weights_version: str | None = _WEIGHTS_QUERY,
+    if_none_match: str | None = Header(default=None),
+    db: AsyncSession = Depends(get_async_read_db),
+    # Соединение с primary берётся только при промахе: AsyncSession подключается лениво.
+    primary_db: AsyncSession = Depends(get_async_db),
 ):
-    service = MatchingService(db)
+    weights = _query_weights(weights_version)
+    score_filter = (VacancyScore.profile_id == profile_id, VacancyScore.vacancy_id == vacancy_id)
+    computed_at = (await db.execute(select(VacancyScore.computed_at).where(*score_filter))).scalar_one_or_none()
 
-    score = db.execute(
-        select(VacancyScore).where(
-            VacancyScore.profile_id == profile_id,
-            VacancyScore.vacancy_id == vacancy_id,
-        )
-    ).scalar_one_or_none()
-
-    if score is None:
+    if computed_at is None:
+        # Редкий путь: синхронный MatchingService через greenlet; пишет в primary,
+        # и объяснение читается оттуда же — реплика может его ещё не получить.
+        db = primary_db
         try:
-            score = service.compute_for_pair(profile_id=profile_id, vacancy_id=vacancy_id)
+            computed_at = (await db.run_sync(_compute_pair, profile_id, vacancy_id)).computed_at
+            await invalidate_profiles_async([profile_id])
         except ValueError as exc:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
 
-    evidence_rows = db.execute(
-        select(
-            ResumeEvidence.evidence_text,
-            ResumeEvidence.confidence,
-            ResumeEvidence.evidence_type,
-        )
-        .where(
-            ResumeEvidence.profile_id == profile_id,
-            ResumeEvidence.vacancy_id == vacancy_id,
+    async def render() -> TailoringResponse:
+        # Итоговые score и verdict берутся из строки score (или пересчитываются весами запроса),
+        # а не из JSONB: после смены весов там остались бы старые значения.
+        scored = (
+            await db.execute(
+                select(VacancyScore, VacancyScoreExplanation.explanation)
+                .join(VacancyScoreExplanation, VacancyScoreExplanation.score_id == VacancyScore.id)
+                .where(*score_filter)
+            )
+        ).one_or_none()
+        evidence_rows = (
+            await db.execute(
+                select(
+                    ResumeEvidence.evidence_text,
+                    ResumeEvidence.confidence,
+                    ResumeEvidence.evidence_type,
+                )
+                .where(
+                    ResumeEvidence.profile_id == profile_id,
+                    ResumeEvidence.vacancy_id == vacancy_id,
+                )
+                .order_by(ResumeEvidence.confidence.desc(), ResumeEvidence.id.asc())
+            )
+        ).all()
+
+        return TailoringResponse(
+            profile_id=profile_id,
+            vacancy_id=vacancy_id,
+            explanation=with_final(scored.explanation, scored.VacancyScore, weights) if scored is not None else {},
+            evidence=[
+                {
+                    "evidence_text": row.evidence_text,
+                    "confidence": row.confidence,
+                    "evidence_type": row.evidence_type,
+                }
+                for row in evidence_rows
+            ],
         )
-        .order_by(ResumeEvidence.confidence.desc(), ResumeEvidence.id.asc())
-    ).all()
 
-    return TailoringResponse(
-        profile_id=profile_id,
-        vacancy_id=vacancy_id,
-        explanation=score.explanation,
-        evidence=[
-            {
-                "evidence_text": row.evidence_text,
-                "confidence": row.confidence,
-                "evidence_type": row.evidence_type,
-            }
-            for row in evidence_rows
-        ],
+    # Объяснение и evidence пишутся вместе со score, а применение весов обновляет computed_at,
+    # поэтому computed_at их полностью описывает.
+    etag = make_etag("tailoring", profile_id, vacancy_id, computed_at, weights)
+    return await cached_json_response(
+        profile_id, f"tailoring:{vacancy_id}:{weights_version or ''}", etag, if_none_match, render
     )
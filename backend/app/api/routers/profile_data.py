@@ -17,7 +17,8 @@ from app.db.models import (
     ProfileSkill,
     ResumeVersion,
 )
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
+from app.services.profile_refresh import mark_profile_dirty
 from app.schemas.cover_letter_version import (
     CoverLetterVersionCreate,
     CoverLetterVersionRead,
@@ -49,7 +50,7 @@ def _get_owned_or_404(db: Session, model: Any, profile_id: int, item_id: int, de
 
 
 @router.get("/{profile_id}/experiences", response_model=list[ProfileExperienceRead])
-def list_experiences(profile_id: int, db: Session = Depends(get_db)):
+def list_experiences(profile_id: int, db: Session = Depends(get_read_db)):
     _ensure_profile(db, profile_id)
     return db.query(ProfileExperience).filter(ProfileExperience.profile_id == profile_id).order_by(ProfileExperience.id.desc()).all()
 
@@ -59,6 +60,7 @@ def create_experience(profile_id: int, payload: ProfileExperienceCreate, db: Ses
     _ensure_profile(db, profile_id)
     item = ProfileExperience(profile_id=profile_id, **payload.model_dump())
     db.add(item)
+    mark_profile_dirty(db, profile_id)
     db.commit()
     db.refresh(item)
     return item
@@ -69,6 +71,7 @@ def update_experience(profile_id: int, item_id: int, payload: ProfileExperienceU
     item = _get_owned_or_404(db, ProfileExperience, profile_id, item_id, "Experience not found")
     for field, value in payload.model_dump(exclude_unset=True).items():
         setattr(item, field, value)
+    mark_profile_dirty(db, profile_id)
     db.commit()
     db.refresh(item)
     return item
@@ -78,11 +81,12 @@ def update_experience(profile_id: int, item_id: int, payload: ProfileExperienceU
 def delete_experience(profile_id: int, item_id: int, db: Session = Depends(get_db)):
     item = _get_owned_or_404(db, ProfileExperience, profile_id, item_id, "Experience not found")
     db.delete(item)
+    mark_profile_dirty(db, profile_id)
     db.commit()
 
 
 @router.get("/{profile_id}/projects", response_model=list[ProfileProjectRead])
-def list_projects(profile_id: int, db: Session = Depends(get_db)):
+def list_projects(profile_id: int, db: Session = Depends(get_read_db)):
     _ensure_profile(db, profile_id)
     return db.query(ProfileProject).filter(ProfileProject.profile_id == profile_id).order_by(ProfileProject.id.desc()).all()
 
@@ -92,6 +96,7 @@ def create_project(profile_id: int, payload: ProfileProjectCreate, db: Session =
     _ensure_profile(db, profile_id)
     item = ProfileProject(profile_id=profile_id, **payload.model_dump())
     db.add(item)
+    mark_profile_dirty(db, profile_id)
     db.commit()
     db.refresh(item)
     return item
@@ -102,6 +107,7 @@ def update_project(profile_id: int, item_id: int, payload: ProfileProjectUpdate,
     item = _get_owned_or_404(db, ProfileProject, profile_id, item_id, "Project not found")
     for field, value in payload.model_dump(exclude_unset=True).items():
         setattr(item, field, value)
+    mark_profile_dirty(db, profile_id)
     db.commit()
     db.refresh(item)
     return item
@@ -111,11 +117,12 @@ def update_project(profile_id: int, item_id: int, payload: ProfileProjectUpdate,
 def delete_project(profile_id: int, item_id: int, db: Session = Depends(get_db)):
     item = _get_owned_or_404(db, ProfileProject, profile_id, item_id, "Project not found")
     db.delete(item)
+    mark_profile_dirty(db, profile_id)
     db.commit()
 
 
 @router.get("/{profile_id}/achievements", response_model=list[ProfileAchievementRead])
-def list_achievements(profile_id: int, db: Session = Depends(get_db)):
+def list_achievements(profile_id: int, db: Session = Depends(get_read_db)):
     _ensure_profile(db, profile_id)
     return db.query(ProfileAchievement).filter(ProfileAchievement.profile_id == profile_id).order_by(ProfileAchievement.id.desc()).all()
 
@@ -125,6 +132,7 @@ def create_achievement(profile_id: int, payload: ProfileAchievementCreate, db: S
     _ensure_profile(db, profile_id)
     item = ProfileAchievement(profile_id=profile_id, **payload.model_dump())
     db.add(item)
+    mark_profile_dirty(db, profile_id)
     db.commit()
     db.refresh(item)
     return item
@@ -135,6 +143,7 @@ def update_achievement(profile_id: int, item_id: int, payload: ProfileAchievemen
     item = _get_owned_or_404(db, ProfileAchievement, profile_id, item_id, "Achievement not found")
     for field, value in payload.model_dump(exclude_unset=True).items():
         setattr(item, field, value)
+    mark_profile_dirty(db, profile_id)
     db.commit()
     db.refresh(item)
     return item
@@ -144,11 +153,12 @@ def update_achievement(profile_id: int, item_id: int, payload: ProfileAchievemen
 def delete_achievement(profile_id: int, item_id: int, db: Session = Depends(get_db)):
     item = _get_owned_or_404(db, ProfileAchievement, profile_id, item_id, "Achievement not found")
     db.delete(item)
+    mark_profile_dirty(db, profile_id)
     db.commit()
 
 
 @router.get("/{profile_id}/education", response_model=list[ProfileEducationRead])
-def list_education(profile_id: int, db: Session = Depends(get_db)):
+def list_education(profile_id: int, db: Session = Depends(get_read_db)):
     _ensure_profile(db, profile_id)
     return db.query(ProfileEducation).filter(ProfileEducation.profile_id == profile_id).order_by(ProfileEducation.id.desc()).all()
 
@@ -158,6 +168,7 @@ def create_education(profile_id: int, payload: ProfileEducationCreate, db: Sessi
     _ensure_profile(db, profile_id)
     item = ProfileEducation(profile_id=profile_id, **payload.model_dump())
     db.add(item)
+    mark_profile_dirty(db, profile_id)
     db.commit()
     db.refresh(item)
     return item
@@ -168,6 +179,7 @@ def update_education(profile_id: int, item_id: int, payload: ProfileEducationUpd
     item = _get_owned_or_404(db, ProfileEducation, profile_id, item_id, "Education not found")
     for field, value in payload.model_dump(exclude_unset=True).items():
         setattr(item, field, value)
+    mark_profile_dirty(db, profile_id)
     db.commit()
     db.refresh(item)
     return item
@@ -177,11 +189,12 @@ def update_education(profile_id: int, item_id: int, payload: ProfileEducationUpd
 def delete_education(profile_id: int, item_id: int, db: Session = Depends(get_db)):
     item = _get_owned_or_404(db, ProfileEducation, profile_id, item_id, "Education not found")
     db.delete(item)
+    mark_profile_dirty(db, profile_id)
     db.commit()
 
 
 @router.get("/{profile_id}/certificates", response_model=list[ProfileCertificateRead])
-def list_certificates(profile_id: int, db: Session = Depends(get_db)):
+def list_certificates(profile_id: int, db: Session = Depends(get_read_db)):
     _ensure_profile(db, profile_id)
     return (
         db.query(ProfileCertificate).filter(ProfileCertificate.profile_id == profile_id).order_by(ProfileCertificate.id.desc()).all()
@@ -193,6 +206,7 @@ def create_certificate(profile_id: int, payload: ProfileCertificateCreate, db: S
     _ensure_profile(db, profile_id)
     item = ProfileCertificate(profile_id=profile_id, **payload.model_dump())
     db.add(item)
+    mark_profile_dirty(db, profile_id)
     db.commit()
     db.refresh(item)
     return item
@@ -203,6 +217,7 @@ def update_certificate(profile_id: int, item_id: int, payload: ProfileCertificat
     item = _get_owned_or_404(db, ProfileCertificate, profile_id, item_id, "Certificate not found")
     for field, value in payload.model_dump(exclude_unset=True).items():
         setattr(item, field, value)
+    mark_profile_dirty(db, profile_id)
     db.commit()
     db.refresh(item)
     return item
@@ -212,11 +227,12 @@ def update_certificate(profile_id: int, item_id: int, payload: ProfileCertificat
 def delete_certificate(profile_id: int, item_id: int, db: Session = Depends(get_db)):
     item = _get_owned_or_404(db, ProfileCertificate, profile_id, item_id, "Certificate not found")
     db.delete(item)
+    mark_profile_dirty(db, profile_id)
     db.commit()
 
 
 @router.get("/{profile_id}/skills", response_model=list[ProfileSkillRead])
-def list_skills(profile_id: int, db: Session = Depends(get_db)):
+def list_skills(profile_id: int, db: Session = Depends(get_read_db)):
     _ensure_profile(db, profile_id)
     return db.query(ProfileSkill).filter(ProfileSkill.profile_id == profile_id).order_by(ProfileSkill.id.desc()).all()
 
@@ -226,6 +242,7 @@ def create_skill(profile_id: int, payload: ProfileSkillCreate, db: Session = Dep
     _ensure_profile(db, profile_id)
     item = ProfileSkill(profile_id=profile_id, **payload.model_dump())
     db.add(item)
+    mark_profile_dirty(db, profile_id)
     db.commit()
     db.refresh(item)
     return item
@@ -236,6 +253,7 @@ def update_skill(profile_id: int, item_id: int, payload: ProfileSkillUpdate, db:
     item = _get_owned_or_404(db, ProfileSkill, profile_id, item_id, "Skill not found")
     for field, value in payload.model_dump(exclude_unset=True).items():
         setattr(item, field, value)
+    mark_profile_dirty(db, profile_id)
     db.commit()
     db.refresh(item)
     return item
@@ -245,11 +263,12 @@ def update_skill(profile_id: int, item_id: int, payload: ProfileSkillUpdate, db:
 def delete_skill(profile_id: int, item_id: int, db: Session = Depends(get_db)):
     item = _get_owned_or_404(db, ProfileSkill, profile_id, item_id, "Skill not found")
     db.delete(item)
+    mark_profile_dirty(db, profile_id)
     db.commit()
 
 
 @router.get("/{profile_id}/languages", response_model=list[ProfileLanguageRead])
-def list_languages(profile_id: int, db: Session = Depends(get_db)):
+def list_languages(profile_id: int, db: Session = Depends(get_read_db)):
     _ensure_profile(db, profile_id)
     return db.query(ProfileLanguage).filter(ProfileLanguage.profile_id == profile_id).order_by(ProfileLanguage.id.desc()).all()
 
@@ -259,6 +278,7 @@ def create_language(profile_id: int, payload: ProfileLanguageCreate, db: Session
     _ensure_profile(db, profile_id)
     item = ProfileLanguage(profile_id=profile_id, **payload.model_dump())
     db.add(item)
+    mark_profile_dirty(db, profile_id)
     db.commit()
     db.refresh(item)
     return item
@@ -269,6 +289,7 @@ def update_language(profile_id: int, item_id: int, payload: ProfileLanguageUpdat
     item = _get_owned_or_404(db, ProfileLanguage, profile_id, item_id, "Language not found")
     for field, value in payload.model_dump(exclude_unset=True).items():
         setattr(item, field, value)
+    mark_profile_dirty(db, profile_id)
     db.commit()
     db.refresh(item)
     return item
@@ -278,11 +299,12 @@ def update_language(profile_id: int, item_id: int, payload: ProfileLanguageUpdat
 def delete_language(profile_id: int, item_id: int, db: Session = Depends(get_db)):
     item = _get_owned_or_404(db, ProfileLanguage, profile_id, item_id, "Language not found")
     db.delete(item)
+    mark_profile_dirty(db, profile_id)
     db.commit()
 
 
 @router.get("/{profile_id}/links", response_model=list[ProfileLinkRead])
-def list_links(profile_id: int, db: Session = Depends(get_db)):
+def list_links(profile_id: int, db: Session = Depends(get_read_db)):
     _ensure_profile(db, profile_id)
     return db.query(ProfileLink).filter(ProfileLink.profile_id == profile_id).order_by(ProfileLink.id.desc()).all()
 
@@ -315,7 +337,7 @@ def delete_link(profile_id: int, item_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/{profile_id}/resume-versions", response_model=list[ResumeVersionRead])
-def list_resume_versions(profile_id: int, db: Session = Depends(get_db)):
+def list_resume_versions(profile_id: int, db: Session = Depends(get_read_db)):
     _ensure_profile(db, profile_id)
     return db.query(ResumeVersion).filter(ResumeVersion.profile_id == profile_id).order_by(ResumeVersion.id.desc()).all()
 
@@ -325,6 +347,7 @@ def create_resume_version(profile_id: int, payload: ResumeVersionCreate, db: Ses
     _ensure_profile(db, profile_id)
     item = ResumeVersion(profile_id=profile_id, **payload.model_dump())
     db.add(item)
+    mark_profile_dirty(db, profile_id)
     db.commit()
     db.refresh(item)
     return item
@@ -335,6 +358,7 @@ def update_resume_version(profile_id: int, item_id: int, payload: ResumeVersionU
     item = _get_owned_or_404(db, ResumeVersion, profile_id, item_id, "Resume version not found")
     for field, value in payload.model_dump(exclude_unset=True).items():
         setattr(item, field, value)
+    mark_profile_dirty(db, profile_id)
     db.commit()
     db.refresh(item)
     return item
@@ -345,13 +369,14 @@ def approve_resume_version(profile_id: int, item_id: int, db: Session = Depends(
     item = _get_owned_or_404(db, ResumeVersion, profile_id, item_id, "Resume version not found")
     item.status = "approved"
     item.approved_at = datetime.utcnow()
+    mark_profile_dirty(db, profile_id)
     db.commit()
     db.refresh(item)
     return item
 
 
 @router.get("/{profile_id}/cover-letter-versions", response_model=list[CoverLetterVersionRead])
-def list_cover_letter_versions(profile_id: int, db: Session = Depends(get_db)):
+def list_cover_letter_versions(profile_id: int, db: Session = Depends(get_read_db)):
     _ensure_profile(db, profile_id)
     return (
         db.query(CoverLetterVersion)
@@ -1,12 +1,21 @@
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.db.models import Profile
-from app.db.session import get_db
+from app.db.session import get_async_read_db, get_db
 from app.schemas.profile import ProfileCreate, ProfileRead, ProfileUpdate
-from app.tasks.embedding_tasks import build_profile_embedding
+from app.schemas.profile_full import ProfileFullRead, ProfileFullUpdate
+from app.services.profile_aggregate import (
+    ProfileItemNotFound,
+    apply_profile_changes,
+    load_profile_full,
+    profile_full_statement,
+)
+from app.services.profile_refresh import mark_profile_dirty
 
 router = APIRouter(prefix="/profiles", tags=["profiles"])
 
@@ -15,20 +24,21 @@ router = APIRouter(prefix="/profiles", tags=["profiles"])
 def create_profile(payload: ProfileCreate, db: Session = Depends(get_db)):
     profile = Profile(**payload.model_dump())
     db.add(profile)
+    db.flush()
+    mark_profile_dirty(db, profile.id)
     db.commit()
     db.refresh(profile)
-    build_profile_embedding.delay(profile.id)
     return profile
 
 
 @router.get("", response_model=List[ProfileRead])
-def list_profiles(db: Session = Depends(get_db)):
-    return db.query(Profile).order_by(Profile.id.desc()).all()
+async def list_profiles(db: AsyncSession = Depends(get_async_read_db)):
+    return (await db.execute(select(Profile).order_by(Profile.id.desc()))).scalars().all()
 
 
 @router.get("/{profile_id}", response_model=ProfileRead)
-def get_profile_by_id(profile_id: int, db: Session = Depends(get_db)):
-    profile = db.get(Profile, profile_id)
+async def get_profile_by_id(profile_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    profile = await db.get(Profile, profile_id)
     if profile is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
     return profile
@@ -43,7 +53,31 @@ def update_profile(profile_id: int, payload: ProfileUpdate, db: Session = Depend
     for field, value in payload.model_dump(exclude_unset=True).items():
         setattr(profile, field, value)
 
+    mark_profile_dirty(db, profile.id)
     db.commit()
     db.refresh(profile)
-    build_profile_embedding.delay(profile.id)
     return profile
+
+
+@router.get("/{profile_id}/full", response_model=ProfileFullRead)
+async def get_profile_full(profile_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    """Profile with all sub-resources in a constant number of queries."""
+
+    profile = (await db.execute(profile_full_statement(profile_id))).scalar_one_or_none()
+    if profile is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return profile
+
+
+@router.put("/{profile_id}/full", response_model=ProfileFullRead)
+def update_profile_full(profile_id: int, payload: ProfileFullUpdate, db: Session = Depends(get_db)):
+    """Apply profile field changes and sub-resource create/update/delete batches in one commit."""
+
+    try:
+        apply_profile_changes(db, profile_id, payload)
+    except ProfileItemNotFound as exc:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=exc.detail) from exc
+
+    db.commit()
+    return load_profile_full(db, profile_id)
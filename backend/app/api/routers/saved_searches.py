@@ -2,10 +2,11 @@ from typing import Any
 from urllib.parse import parse_qs, urlparse
 
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.db.models import SavedSearch
-from app.db.session import get_db
+from app.db.session import get_async_read_db, get_db, get_read_db
 from app.integrations.hh_client import HHClient
 from app.schemas.saved_searches import (
     SavedSearchCreate,
@@ -28,7 +29,7 @@ def create_saved_search(payload: SavedSearchCreate, db: Session = Depends(get_db
 
 
 @router.get("/saved-searches", response_model=list[SavedSearchResponse])
-def list_saved_searches(db: Session = Depends(get_db)) -> list[SavedSearch]:
+def list_saved_searches(db: Session = Depends(get_read_db)) -> list[SavedSearch]:
     return db.query(SavedSearch).order_by(SavedSearch.id.desc()).all()
 
 
@@ -62,10 +63,14 @@ def sync_saved_search(saved_search_id: int, db: Session = Depends(get_db)) -> Sa
 
 
 @router.get("/saved-searches/{saved_search_id}/clusters")
-async def get_saved_search_clusters(saved_search_id: int, db: Session = Depends(get_db)) -> dict[str, Any]:
-    saved_search = db.get(SavedSearch, saved_search_id)
+async def get_saved_search_clusters(
+    saved_search_id: int, db: AsyncSession = Depends(get_async_read_db)
+) -> dict[str, Any]:
+    saved_search = await db.get(SavedSearch, saved_search_id)
     if not saved_search:
         raise HTTPException(status_code=404, detail="Saved search not found")
+    # Соединение возвращаем в пул до запроса к HH: загруженные атрибуты доступны и после close.
+    await db.close()
 
     async with HHClient() as hh_client:
         response = await hh_client.get_vacancy_clusters(
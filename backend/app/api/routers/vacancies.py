@@ -1,14 +1,39 @@
-from typing import List
+import base64
+import binascii
+import json
+import logging
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import Any, Literal
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import delete
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app.db.models import Vacancy, VacancyRequirement
-from app.db.session import get_db
-from app.schemas.vacancy import VacancyCreate, VacancyRead, VacancyUpdate
+from app.db.session import get_async_read_db, get_db, get_read_db
+from app.schemas.vacancy import (
+    VacancyBulkError,
+    VacancyBulkResponse,
+    VacancyCreate,
+    VacancyListItem,
+    VacancyPage,
+    VacancyRead,
+    VacancySearchItem,
+    VacancySearchResponse,
+    VacancySimilarItem,
+    VacancySimilarResponse,
+    VacancyUpdate,
+)
+from app.services import vacancy_bulk, vacancy_dedup, vacancy_neighbors, vacancy_search
 from app.services.requirements_extractor import extract_skill_requirements
-from app.tasks.embedding_tasks import build_vacancy_embedding
+from app.tasks.embedding_tasks import build_vacancy_embedding, rebuild_vacancy_embeddings_for_ids
+from app.tasks.neighbor_tasks import refresh_vacancy_neighbors
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/vacancies", tags=["vacancies"])
 
@@ -56,19 +81,294 @@ def create_vacancy(payload: VacancyCreate, db: Session = Depends(get_db)):
     return vacancy
 
 
-@router.get("", response_model=List[VacancyRead])
-def list_vacancies(db: Session = Depends(get_db)):
-    return db.query(Vacancy).order_by(Vacancy.id.desc()).all()
+async def _iter_bulk_payloads(request: Request) -> AsyncIterator[Any]:
+    """Items of a JSON array / ``{"items": [...]}`` body, or lines of an NDJSON stream (read incrementally)."""
+
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type or "jsonl" in content_type:
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield _decode_ndjson_line(line)
+        if buffer.strip():
+            yield _decode_ndjson_line(buffer)
+        return
+
+    try:
+        body = await request.json()
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON body") from exc
+    items = body.get("items") if isinstance(body, dict) else body
+    if not isinstance(items, list):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Expected a JSON array of vacancies or an object with an 'items' array",
+        )
+    for item in items:
+        yield item
+
+
+def _decode_ndjson_line(line: bytes) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+
+def _validation_detail(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'item'}: {error['msg']}" for error in exc.errors()
+    )
+
+
+def _write_bulk_chunk(db: Session, payloads: list[dict[str, Any]]) -> vacancy_bulk.BulkUpsertResult:
+    try:
+        result = vacancy_bulk.upsert_vacancies(db, payloads)
+        db.commit()
+        return result
+    except Exception:
+        db.rollback()
+        raise
+
+
+@router.post("/bulk", response_model=VacancyBulkResponse)
+async def bulk_upsert_vacancies(
+    request: Request,
+    chunk_size: int = Query(default=vacancy_bulk.CHUNK_SIZE, ge=1, le=5000),
+    schedule_embeddings: bool = Query(default=True),
+    db: Session = Depends(get_db),
+) -> VacancyBulkResponse:
+    """Upsert many vacancies on (source, external_id).
+
+    Body: JSON array, ``{"items": [...]}`` or NDJSON (``Content-Type: application/x-ndjson``).
+    Each chunk is one transaction; invalid items are reported in ``errors`` and skipped.
+    One embedding job is scheduled for all written vacancies.
+    """
+
+    received = 0
+    created = 0
+    updated = 0
+    vacancy_ids: list[int] = []
+    errors: list[VacancyBulkError] = []
+    chunk: list[tuple[int, dict[str, Any]]] = []
+
+    async def flush() -> None:
+        nonlocal created, updated
+        if not chunk:
+            return
+        try:
+            result = await run_in_threadpool(_write_bulk_chunk, db, [payload for _, payload in chunk])
+        except Exception:  # noqa: BLE001
+            logger.exception("Failed to write vacancy bulk chunk | size=%s", len(chunk))
+            errors.extend(VacancyBulkError(index=index, detail="chunk write failed") for index, _ in chunk)
+        else:
+            created += result.created
+            updated += result.updated
+            vacancy_ids.extend(result.vacancy_ids)
+        chunk.clear()
+
+    async for raw_item in _iter_bulk_payloads(request):
+        index = received
+        received += 1
+        if not isinstance(raw_item, dict):
+            errors.append(VacancyBulkError(index=index, detail="item must be a JSON object"))
+            continue
+        try:
+            payload = VacancyCreate.model_validate(raw_item)
+        except ValidationError as exc:
+            errors.append(VacancyBulkError(index=index, detail=_validation_detail(exc)))
+            continue
+        chunk.append((index, payload.model_dump()))
+        if len(chunk) >= chunk_size:
+            await flush()
+    await flush()
+
+    embedding_task_id = None
+    unique_ids = sorted(set(vacancy_ids))
+    if schedule_embeddings and unique_ids:
+        embedding_task_id = rebuild_vacancy_embeddings_for_ids.delay(unique_ids, only_changed=True).id
+
+    return VacancyBulkResponse(
+        received=received,
+        created=created,
+        updated=updated,
+        failed=len(errors),
+        vacancy_ids=unique_ids,
+        errors=errors,
+        embedding_task_id=embedding_task_id,
+    )
+
+
+_LIST_COLUMNS = tuple(getattr(Vacancy, name) for name in VacancyListItem.model_fields)
+
+
+def _encode_cursor(vacancy_id: int, published_at: datetime | None) -> str:
+    payload: dict[str, Any] = {"id": vacancy_id}
+    if published_at is not None:
+        payload["published_at"] = published_at.isoformat()
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort: str) -> tuple[int, datetime | None]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        vacancy_id = int(payload["id"])
+        published_at = datetime.fromisoformat(payload["published_at"]) if sort == "published_at" else None
+    except (binascii.Error, ValueError, KeyError, TypeError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+    return vacancy_id, published_at
+
+
+@router.get("", response_model=VacancyPage)
+async def list_vacancies(
+    limit: int = Query(default=50, ge=1, le=500),
+    cursor: str | None = Query(default=None, description="next_cursor of the previous page"),
+    sort: Literal["id", "published_at"] = Query(default="id"),
+    source: str | None = Query(default=None),
+    vacancy_status: str | None = Query(default=None, alias="status"),
+    location: str | None = Query(default=None),
+    salary_min: int | None = Query(default=None, ge=0),
+    salary_max: int | None = Query(default=None, ge=0),
+    published_from: datetime | None = Query(default=None),
+    published_to: datetime | None = Query(default=None),
+    db: AsyncSession = Depends(get_async_read_db),
+) -> VacancyPage:
+    """Newest first, keyset-paginated; ``sort=published_at`` skips vacancies without ``published_at``."""
+
+    stmt = select(*_LIST_COLUMNS)
+    if source is not None:
+        stmt = stmt.where(Vacancy.source == source)
+    if vacancy_status is not None:
+        stmt = stmt.where(Vacancy.status == vacancy_status)
+    if location is not None:
+        stmt = stmt.where(Vacancy.location == location)
+    # Вилка вакансии пересекается с запрошенным диапазоном; вакансии без зарплаты под фильтр не попадают.
+    if salary_min is not None:
+        stmt = stmt.where(func.coalesce(Vacancy.salary_to, Vacancy.salary_from) >= salary_min)
+    if salary_max is not None:
+        stmt = stmt.where(func.coalesce(Vacancy.salary_from, Vacancy.salary_to) <= salary_max)
+    if published_from is not None:
+        stmt = stmt.where(Vacancy.published_at >= published_from)
+    if published_to is not None:
+        stmt = stmt.where(Vacancy.published_at < published_to)
+
+    if sort == "published_at":
+        stmt = stmt.where(Vacancy.published_at.is_not(None))
+        if cursor is not None:
+            cursor_id, cursor_published_at = _decode_cursor(cursor, sort)
+            stmt = stmt.where(tuple_(Vacancy.published_at, Vacancy.id) < tuple_(cursor_published_at, cursor_id))
+        stmt = stmt.order_by(Vacancy.published_at.desc(), Vacancy.id.desc())
+    else:
+        if cursor is not None:
+            cursor_id, _ = _decode_cursor(cursor, sort)
+            stmt = stmt.where(Vacancy.id < cursor_id)
+        stmt = stmt.order_by(Vacancy.id.desc())
+
+    rows = (await db.execute(stmt.limit(limit + 1))).mappings().all()
+    items = [VacancyListItem.model_validate(dict(row)) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = _encode_cursor(last.id, last.published_at if sort == "published_at" else None)
+    return VacancyPage(items=items, next_cursor=next_cursor, limit=limit)
+
+
+@router.get("/search", response_model=VacancySearchResponse)
+def search_vacancies(
+    q: str = Query(min_length=1, max_length=500),
+    mode: Literal["lexical", "hybrid"] = Query(default="lexical"),
+    language: Literal["auto", "russian", "english"] = Query(default="auto"),
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0, le=1000),
+    semantic_weight: float = Query(default=0.5, ge=0.0, le=1.0),
+    source: str | None = Query(default=None),
+    vacancy_status: str | None = Query(default=None, alias="status"),
+    db: Session = Depends(get_read_db),
+) -> VacancySearchResponse:
+    """Full-text search over title and parsed text; ``mode=hybrid`` fuses it with vector similarity of the query."""
+
+    hits = vacancy_search.search_vacancies(
+        db,
+        q,
+        mode=mode,
+        language=language,
+        limit=limit,
+        offset=offset,
+        semantic_weight=semantic_weight,
+        source=source,
+        status=vacancy_status,
+    )
+    rows_by_id = {}
+    if hits:
+        rows_by_id = {
+            row["id"]: row
+            for row in db.execute(
+                select(*_LIST_COLUMNS).where(Vacancy.id.in_([hit.vacancy_id for hit in hits]))
+            ).mappings()
+        }
+
+    items = [
+        VacancySearchItem(
+            **rows_by_id[hit.vacancy_id],
+            score=hit.score,
+            lexical_rank=hit.lexical_rank,
+            semantic=hit.semantic,
+        )
+        for hit in hits
+        if hit.vacancy_id in rows_by_id
+    ]
+    return VacancySearchResponse(query=q, mode=mode, items=items)
 
 
 @router.get("/{vacancy_id}", response_model=VacancyRead)
-def get_vacancy_by_id(vacancy_id: int, db: Session = Depends(get_db)):
-    vacancy = db.get(Vacancy, vacancy_id)
+async def get_vacancy_by_id(vacancy_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    vacancy = await db.get(Vacancy, vacancy_id)
     if vacancy is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Vacancy not found")
     return vacancy
 
 
+@router.get("/{vacancy_id}/similar", response_model=VacancySimilarResponse)
+def get_similar_vacancies(
+    vacancy_id: int,
+    limit: int = Query(default=10, ge=1, le=vacancy_neighbors.NEIGHBORS_TOP_N),
+    db: Session = Depends(get_read_db),
+) -> VacancySimilarResponse:
+    """Precomputed nearest vacancies; falls back to a live ANN query (and schedules the list) if not computed yet."""
+
+    if db.get(Vacancy, vacancy_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Vacancy not found")
+
+    source = "precomputed"
+    neighbors = vacancy_neighbors.stored_neighbors(db, vacancy_id, limit)
+    if not neighbors:
+        source = "live"
+        model_name, neighbors = vacancy_neighbors.live_neighbors(db, vacancy_id, limit)
+        if model_name is not None:
+            try:
+                refresh_vacancy_neighbors.delay([vacancy_id])
+            except Exception:  # noqa: BLE001
+                logger.exception("Failed to enqueue vacancy neighbors refresh | vacancy_id=%s", vacancy_id)
+
+    rows_by_id = {}
+    if neighbors:
+        rows_by_id = {
+            row["id"]: row
+            for row in db.execute(
+                select(*_LIST_COLUMNS).where(Vacancy.id.in_([neighbor_id for neighbor_id, _ in neighbors]))
+            ).mappings()
+        }
+    items = [
+        VacancySimilarItem(**rows_by_id[neighbor_id], similarity=similarity)
+        for neighbor_id, similarity in neighbors
+        if neighbor_id in rows_by_id
+    ]
+    return VacancySimilarResponse(vacancy_id=vacancy_id, source=source, items=items)
+
+
 @router.put("/{vacancy_id}", response_model=VacancyRead)
 def update_vacancy(vacancy_id: int, payload: VacancyUpdate, db: Session = Depends(get_db)):
     vacancy = db.get(Vacancy, vacancy_id)
@@ -95,5 +395,7 @@ def delete_vacancy(vacancy_id: int, db: Session = Depends(get_db)):
     if vacancy is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Vacancy not found")
 
+    # Иначе дубликаты остались бы с cluster_id удалённого представителя и пропали из рекомендаций.
+    vacancy_dedup.reelect_representatives(db, [vacancy_id])
     db.delete(vacancy)
     db.commit()
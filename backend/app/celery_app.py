@@ -2,13 +2,13 @@ import os
 
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_process_init
 
-from app.services.embeddings.provider import validate_embedding_configuration
+from app.core.config import get_embedding_settings
+from app.services.embeddings.provider import validate_embedding_configuration, warm_up_embedding_provider
 
 SYNC_INTERVAL_MINUTES = int(os.getenv("SAVED_SEARCH_SYNC_INTERVAL_MINUTES", "5"))
 
-validate_embedding_configuration()
-
 celery_app = Celery(
     "job_search_worker",
     broker=os.getenv("CELERY_BROKER_URL", "redis://redis:6379/0"),
@@ -23,3 +23,11 @@ celery_app.conf.beat_schedule = {
 }
 
 celery_app.autodiscover_tasks(["app"])
+
+
+@worker_process_init.connect
+def init_embedding_provider(**_kwargs) -> None:
+    # Beat и API не инициализируют модель; воркер проверяет конфиг и прогревает модель только по EMBEDDING_WARMUP.
+    validate_embedding_configuration()
+    if get_embedding_settings().warmup_on_worker_start:
+        warm_up_embedding_provider()
@@ -1,3 +1,31 @@
-from app.core.config import LLMSettings, get_llm_settings, validate_llm_settings
+from app.core.config import (
+    EmbeddingSettings,
+    LLMSettings,
+    ProfileRefreshSettings,
+    ResponseCacheSettings,
+    VacancyDedupSettings,
+    VacancySearchSettings,
+    get_embedding_settings,
+    get_llm_settings,
+    get_profile_refresh_settings,
+    get_response_cache_settings,
+    get_vacancy_dedup_settings,
+    get_vacancy_search_settings,
+    validate_llm_settings,
+)
 
-__all__ = ["LLMSettings", "get_llm_settings", "validate_llm_settings"]
+__all__ = [
+    "EmbeddingSettings",
+    "LLMSettings",
+    "ProfileRefreshSettings",
+    "ResponseCacheSettings",
+    "VacancyDedupSettings",
+    "VacancySearchSettings",
+    "get_embedding_settings",
+    "get_llm_settings",
+    "get_profile_refresh_settings",
+    "get_response_cache_settings",
+    "get_vacancy_dedup_settings",
+    "get_vacancy_search_settings",
+    "validate_llm_settings",
+]
@@ -21,7 +21,72 @@ class LLMSettings:
     openai_api_key: str | None
 
 
-def _as_bool(raw_value: str | None, *, default: bool) -> bool:
+DEFAULT_FASTEMBED_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+
+# Известные пары "fp32 модель -> квантованный вариант" из реестра fastembed.
+_FASTEMBED_QUANTIZED_VARIANTS = {
+    "nomic-ai/nomic-embed-text-v1.5": "nomic-ai/nomic-embed-text-v1.5-Q",
+}
+
+
+@dataclass(frozen=True)
+class EmbeddingSettings:
+    provider: str
+    model_name: str
+    quantized_model_name: str | None
+    use_quantized: bool
+    threads: int | None
+    batch_size: int
+    parallel: int | None
+    server_url: str | None
+    server_socket: str | None
+    server_timeout_s: float
+    server_backend: str
+    server_max_batch_size: int
+    server_max_wait_ms: int
+    warmup_on_worker_start: bool
+
+    @property
+    def active_model_name(self) -> str:
+        """Имя модели, которую реально загружает провайдер."""
+
+        if self.use_quantized and self.quantized_model_name:
+            return self.quantized_model_name
+        return self.model_name
+
+
+@dataclass(frozen=True)
+class ProfileRefreshSettings:
+    debounce_s: float
+    refresh_recommendations: bool
+    recommendations_limit: int
+
+
+@dataclass(frozen=True)
+class VacancyDedupSettings:
+    enabled: bool
+    threshold: float
+
+
+@dataclass(frozen=True)
+class VacancySearchSettings:
+    query_embedding_cache_size: int
+    query_embedding_cache_ttl_s: float
+    hybrid_candidates: int
+    rrf_k: int
+
+
+@dataclass(frozen=True)
+class ResponseCacheSettings:
+    redis_url: str | None
+    ttl_s: int
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.redis_url)
+
+
+def _as_bool(raw_value: str | None, *, default: bool, name: str) -> bool:
     if raw_value is None:
         return default
 
@@ -32,11 +97,25 @@ def _as_bool(raw_value: str | None, *, default: bool) -> bool:
         return False
 
     raise ValueError(
-        f"Invalid boolean value for GIGACHAT_VERIFY_SSL: {raw_value!r}. "
+        f"Invalid boolean value for {name}: {raw_value!r}. "
         "Use one of: true/false, 1/0, yes/no, on/off."
     )
 
 
+def _as_optional_int(raw_value: str | None, *, name: str, minimum: int = 0) -> int | None:
+    if raw_value is None or not raw_value.strip():
+        return None
+
+    try:
+        value = int(raw_value)
+    except ValueError as exc:
+        raise ValueError(f"Invalid integer value for {name}: {raw_value!r}.") from exc
+
+    if value < minimum:
+        raise ValueError(f"{name} must be >= {minimum}. Got: {value}")
+    return value
+
+
 @lru_cache(maxsize=1)
 def get_llm_settings() -> LLMSettings:
     provider_raw = os.getenv("LLM_PROVIDER", "gigachat").strip().lower()
@@ -57,7 +136,7 @@ def get_llm_settings() -> LLMSettings:
             "GIGACHAT_OAUTH_URL", "https://ngw.devices.sberbank.ru:9443/api/v2/oauth"
         ),
         gigachat_api_base=os.getenv("GIGACHAT_API_BASE", "https://gigachat.devices.sberbank.ru"),
-        gigachat_verify_ssl=_as_bool(os.getenv("GIGACHAT_VERIFY_SSL"), default=True),
+        gigachat_verify_ssl=_as_bool(os.getenv("GIGACHAT_VERIFY_SSL"), default=True, name="GIGACHAT_VERIFY_SSL"),
         openai_api_key=os.getenv("OPENAI_API_KEY"),
     )
 
@@ -86,3 +165,131 @@ def reset_llm_settings_cache() -> None:
     """Utility for tests/dev to re-read env after changes."""
 
     get_llm_settings.cache_clear()
+
+
+@lru_cache(maxsize=1)
+def get_embedding_settings() -> EmbeddingSettings:
+    model_name = os.getenv("FASTEMBED_MODEL_NAME") or os.getenv("EMBEDDING_MODEL_NAME", DEFAULT_FASTEMBED_MODEL)
+    use_quantized = _as_bool(os.getenv("FASTEMBED_QUANTIZED"), default=False, name="FASTEMBED_QUANTIZED")
+    quantized_model_name = os.getenv("FASTEMBED_QUANTIZED_MODEL_NAME") or _FASTEMBED_QUANTIZED_VARIANTS.get(
+        model_name
+    )
+
+    if use_quantized and not quantized_model_name:
+        raise ValueError(
+            "FASTEMBED_QUANTIZED is enabled, but no quantized variant is known for "
+            f"{model_name!r}. Set FASTEMBED_QUANTIZED_MODEL_NAME explicitly."
+        )
+
+    server_max_wait_ms = _as_optional_int(
+        os.getenv("EMBEDDING_SERVER_MAX_WAIT_MS"), name="EMBEDDING_SERVER_MAX_WAIT_MS", minimum=0
+    )
+
+    return EmbeddingSettings(
+        provider=os.getenv("EMBEDDING_PROVIDER", "fastembed").strip().lower(),
+        model_name=model_name,
+        quantized_model_name=quantized_model_name,
+        use_quantized=use_quantized,
+        threads=_as_optional_int(os.getenv("FASTEMBED_THREADS"), name="FASTEMBED_THREADS", minimum=1),
+        batch_size=_as_optional_int(os.getenv("FASTEMBED_BATCH_SIZE"), name="FASTEMBED_BATCH_SIZE", minimum=1)
+        or 256,
+        parallel=_as_optional_int(os.getenv("FASTEMBED_PARALLEL"), name="FASTEMBED_PARALLEL", minimum=0),
+        server_url=os.getenv("EMBEDDING_SERVER_URL") or None,
+        server_socket=os.getenv("EMBEDDING_SERVER_SOCKET") or None,
+        server_timeout_s=float(os.getenv("EMBEDDING_SERVER_TIMEOUT_S") or "30"),
+        server_backend=(os.getenv("EMBEDDING_SERVER_BACKEND") or "fastembed").strip().lower(),
+        server_max_batch_size=_as_optional_int(
+            os.getenv("EMBEDDING_SERVER_MAX_BATCH_SIZE"), name="EMBEDDING_SERVER_MAX_BATCH_SIZE", minimum=1
+        )
+        or 64,
+        server_max_wait_ms=10 if server_max_wait_ms is None else server_max_wait_ms,
+        warmup_on_worker_start=_as_bool(os.getenv("EMBEDDING_WARMUP"), default=False, name="EMBEDDING_WARMUP"),
+    )
+
+
+def reset_embedding_settings_cache() -> None:
+    """Utility for tests/dev to re-read embedding env after changes."""
+
+    get_embedding_settings.cache_clear()
+
+
+@lru_cache(maxsize=1)
+def get_profile_refresh_settings() -> ProfileRefreshSettings:
+    debounce_s = float(os.getenv("PROFILE_REFRESH_DEBOUNCE_S") or "15")
+    if debounce_s < 0:
+        raise ValueError("PROFILE_REFRESH_DEBOUNCE_S must be >= 0")
+
+    return ProfileRefreshSettings(
+        debounce_s=debounce_s,
+        refresh_recommendations=_as_bool(
+            os.getenv("PROFILE_REFRESH_RECOMMENDATIONS"), default=False, name="PROFILE_REFRESH_RECOMMENDATIONS"
+        ),
+        recommendations_limit=_as_optional_int(
+            os.getenv("PROFILE_REFRESH_RECOMMENDATIONS_LIMIT"), name="PROFILE_REFRESH_RECOMMENDATIONS_LIMIT", minimum=1
+        )
+        or 50,
+    )
+
+
+def reset_profile_refresh_settings_cache() -> None:
+    """Utility for tests/dev to re-read profile refresh env after changes."""
+
+    get_profile_refresh_settings.cache_clear()
+
+
+@lru_cache(maxsize=1)
+def get_vacancy_dedup_settings() -> VacancyDedupSettings:
+    threshold = float(os.getenv("VACANCY_DEDUP_THRESHOLD") or "0.8")
+    if not 0 < threshold <= 1:
+        raise ValueError("VACANCY_DEDUP_THRESHOLD must be in (0, 1]")
+
+    return VacancyDedupSettings(
+        enabled=_as_bool(os.getenv("VACANCY_DEDUP_ENABLED"), default=True, name="VACANCY_DEDUP_ENABLED"),
+        threshold=threshold,
+    )
+
+
+def reset_vacancy_dedup_settings_cache() -> None:
+    """Utility for tests/dev to re-read near-duplicate detection env after changes."""
+
+    get_vacancy_dedup_settings.cache_clear()
+
+
+@lru_cache(maxsize=1)
+def get_vacancy_search_settings() -> VacancySearchSettings:
+    ttl_s = float(os.getenv("SEARCH_QUERY_EMBEDDING_CACHE_TTL_S") or "3600")
+    if ttl_s < 0:
+        raise ValueError("SEARCH_QUERY_EMBEDDING_CACHE_TTL_S must be >= 0")
+
+    cache_size = _as_optional_int(
+        os.getenv("SEARCH_QUERY_EMBEDDING_CACHE_SIZE"), name="SEARCH_QUERY_EMBEDDING_CACHE_SIZE", minimum=0
+    )
+    return VacancySearchSettings(
+        query_embedding_cache_size=1024 if cache_size is None else cache_size,
+        query_embedding_cache_ttl_s=ttl_s,
+        hybrid_candidates=_as_optional_int(
+            os.getenv("SEARCH_HYBRID_CANDIDATES"), name="SEARCH_HYBRID_CANDIDATES", minimum=1
+        )
+        or 200,
+        rrf_k=_as_optional_int(os.getenv("SEARCH_RRF_K"), name="SEARCH_RRF_K", minimum=1) or 60,
+    )
+
+
+def reset_vacancy_search_settings_cache() -> None:
+    """Utility for tests/dev to re-read vacancy search env after changes."""
+
+    get_vacancy_search_settings.cache_clear()
+
+
+@lru_cache(maxsize=1)
+def get_response_cache_settings() -> ResponseCacheSettings:
+    return ResponseCacheSettings(
+        redis_url=(os.getenv("RESPONSE_CACHE_REDIS_URL") or "").strip() or None,
+        ttl_s=_as_optional_int(os.getenv("RESPONSE_CACHE_TTL_S"), name="RESPONSE_CACHE_TTL_S", minimum=1) or 300,
+    )
+
+
+def reset_response_cache_settings_cache() -> None:
+    """Utility for tests/dev to re-read response cache env after changes."""
+
+    get_response_cache_settings.cache_clear()
@@ -4,28 +4,49 @@ from typing import Any, Optional
 
 from pgvector.sqlalchemy import Vector
 from sqlalchemy import (
+    BigInteger,
     Boolean,
+    Computed,
     Date,
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     UniqueConstraint,
     func,
+    text,
 )
-from sqlalchemy.dialects.postgresql import JSONB
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.session import Base
 
+VACANCY_TITLE_TSVECTOR_SQL = (
+    "setweight(to_tsvector('russian'::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A')"
+)
+VACANCY_TEXT_TSVECTOR_SQL = (
+    "setweight(to_tsvector('russian'::regconfig, coalesce(plain_text, '')), 'B') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(plain_text, '')), 'B')"
+)
+
 EMBEDDING_DIM = int(os.getenv("EMBEDDING_DIM", "384"))
 
 
 class Vacancy(Base):
     __tablename__ = "vacancies"
-    __table_args__ = (UniqueConstraint("source", "external_id", name="uq_vacancies_source_external_id"),)
+    __table_args__ = (
+        UniqueConstraint("source", "external_id", name="uq_vacancies_source_external_id"),
+        # Под фильтры и keyset-пагинацию GET /vacancies (ORDER BY id DESC / published_at DESC, id DESC).
+        Index("ix_vacancies_source_status_id", "source", "status", "id"),
+        Index("ix_vacancies_status_published_at_id", "status", "published_at", "id"),
+        Index("ix_vacancies_location_id", "location", "id"),
+        Index("ix_vacancies_published_at_id", "published_at", "id"),
+        Index("ix_vacancies_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     source: Mapped[str] = mapped_column(String(50), nullable=False)
@@ -46,6 +67,13 @@ class Vacancy(Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
     )
+    # Полнотекстовый индекс заголовка (русская + английская морфология), считается самой БД.
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed(VACANCY_TITLE_TSVECTOR_SQL, persisted=True),
+        nullable=True,
+        deferred=True,
+    )
 
 
 class SavedSearch(Base):
@@ -115,11 +143,41 @@ class Profile(Base):
     summary_about: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     seniority_level: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     years_total: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    embedding_revision: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0", default=0)
+    embedding_built_revision: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()
     )
 
+    # Только для чтения агрегата (GET /profiles/{id}/full, selectinload); записи идут через *_id явно.
+    experiences: Mapped[list["ProfileExperience"]] = relationship(
+        viewonly=True, lazy="raise", order_by="ProfileExperience.id.desc()"
+    )
+    projects: Mapped[list["ProfileProject"]] = relationship(
+        viewonly=True, lazy="raise", order_by="ProfileProject.id.desc()"
+    )
+    achievements: Mapped[list["ProfileAchievement"]] = relationship(
+        viewonly=True, lazy="raise", order_by="ProfileAchievement.id.desc()"
+    )
+    education: Mapped[list["ProfileEducation"]] = relationship(
+        viewonly=True, lazy="raise", order_by="ProfileEducation.id.desc()"
+    )
+    certificates: Mapped[list["ProfileCertificate"]] = relationship(
+        viewonly=True, lazy="raise", order_by="ProfileCertificate.id.desc()"
+    )
+    skills: Mapped[list["ProfileSkill"]] = relationship(viewonly=True, lazy="raise", order_by="ProfileSkill.id.desc()")
+    languages: Mapped[list["ProfileLanguage"]] = relationship(
+        viewonly=True, lazy="raise", order_by="ProfileLanguage.id.desc()"
+    )
+    links: Mapped[list["ProfileLink"]] = relationship(viewonly=True, lazy="raise", order_by="ProfileLink.id.desc()")
+    resume_versions: Mapped[list["ResumeVersion"]] = relationship(
+        viewonly=True, lazy="raise", order_by="ResumeVersion.id.desc()"
+    )
+    cover_letter_versions: Mapped[list["CoverLetterVersion"]] = relationship(
+        viewonly=True, lazy="raise", order_by="CoverLetterVersion.id.desc()"
+    )
+
 
 class ResumeVersion(Base):
     __tablename__ = "resume_versions"
@@ -303,19 +361,46 @@ class ResumeEvidence(Base):
 
 class VacancyScore(Base):
     __tablename__ = "vacancy_scores"
-    __table_args__ = (UniqueConstraint("profile_id", "vacancy_id", name="uq_vacancy_scores_profile_vacancy"),)
+    __table_args__ = (
+        UniqueConstraint("profile_id", "vacancy_id", name="uq_vacancy_scores_profile_vacancy"),
+        # Ранжирование рекомендаций и валидаторы ETag — index-only scan без чтения heap.
+        Index(
+            "ix_vacancy_scores_profile_final_score",
+            "profile_id",
+            text("final_score DESC"),
+            postgresql_include=["vacancy_id", "verdict", "computed_at"],
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    profile_id: Mapped[int] = mapped_column(ForeignKey("profiles.id", ondelete="CASCADE"), nullable=False, index=True)
+    profile_id: Mapped[int] = mapped_column(ForeignKey("profiles.id", ondelete="CASCADE"), nullable=False)
     vacancy_id: Mapped[int] = mapped_column(ForeignKey("vacancies.id", ondelete="CASCADE"), nullable=False, index=True)
     layer1_score: Mapped[float] = mapped_column(Float, nullable=False)
     layer2_score: Mapped[float] = mapped_column(Float, nullable=False)
+    # Компоненты и флаги штрафов; final_score/verdict выводятся из них весами weights_version.
+    hard_coverage: Mapped[float] = mapped_column(Float, nullable=False, server_default="0")
+    nice_coverage: Mapped[float] = mapped_column(Float, nullable=False, server_default="0")
+    eligible: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default="true", default=True)
+    overqualified: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default="false", default=False)
+    salary_warning: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default="false", default=False)
+    no_requirements: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default="false", default=False)
     final_score: Mapped[float] = mapped_column(Float, nullable=False)
     verdict: Mapped[str] = mapped_column(String(20), nullable=False)
-    explanation: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False, default=dict, server_default="{}")
+    weights_version: Mapped[str] = mapped_column(String(50), nullable=False, server_default="v1", default="v1")
     computed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
 
+class VacancyScoreExplanation(Base):
+    """Wide explanation JSONB of a score; read only by tailoring and docgen."""
+
+    __tablename__ = "vacancy_score_explanations"
+
+    score_id: Mapped[int] = mapped_column(
+        ForeignKey("vacancy_scores.id", ondelete="CASCADE"), primary_key=True, nullable=False
+    )
+    explanation: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False, default=dict, server_default="{}")
+
+
 class VacancyEmbedding(Base):
     __tablename__ = "vacancy_embeddings_v2"
 
@@ -324,6 +409,8 @@ class VacancyEmbedding(Base):
     )
     embedding: Mapped[list[float]] = mapped_column(Vector(EMBEDDING_DIM), nullable=False)
     model_name: Mapped[str] = mapped_column(String(120), nullable=False)
+    text_version: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    text_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
 
@@ -337,7 +424,66 @@ class VacancyParsed(Base):
     sections_json: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False, default=dict, server_default="{}")
     extracted_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
     version: Mapped[str] = mapped_column(String(50), nullable=False)
+    requirements_version: Mapped[Optional[str]] = mapped_column(String(80), nullable=True)
+    features_version: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
     quality_score: Mapped[float] = mapped_column(Float, nullable=False, default=0.0, server_default="0")
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR,
+        Computed(VACANCY_TEXT_TSVECTOR_SQL, persisted=True),
+        nullable=True,
+        deferred=True,
+    )
+
+    __table_args__ = (Index("ix_vacancy_parsed_search_vector", "search_vector", postgresql_using="gin"),)
+
+
+class VacancyParseCache(Base):
+    __tablename__ = "vacancy_parse_cache"
+
+    description_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    parser_version: Mapped[str] = mapped_column(String(50), primary_key=True)
+    plain_text: Mapped[str] = mapped_column(Text, nullable=False)
+    sections_json: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False, default=dict, server_default="{}")
+    quality_score: Mapped[float] = mapped_column(Float, nullable=False, default=0.0, server_default="0")
+    requirements_version: Mapped[str] = mapped_column(String(80), nullable=False)
+    section_requirements: Mapped[list[dict[str, Any]]] = mapped_column(
+        JSONB, nullable=False, default=list, server_default="[]"
+    )
+    text_requirements: Mapped[list[dict[str, Any]]] = mapped_column(
+        JSONB, nullable=False, default=list, server_default="[]"
+    )
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
+class VacancySignature(Base):
+    __tablename__ = "vacancy_signatures"
+    __table_args__ = (Index("ix_vacancy_signatures_lsh_bands", "lsh_bands", postgresql_using="gin"),)
+
+    vacancy_id: Mapped[int] = mapped_column(
+        ForeignKey("vacancies.id", ondelete="CASCADE"), primary_key=True, nullable=False
+    )
+    minhash: Mapped[list[int]] = mapped_column(ARRAY(BigInteger), nullable=False)
+    lsh_bands: Mapped[list[int]] = mapped_column(ARRAY(BigInteger), nullable=False)
+    cluster_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    text_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    version: Mapped[str] = mapped_column(String(50), nullable=False)
+    computed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+
+class VacancyNeighbor(Base):
+    __tablename__ = "vacancy_neighbors"
+    __table_args__ = (Index("ix_vacancy_neighbors_vacancy_rank", "vacancy_id", "rank"),)
+
+    vacancy_id: Mapped[int] = mapped_column(
+        ForeignKey("vacancies.id", ondelete="CASCADE"), primary_key=True, nullable=False
+    )
+    neighbor_id: Mapped[int] = mapped_column(
+        ForeignKey("vacancies.id", ondelete="CASCADE"), primary_key=True, nullable=False, index=True
+    )
+    rank: Mapped[int] = mapped_column(Integer, nullable=False)
+    similarity: Mapped[float] = mapped_column(Float, nullable=False)
+    model_name: Mapped[str] = mapped_column(String(120), nullable=False)
+    computed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
 
 class ProfileEmbedding(Base):
@@ -1,7 +1,12 @@
 import os
+from collections.abc import AsyncIterator
+from functools import lru_cache
 
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker, DeclarativeBase
+from starlette.requests import Request
 
 
 class Base(DeclarativeBase):
@@ -14,9 +19,108 @@ engine = create_engine(DATABASE_URL)
 SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, class_=Session)
 
 
+# Реплика для чтения (GET-роуты, выгрузки, аналитика); без неё всё читается с primary.
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL") or None
+# Столько секунд после собственной записи клиент читает с primary, пока реплика догоняет.
+READ_YOUR_WRITES_S = int(os.getenv("READ_YOUR_WRITES_S") or "10")
+READ_YOUR_WRITES_COOKIE = "db_read_primary"
+
+# default_transaction_read_only: запись через read-сессию падает сразу, даже если "реплика" — обычная база.
+read_engine = (
+    create_engine(
+        DATABASE_REPLICA_URL,
+        pool_pre_ping=True,
+        connect_args={"options": "-c default_transaction_read_only=on"},
+    )
+    if DATABASE_REPLICA_URL
+    else engine
+)
+ReadSessionLocal = sessionmaker(bind=read_engine, autocommit=False, autoflush=False, class_=Session)
+
+
+def replica_enabled() -> bool:
+    return DATABASE_REPLICA_URL is not None
+
+
+def reads_from_primary(request: Request) -> bool:
+    """Whether the client wrote recently (cookie set by the read-your-writes middleware)."""
+
+    return READ_YOUR_WRITES_COOKIE in request.cookies
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+def get_read_db(request: Request):
+    """Session for read-only routes: the replica, or the primary right after the client's own writes."""
+
+    db = SessionLocal() if reads_from_primary(request) else ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _asyncpg_url(url: str) -> str:
+    # Та же база, но через asyncpg.
+    return make_url(url).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+
+def _async_database_url() -> str:
+    return os.getenv("ASYNC_DATABASE_URL") or _asyncpg_url(DATABASE_URL)
+
+
+def _create_async_engine(url: str, **kwargs) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        pool_size=int(os.getenv("ASYNC_DB_POOL_SIZE") or "10"),
+        max_overflow=int(os.getenv("ASYNC_DB_MAX_OVERFLOW") or "20"),
+        pool_pre_ping=True,
+        **kwargs,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_async_engine() -> AsyncEngine:
+    """Async engine for API read paths; created lazily so Celery workers don't need asyncpg."""
+
+    return _create_async_engine(_async_database_url())
+
+
+@lru_cache(maxsize=1)
+def get_async_read_engine() -> AsyncEngine:
+    """Async engine of the replica; the primary one when no replica is configured."""
+
+    if not replica_enabled():
+        return get_async_engine()
+    return _create_async_engine(
+        os.getenv("ASYNC_DATABASE_REPLICA_URL") or _asyncpg_url(DATABASE_REPLICA_URL),
+        connect_args={"server_settings": {"default_transaction_read_only": "on"}},
+    )
+
+
+@lru_cache(maxsize=1)
+def get_async_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    # expire_on_commit=False: после commit атрибуты не перечитываются лениво (в async это ошибка).
+    return async_sessionmaker(bind=get_async_engine(), autoflush=False, expire_on_commit=False)
+
+
+@lru_cache(maxsize=1)
+def get_async_read_sessionmaker() -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(bind=get_async_read_engine(), autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with get_async_sessionmaker()() as db:
+        yield db
+
+
+async def get_async_read_db(request: Request) -> AsyncIterator[AsyncSession]:
+    factory = get_async_sessionmaker() if reads_from_primary(request) else get_async_read_sessionmaker()
+    async with factory() as db:
+        yield db
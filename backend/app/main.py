@@ -1,17 +1,25 @@
 import os
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.routers.dev import router as dev_router
 from app.api.routers.docgen import router as docgen_router
 from app.api.routers.embeddings import router as embeddings_router
+from app.api.routers.exports import router as exports_router
 from app.api.routers.imports import router as imports_router
 from app.api.routers.saved_searches import router as saved_searches_router
 from app.api.routers.profiles import router as profiles_router
 from app.api.routers.matching import router as matching_router
 from app.api.routers.profile_data import router as profile_data_router
 from app.api.routers.vacancies import router as vacancies_router
+from app.db.session import (
+    READ_YOUR_WRITES_COOKIE,
+    READ_YOUR_WRITES_S,
+    get_async_engine,
+    get_async_read_engine,
+    replica_enabled,
+)
 from app.services.embeddings.provider import validate_embedding_configuration
 
 validate_embedding_configuration()
@@ -42,6 +50,28 @@ app.add_middleware(
 )
 
 
+_SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    response = await call_next(request)
+    # После успешной записи клиент читает с primary, пока реплика не догонит (см. get_read_db).
+    if replica_enabled() and request.method not in _SAFE_METHODS and response.status_code < 400:
+        response.set_cookie(
+            READ_YOUR_WRITES_COOKIE, "1", max_age=READ_YOUR_WRITES_S, httponly=True, samesite="lax"
+        )
+    return response
+
+
+@app.on_event("shutdown")
+async def dispose_async_engine() -> None:
+    if get_async_read_engine.cache_info().currsize and replica_enabled():
+        await get_async_read_engine().dispose()
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
+
+
 @app.get("/")
 def root():
     return {"message": "Hello! Go to /docs"}
@@ -64,5 +94,6 @@ app.include_router(embeddings_router, prefix="/api/v1")
 
 app.include_router(matching_router, prefix="/api/v1")
 app.include_router(docgen_router, prefix="/api/v1")
+app.include_router(exports_router, prefix="/api/v1")
 
 app.include_router(dev_router)
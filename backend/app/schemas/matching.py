@@ -11,6 +11,7 @@ class RecommendationItem(BaseModel):
     url: str | None = None
     final_score: float
     verdict: str
+    duplicate_ids: list[int] = []
 
 
 class RecommendationsResponse(BaseModel):
@@ -0,0 +1,64 @@
+from typing import Generic, Optional, TypeVar
+
+from pydantic import BaseModel, Field
+
+from app.schemas.cover_letter_version import (
+    CoverLetterVersionCreate,
+    CoverLetterVersionRead,
+    CoverLetterVersionUpdate,
+)
+from app.schemas.profile import ProfileRead, ProfileUpdate
+from app.schemas.profile_achievement import ProfileAchievementCreate, ProfileAchievementRead, ProfileAchievementUpdate
+from app.schemas.profile_certificate import ProfileCertificateCreate, ProfileCertificateRead, ProfileCertificateUpdate
+from app.schemas.profile_education import ProfileEducationCreate, ProfileEducationRead, ProfileEducationUpdate
+from app.schemas.profile_experience import ProfileExperienceCreate, ProfileExperienceRead, ProfileExperienceUpdate
+from app.schemas.profile_language import ProfileLanguageCreate, ProfileLanguageRead, ProfileLanguageUpdate
+from app.schemas.profile_link import ProfileLinkCreate, ProfileLinkRead, ProfileLinkUpdate
+from app.schemas.profile_project import ProfileProjectCreate, ProfileProjectRead, ProfileProjectUpdate
+from app.schemas.profile_skill import ProfileSkillCreate, ProfileSkillRead, ProfileSkillUpdate
+from app.schemas.resume_version import ResumeVersionCreate, ResumeVersionRead, ResumeVersionUpdate
+
+CreateT = TypeVar("CreateT", bound=BaseModel)
+UpdateT = TypeVar("UpdateT", bound=BaseModel)
+
+
+class ProfileFullRead(ProfileRead):
+    """Profile with every sub-resource, newest first (same order as the list endpoints)."""
+
+    experiences: list[ProfileExperienceRead] = Field(default_factory=list)
+    projects: list[ProfileProjectRead] = Field(default_factory=list)
+    achievements: list[ProfileAchievementRead] = Field(default_factory=list)
+    education: list[ProfileEducationRead] = Field(default_factory=list)
+    certificates: list[ProfileCertificateRead] = Field(default_factory=list)
+    skills: list[ProfileSkillRead] = Field(default_factory=list)
+    languages: list[ProfileLanguageRead] = Field(default_factory=list)
+    links: list[ProfileLinkRead] = Field(default_factory=list)
+    resume_versions: list[ResumeVersionRead] = Field(default_factory=list)
+    cover_letter_versions: list[CoverLetterVersionRead] = Field(default_factory=list)
+
+
+class SubResourceUpdate(BaseModel, Generic[UpdateT]):
+    id: int
+    data: UpdateT
+
+
+class SubResourceChanges(BaseModel, Generic[CreateT, UpdateT]):
+    create: list[CreateT] = Field(default_factory=list)
+    update: list[SubResourceUpdate[UpdateT]] = Field(default_factory=list)
+    delete: list[int] = Field(default_factory=list)
+
+
+class ProfileFullUpdate(BaseModel):
+    """Batch of profile changes applied in one transaction; omitted sections are left as is."""
+
+    profile: Optional[ProfileUpdate] = None
+    experiences: Optional[SubResourceChanges[ProfileExperienceCreate, ProfileExperienceUpdate]] = None
+    projects: Optional[SubResourceChanges[ProfileProjectCreate, ProfileProjectUpdate]] = None
+    achievements: Optional[SubResourceChanges[ProfileAchievementCreate, ProfileAchievementUpdate]] = None
+    education: Optional[SubResourceChanges[ProfileEducationCreate, ProfileEducationUpdate]] = None
+    certificates: Optional[SubResourceChanges[ProfileCertificateCreate, ProfileCertificateUpdate]] = None
+    skills: Optional[SubResourceChanges[ProfileSkillCreate, ProfileSkillUpdate]] = None
+    languages: Optional[SubResourceChanges[ProfileLanguageCreate, ProfileLanguageUpdate]] = None
+    links: Optional[SubResourceChanges[ProfileLinkCreate, ProfileLinkUpdate]] = None
+    resume_versions: Optional[SubResourceChanges[ResumeVersionCreate, ResumeVersionUpdate]] = None
+    cover_letter_versions: Optional[SubResourceChanges[CoverLetterVersionCreate, CoverLetterVersionUpdate]] = None
@@ -8,6 +8,7 @@ class TaskStatusResponse(BaseModel):
     state: str
     result: Optional[Any] = None
     error: Optional[str] = None
+    progress: Optional[dict[str, Any]] = None
 
 
 class TaskEnqueueResponse(BaseModel):
@@ -49,3 +49,67 @@ class VacancyRead(BaseModel):
     updated_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class VacancyListItem(BaseModel):
+    """Vacancy without ``description`` for list pages."""
+
+    id: int
+    source: str
+    external_id: str
+    title: str
+    company_name: Optional[str] = None
+    location: Optional[str] = None
+    salary_from: Optional[int] = None
+    salary_to: Optional[int] = None
+    currency: Optional[str] = None
+    url: Optional[str] = None
+    published_at: Optional[datetime] = None
+    status: str
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class VacancyPage(BaseModel):
+    items: list[VacancyListItem]
+    next_cursor: Optional[str] = None
+    limit: int
+
+
+class VacancySearchItem(VacancyListItem):
+    score: float
+    lexical_rank: Optional[float] = None
+    semantic: Optional[float] = None
+
+
+class VacancySearchResponse(BaseModel):
+    query: str
+    mode: str
+    items: list[VacancySearchItem]
+
+
+class VacancySimilarItem(VacancyListItem):
+    similarity: float
+
+
+class VacancySimilarResponse(BaseModel):
+    vacancy_id: int
+    source: str
+    items: list[VacancySimilarItem]
+
+
+class VacancyBulkError(BaseModel):
+    index: int
+    detail: str
+
+
+class VacancyBulkResponse(BaseModel):
+    received: int
+    created: int
+    updated: int
+    failed: int
+    vacancy_ids: list[int]
+    errors: list[VacancyBulkError]
+    embedding_task_id: Optional[str] = None
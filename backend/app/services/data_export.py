@@ -0,0 +1,177 @@
+"""Streaming export of vacancies, parsed texts, scores and embeddings.
+
+Rows are read through a server-side cursor (``yield_per``), so memory stays
+bounded by one batch regardless of table size; each batch becomes one chunk
+of NDJSON lines. Embeddings can also be exported as a ``.npy`` structured
+array ``[("vacancy_id", "<i8"), ("embedding", "<f4", (dim,))]`` —
+``np.load(path)["embedding"]`` gives the matrix. The ``.npy`` header needs
+the row count up front, so count and rows are read in one REPEATABLE READ
+snapshot.
+
+Used by ``GET /api/v1/export/...`` and as a CLI:
+    python -m app.services.data_export vacancies --out vacancies.ndjson
+    python -m app.services.data_export vacancy_scores --profile-id 1 | gzip > scores.ndjson.gz
+    python -m app.services.data_export vacancy_embeddings --format npy --out embeddings.npy
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import sys
+from collections.abc import Iterator
+from datetime import date, datetime
+from typing import Any, Literal, get_args
+
+import numpy as np
+from sqlalchemy import Select, func, select
+from sqlalchemy.orm import Session
+
+from app.db.models import EMBEDDING_DIM, Vacancy, VacancyEmbedding, VacancyParsed, VacancyScore
+from app.db.session import ReadSessionLocal
+
+BATCH_SIZE = 2000
+
+ExportDataset = Literal["vacancies", "vacancy_parsed", "vacancy_scores", "vacancy_embeddings"]
+DATASETS: tuple[str, ...] = get_args(ExportDataset)
+
+_MODELS: dict[str, Any] = {
+    "vacancies": Vacancy,
+    "vacancy_parsed": VacancyParsed,
+    "vacancy_scores": VacancyScore,
+    "vacancy_embeddings": VacancyEmbedding,
+}
+
+EMBEDDINGS_NPY_DTYPE = np.dtype([("vacancy_id", "<i8"), ("embedding", "<f4", (EMBEDDING_DIM,))])
+
+
+def dataset_statement(
+    dataset: ExportDataset,
+    *,
+    profile_id: int | None = None,
+    model_name: str | None = None,
+) -> Select:
+    """All columns of the table except computed tsvectors, in primary key order."""
+
+    table = _MODELS[dataset].__table__
+    stmt = select(*(column for column in table.columns if column.key != "search_vector"))
+    if profile_id is not None and dataset == "vacancy_scores":
+        stmt = stmt.where(VacancyScore.profile_id == profile_id)
+    if model_name is not None and dataset == "vacancy_embeddings":
+        stmt = stmt.where(VacancyEmbedding.model_name == model_name)
+    return stmt.order_by(*table.primary_key.columns)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def iter_ndjson(
+    db: Session,
+    dataset: ExportDataset,
+    *,
+    profile_id: int | None = None,
+    model_name: str | None = None,
+    batch_size: int = BATCH_SIZE,
+) -> Iterator[bytes]:
+    """NDJSON chunks of the dataset, one chunk per ``batch_size`` rows."""
+
+    stmt = dataset_statement(dataset, profile_id=profile_id, model_name=model_name)
+    result = db.execute(stmt.execution_options(yield_per=batch_size))
+    for rows in result.mappings().partitions():
+        yield "".join(
+            json.dumps(dict(row), ensure_ascii=False, default=_json_default) + "\n" for row in rows
+        ).encode("utf-8")
+
+
+def iter_embeddings_npy(
+    db: Session,
+    *,
+    model_name: str | None = None,
+    batch_size: int = BATCH_SIZE,
+) -> Iterator[bytes]:
+    """``.npy`` file of vacancy embeddings (structured array ``EMBEDDINGS_NPY_DTYPE``), chunk by chunk.
+
+    Must be called on a fresh session: it switches the transaction to
+    REPEATABLE READ so the header's row count matches the streamed rows.
+    """
+
+    db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+    stmt = select(VacancyEmbedding.vacancy_id, VacancyEmbedding.embedding)
+    if model_name is not None:
+        stmt = stmt.where(VacancyEmbedding.model_name == model_name)
+
+    total = int(db.execute(select(func.count()).select_from(stmt.subquery())).scalar_one())
+    header = io.BytesIO()
+    np.lib.format.write_array_header_1_0(
+        header,
+        {
+            "descr": np.lib.format.dtype_to_descr(EMBEDDINGS_NPY_DTYPE),
+            "fortran_order": False,
+            "shape": (total,),
+        },
+    )
+    yield header.getvalue()
+
+    result = db.execute(stmt.order_by(VacancyEmbedding.vacancy_id).execution_options(yield_per=batch_size))
+    for rows in result.partitions():
+        chunk = np.empty(len(rows), dtype=EMBEDDINGS_NPY_DTYPE)
+        chunk["vacancy_id"] = [row.vacancy_id for row in rows]
+        chunk["embedding"] = np.asarray([np.asarray(row.embedding, dtype="<f4") for row in rows])
+        yield chunk.tobytes()
+
+
+def stream_with_session(
+    dataset: ExportDataset,
+    export_format: Literal["ndjson", "npy"],
+    **kwargs: Any,
+) -> Iterator[bytes]:
+    """Same as ``iter_ndjson``/``iter_embeddings_npy`` on an own read (replica) session held for the whole stream."""
+
+    db = ReadSessionLocal()
+    try:
+        if export_format == "npy":
+            yield from iter_embeddings_npy(db, **kwargs)
+        else:
+            yield from iter_ndjson(db, dataset, **kwargs)
+    finally:
+        db.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("dataset", choices=DATASETS)
+    parser.add_argument("--format", choices=("ndjson", "npy"), default="ndjson", help="npy: vacancy_embeddings only")
+    parser.add_argument("--out", default=None, help="output file (default: stdout)")
+    parser.add_argument("--profile-id", type=int, default=None, help="vacancy_scores of one profile")
+    parser.add_argument("--model-name", default=None, help="vacancy_embeddings of one model")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="rows per cursor fetch")
+    args = parser.parse_args(argv)
+
+    if args.format == "npy" and args.dataset != "vacancy_embeddings":
+        parser.error("--format npy is supported only for vacancy_embeddings")
+
+    kwargs: dict[str, Any] = {"model_name": args.model_name, "batch_size": args.batch_size}
+    if args.format == "ndjson":
+        kwargs["profile_id"] = args.profile_id
+
+    out = open(args.out, "wb") if args.out else sys.stdout.buffer
+    try:
+        for chunk in stream_with_session(args.dataset, args.format, **kwargs):
+            out.write(chunk)
+    finally:
+        if args.out:
+            out.close()
+        else:
+            out.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -20,10 +20,12 @@ from app.db.models import (
     Vacancy,
     VacancyParsed,
     VacancyScore,
+    VacancyScoreExplanation,
 )
 from app.llm import LLMMessage, LLMRequest, get_llm_client
 from app.services.docgen.prompt_builders import build_cover_letter_prompt, build_resume_prompt
 from app.services.matching.matching_service import MatchingService
+from app.services.matching.weights import with_final
 
 
 class DocumentGenerationService:
@@ -220,11 +222,13 @@ class DocumentGenerationService:
                 pass
 
         score = self.db.execute(
-            select(VacancyScore.explanation).where(
+            select(VacancyScore, VacancyScoreExplanation.explanation)
+            .join(VacancyScoreExplanation, VacancyScoreExplanation.score_id == VacancyScore.id)
+            .where(
                 VacancyScore.profile_id == profile_id,
                 VacancyScore.vacancy_id == vacancy_id,
             )
-        ).scalar_one_or_none()
+        ).one_or_none()
 
         evidence = self.db.execute(
             select(ResumeEvidence.evidence_text, ResumeEvidence.confidence)
@@ -236,7 +240,7 @@ class DocumentGenerationService:
         ).all()
 
         return {
-            "explanation": score or {},
+            "explanation": with_final(score.explanation, score.VacancyScore) if score is not None else {},
             "evidence": [{"text": row.evidence_text, "confidence": row.confidence} for row in evidence],
         }
 
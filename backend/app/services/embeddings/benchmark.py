@@ -0,0 +1,175 @@
+"""Benchmark of fastembed inference settings on a sample of stored vacancies.
+
+Reports texts/sec for every combination of ONNX threads, batch size and
+data-parallel workers, plus cosine deviation of each run from the fp32
+baseline model, so settings can be chosen per machine.
+
+Example (inside the worker container):
+    python -m app.services.embeddings.benchmark --sample 200 --threads 1,2,4 \
+        --batch-sizes 32,128 --parallel none,2 --include-quantized
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import time
+from dataclasses import asdict, dataclass
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_embedding_settings
+from app.db.models import Vacancy, VacancyParsed
+from app.db.session import ReadSessionLocal
+from app.services.embeddings.fastembed_provider import FastEmbedEmbeddingProvider
+from app.utils.text_clean import strip_html
+
+
+@dataclass(slots=True)
+class BenchmarkRun:
+    model_name: str
+    threads: int | None
+    batch_size: int
+    parallel: int | None
+    texts: int
+    seconds: float
+    texts_per_sec: float
+    cosine_deviation_mean: float | None
+    cosine_deviation_max: float | None
+
+
+def load_sample_texts(db: Session, sample_size: int) -> list[str]:
+    """Build embedding texts (title + plain text) for a random sample of vacancies."""
+
+    rows = db.execute(
+        select(Vacancy.title, Vacancy.description, VacancyParsed.plain_text)
+        .outerjoin(VacancyParsed, VacancyParsed.vacancy_id == Vacancy.id)
+        .order_by(func.random())
+        .limit(sample_size)
+    ).all()
+
+    texts: list[str] = []
+    for title, description, plain_text in rows:
+        clean_text = plain_text or strip_html(description or "")
+        texts.append("\n\n".join(part for part in [title, clean_text] if part))
+    return texts
+
+
+def _cosine_deviation(baseline: np.ndarray, candidate: np.ndarray) -> tuple[float, float] | None:
+    if baseline.shape != candidate.shape:
+        return None
+
+    baseline_norms = np.linalg.norm(baseline, axis=1)
+    candidate_norms = np.linalg.norm(candidate, axis=1)
+    denominators = np.maximum(baseline_norms * candidate_norms, 1e-12)
+    similarities = np.einsum("ij,ij->i", baseline, candidate) / denominators
+    deviations = 1.0 - similarities
+    return float(deviations.mean()), float(deviations.max())
+
+
+def run_benchmark(
+    texts: list[str],
+    *,
+    model_names: list[str],
+    baseline_model_name: str,
+    threads_options: list[int | None],
+    batch_sizes: list[int],
+    parallel_options: list[int | None],
+) -> list[BenchmarkRun]:
+    baseline = np.asarray(FastEmbedEmbeddingProvider(model_name=baseline_model_name).embed_texts(texts))
+
+    runs: list[BenchmarkRun] = []
+    for model_name, threads, batch_size, parallel in itertools.product(
+        model_names, threads_options, batch_sizes, parallel_options
+    ):
+        provider = FastEmbedEmbeddingProvider(
+            model_name=model_name,
+            threads=threads,
+            batch_size=batch_size,
+            parallel=parallel,
+        )
+        provider.embed_texts(texts[: min(len(texts), batch_size)])
+
+        started = time.perf_counter()
+        vectors = np.asarray(provider.embed_texts(texts))
+        elapsed = time.perf_counter() - started
+
+        deviation = _cosine_deviation(baseline, vectors)
+        runs.append(
+            BenchmarkRun(
+                model_name=model_name,
+                threads=threads,
+                batch_size=batch_size,
+                parallel=parallel,
+                texts=len(texts),
+                seconds=round(elapsed, 4),
+                texts_per_sec=round(len(texts) / elapsed, 2) if elapsed > 0 else 0.0,
+                cosine_deviation_mean=deviation[0] if deviation else None,
+                cosine_deviation_max=deviation[1] if deviation else None,
+            )
+        )
+    return runs
+
+
+def _parse_optional_ints(raw_value: str) -> list[int | None]:
+    values: list[int | None] = []
+    for chunk in raw_value.split(","):
+        chunk = chunk.strip().lower()
+        if not chunk:
+            continue
+        values.append(None if chunk in {"none", "default"} else int(chunk))
+    return values
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sample", type=int, default=200, help="number of vacancies to embed")
+    parser.add_argument("--threads", default="none", help="comma separated ONNX thread counts, 'none' = ORT default")
+    parser.add_argument("--batch-sizes", default="256", help="comma separated fastembed batch sizes")
+    parser.add_argument("--parallel", default="none", help="comma separated data-parallel workers, 0 = all cores")
+    parser.add_argument("--include-quantized", action="store_true", help="also benchmark the quantized variant")
+    parser.add_argument("--json", dest="json_path", default=None, help="write results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    settings = get_embedding_settings()
+    model_names = [settings.model_name]
+    if args.include_quantized:
+        if not settings.quantized_model_name:
+            parser.error("no quantized variant configured: set FASTEMBED_QUANTIZED_MODEL_NAME")
+        model_names.append(settings.quantized_model_name)
+
+    db = ReadSessionLocal()
+    try:
+        texts = load_sample_texts(db, args.sample)
+    finally:
+        db.close()
+
+    if not texts:
+        parser.error("no vacancies found to benchmark on")
+
+    runs = run_benchmark(
+        texts,
+        model_names=model_names,
+        baseline_model_name=settings.model_name,
+        threads_options=_parse_optional_ints(args.threads),
+        batch_sizes=[int(value) for value in args.batch_sizes.split(",") if value.strip()],
+        parallel_options=_parse_optional_ints(args.parallel),
+    )
+
+    for run in runs:
+        print(
+            f"{run.model_name} threads={run.threads} batch={run.batch_size} parallel={run.parallel} "
+            f"texts/sec={run.texts_per_sec} cos_dev_mean={run.cosine_deviation_mean} "
+            f"cos_dev_max={run.cosine_deviation_max}"
+        )
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as fh:
+            json.dump([asdict(run) for run in runs], fh, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
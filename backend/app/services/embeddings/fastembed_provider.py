@@ -1,28 +1,121 @@
+import json
+import logging
+import multiprocessing
+import os
 import re
+import tempfile
 from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING
 
-from fastembed import TextEmbedding
+if TYPE_CHECKING:
+    from fastembed import TextEmbedding
 
-
-DEFAULT_FASTEMBED_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+logger = logging.getLogger(__name__)
 
 _WHITESPACE_RE = re.compile(r"\s+")
 
+# Размерности известных моделей: позволяют узнать dim без импорта fastembed и без инференса.
+_BUILTIN_MODEL_DIMS = {
+    "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2": 384,
+    "sentence-transformers/paraphrase-multilingual-mpnet-base-v2": 768,
+    "BAAI/bge-small-en-v1.5": 384,
+    "BAAI/bge-base-en-v1.5": 768,
+    "intfloat/multilingual-e5-large": 1024,
+}
+
 
 def _normalize_text(text: str) -> str:
     return _WHITESPACE_RE.sub(" ", (text or "").strip())
 
 
+def _manifest_path() -> Path:
+    explicit_path = os.getenv("EMBEDDING_MANIFEST_PATH")
+    if explicit_path:
+        return Path(explicit_path)
+    cache_dir = os.getenv("FASTEMBED_CACHE_PATH") or os.path.join(tempfile.gettempdir(), "fastembed_cache")
+    return Path(cache_dir) / "embedding_manifest.json"
+
+
+def _read_manifest() -> dict[str, int]:
+    try:
+        return {str(name): int(dim) for name, dim in json.loads(_manifest_path().read_text("utf-8")).items()}
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+
+def _write_manifest_entry(model_name: str, dim: int) -> None:
+    path = _manifest_path()
+    manifest = _read_manifest()
+    manifest[model_name] = dim
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), "utf-8")
+    except OSError:
+        logger.warning("Failed to write embedding manifest | path=%s", path)
+
+
+def _registry_model_dim(model_name: str) -> int:
+    from fastembed import TextEmbedding
+
+    for description in TextEmbedding.list_supported_models():
+        if description["model"].lower() == model_name.lower():
+            return int(description["dim"])
+    raise ValueError(f"Model {model_name!r} is not supported by fastembed TextEmbedding")
+
+
+@lru_cache(maxsize=8)
+def resolve_model_dim(model_name: str) -> int:
+    """Размерность модели из встроенной таблицы, кешированного манифеста или метаданных реестра fastembed."""
+
+    if model_name in _BUILTIN_MODEL_DIMS:
+        return _BUILTIN_MODEL_DIMS[model_name]
+
+    manifest = _read_manifest()
+    if model_name in manifest:
+        return manifest[model_name]
+
+    dim = _registry_model_dim(model_name)
+    _write_manifest_entry(model_name, dim)
+    return dim
+
+
 @lru_cache(maxsize=4)
-def _load_fastembed_model(model_name: str) -> TextEmbedding:
-    return TextEmbedding(model_name=model_name)
+def _load_fastembed_model(model_name: str, threads: int | None = None) -> "TextEmbedding":
+    from fastembed import TextEmbedding
+
+    return TextEmbedding(model_name=model_name, threads=threads)
+
+
+def _resolve_parallel(parallel: int | None) -> int | None:
+    # Data-parallel режим fastembed порождает дочерние процессы, а prefork-воркеры
+    # Celery — демоны и не могут их создавать. В таком случае остаёмся на потоках ONNX.
+    if parallel is not None and multiprocessing.current_process().daemon:
+        logger.warning(
+            "FASTEMBED_PARALLEL=%s ignored inside a daemonic process; use --pool=solo/threads for data-parallel",
+            parallel,
+        )
+        return None
+    return parallel
 
 
 class FastEmbedEmbeddingProvider:
-    def __init__(self, model_name: str) -> None:
+    """fastembed-провайдер; ONNX-модель загружается при первом embed, а не при создании."""
+
+    def __init__(
+        self,
+        model_name: str,
+        *,
+        threads: int | None = None,
+        batch_size: int = 256,
+        parallel: int | None = None,
+    ) -> None:
         self._model_name = model_name
-        self._model = _load_fastembed_model(model_name)
-        self._dim = len(next(self._model.embed(["dimension probe"])).tolist())
+        self._threads = threads
+        self._batch_size = batch_size
+        self._parallel = _resolve_parallel(parallel)
+        self._dim = resolve_model_dim(model_name)
+        self._dim_verified = False
 
     @property
     def name(self) -> str:
@@ -42,5 +135,17 @@ class FastEmbedEmbeddingProvider:
         if not texts:
             return []
 
+        model = _load_fastembed_model(self._model_name, self._threads)
         normalized_texts = [_normalize_text(text) for text in texts]
-        return [vector.astype("float32", copy=False).tolist() for vector in self._model.embed(normalized_texts)]
+        vectors = model.embed(normalized_texts, batch_size=self._batch_size, parallel=self._parallel)
+        result = [vector.astype("float32", copy=False).tolist() for vector in vectors]
+
+        if not self._dim_verified:
+            if len(result[0]) != self._dim:
+                raise ValueError(
+                    f"Embedding dim mismatch for {self._model_name}: metadata={self._dim}, model={len(result[0])}. "
+                    "Fix the embedding manifest (EMBEDDING_MANIFEST_PATH)."
+                )
+            self._dim_verified = True
+
+        return result
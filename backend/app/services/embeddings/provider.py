@@ -1,13 +1,11 @@
 import hashlib
-import math
 import os
 from abc import ABC, abstractmethod
 from functools import lru_cache
 
-from app.services.embeddings.fastembed_provider import (
-    DEFAULT_FASTEMBED_MODEL,
-    FastEmbedEmbeddingProvider,
-)
+import numpy as np
+
+from app.core.config import get_embedding_settings
 
 
 class EmbeddingProvider(ABC):
@@ -40,24 +38,43 @@ class LocalHashEmbeddingProvider(EmbeddingProvider):
         return f"local:{self._model_name}"
 
     def embed_text(self, text: str) -> list[float]:
-        vector = [0.0] * self._embedding_dim
-        tokens = (text or "").lower().split()
-
-        if not tokens:
-            return vector
-
-        for token in tokens:
-            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
-            token_hash = int.from_bytes(digest, byteorder="big", signed=False)
-            idx = token_hash % self._embedding_dim
-            sign = 1.0 if ((token_hash >> 1) & 1) == 0 else -1.0
-            vector[idx] += sign
-
-        norm = math.sqrt(sum(value * value for value in vector))
-        if norm == 0.0:
-            return vector
+        return self.embed_texts([text])[0]
 
-        return [value / norm for value in vector]
+    def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        if not texts:
+            return []
+
+        dim = self._embedding_dim
+        flat_indices: list[int] = []
+        signs: list[float] = []
+        for row, text in enumerate(texts):
+            offset = row * dim
+            for token in (text or "").lower().split():
+                idx, sign = _hash_token(token, dim)
+                flat_indices.append(offset + idx)
+                signs.append(sign)
+
+        # Веса целочисленные, поэтому суммы и нормы точные и совпадают
+        # с прежней поэлементной реализацией (сохранённые векторы остаются валидными).
+        matrix = np.bincount(
+            np.asarray(flat_indices, dtype=np.intp),
+            weights=np.asarray(signs, dtype=np.float64),
+            minlength=len(texts) * dim,
+        ).reshape(len(texts), dim)
+
+        norms = np.sqrt(np.einsum("ij,ij->i", matrix, matrix))[:, np.newaxis]
+        np.divide(matrix, norms, out=matrix, where=norms != 0.0)
+        return matrix.tolist()
+
+
+@lru_cache(maxsize=65536)
+def _hash_token(token: str, dim: int) -> tuple[int, float]:
+    """Индекс и знак токена в hashing-векторе (кешируется между текстами и батчами)."""
+
+    digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+    token_hash = int.from_bytes(digest, byteorder="big", signed=False)
+    sign = 1.0 if ((token_hash >> 1) & 1) == 0 else -1.0
+    return token_hash % dim, sign
 
 
 class OpenAIEmbeddingProvider(EmbeddingProvider):
@@ -86,16 +103,38 @@ class GigaChatEmbeddingProvider(EmbeddingProvider):
 def get_embedding_provider() -> EmbeddingProvider:
     """Фабрика провайдера из env."""
 
-    provider_name = os.getenv("EMBEDDING_PROVIDER", "fastembed").lower()
+    return build_embedding_provider(get_embedding_settings().provider)
+
+
+def build_embedding_provider(provider_name: str) -> EmbeddingProvider:
+    """Создаёт провайдер по имени (используется фабрикой и embedding-сервером)."""
+
+    settings = get_embedding_settings()
 
     if provider_name == "fastembed":
-        model_name = os.getenv("FASTEMBED_MODEL_NAME") or os.getenv(
-            "EMBEDDING_MODEL_NAME", DEFAULT_FASTEMBED_MODEL
+        # Импорт внутри ветки: образ API собирается без ML-зависимостей.
+        from app.services.embeddings.fastembed_provider import FastEmbedEmbeddingProvider
+
+        provider = FastEmbedEmbeddingProvider(
+            model_name=settings.active_model_name,
+            threads=settings.threads,
+            batch_size=settings.batch_size,
+            parallel=settings.parallel,
         )
-        provider = FastEmbedEmbeddingProvider(model_name=model_name)
         _validate_embedding_dim(provider.dim)
         return provider
 
+    if provider_name == "remote":
+        from app.services.embeddings.remote_provider import RemoteEmbeddingProvider
+
+        configured_dim = os.getenv("EMBEDDING_DIM")
+        return RemoteEmbeddingProvider(
+            settings.server_url,
+            socket_path=settings.server_socket,
+            timeout=settings.server_timeout_s,
+            expected_dim=int(configured_dim) if configured_dim else None,
+        )
+
     embedding_dim = _resolve_embedding_dim(default=384)
     if provider_name == "localhash":
         model_name = os.getenv("EMBEDDING_MODEL_NAME", "hashing-cpu")
@@ -128,6 +167,15 @@ def _validate_embedding_dim(model_dim: int) -> None:
 
 
 def validate_embedding_configuration() -> None:
-    """Ранняя валидация embedding-конфига (для старта API/worker)."""
+    """Ранняя валидация embedding-конфига (для старта API/worker).
+
+    Модель не загружается: размерность берётся из метаданных, поэтому проверка дешёвая.
+    """
 
     get_embedding_provider()
+
+
+def warm_up_embedding_provider() -> None:
+    """Загружает модель и прогоняет тестовый текст, чтобы первая задача не платила за старт."""
+
+    get_embedding_provider().embed_texts(["warm-up"])
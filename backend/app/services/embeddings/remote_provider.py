@@ -0,0 +1,85 @@
+import logging
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Для Unix-сокета httpx всё равно нужен http-URL, хост в нём игнорируется.
+_UDS_BASE_URL = "http://embedding-server"
+
+
+class EmbeddingServerError(Exception):
+    """Raised when the embedding server returns an invalid or failed response."""
+
+
+class RemoteEmbeddingProvider:
+    """Клиент выделенного embedding-сервера (app.services.embeddings.server) по HTTP или Unix-сокету."""
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        *,
+        socket_path: str | None = None,
+        timeout: float = 30.0,
+        max_retries: int = 3,
+        expected_dim: int | None = None,
+    ) -> None:
+        if not base_url and not socket_path:
+            raise ValueError("EMBEDDING_SERVER_URL or EMBEDDING_SERVER_SOCKET is required for remote embeddings")
+
+        transport = httpx.HTTPTransport(uds=socket_path, retries=max_retries)
+        self._client = httpx.Client(
+            base_url=base_url if base_url and not socket_path else _UDS_BASE_URL,
+            timeout=httpx.Timeout(timeout),
+            transport=transport,
+        )
+        self._expected_dim = expected_dim
+        self._info: dict[str, Any] | None = None
+
+    def _get_info(self) -> dict[str, Any]:
+        # Сервер может подниматься дольше клиента, поэтому метаданные читаем лениво.
+        if self._info is None:
+            info = self._request("GET", "/info")
+            if self._expected_dim is not None and int(info["dim"]) != self._expected_dim:
+                raise ValueError(
+                    "EMBEDDING_DIM mismatch: "
+                    f"configured={self._expected_dim}, server={info['dim']} ({info['name']}). "
+                    "Use matching EMBEDDING_DIM or unset it."
+                )
+            self._info = info
+        return self._info
+
+    def _request(self, method: str, path: str, **kwargs: Any) -> dict[str, Any]:
+        try:
+            response = self._client.request(method, path, **kwargs)
+            response.raise_for_status()
+        except httpx.HTTPError as exc:
+            raise EmbeddingServerError(f"Embedding server request failed: {method} {path}: {exc}") from exc
+        return response.json()
+
+    @property
+    def name(self) -> str:
+        return str(self._get_info()["name"])
+
+    @property
+    def dim(self) -> int:
+        return int(self._get_info()["dim"])
+
+    def get_dim(self) -> int:
+        return self.dim
+
+    def embed_text(self, text: str) -> list[float]:
+        return self.embed_texts([text])[0]
+
+    def embed_texts(self, texts: list[str]) -> list[list[float]]:
+        if not texts:
+            return []
+
+        payload = self._request("POST", "/embed", json={"texts": [text or "" for text in texts]})
+        vectors = payload.get("vectors") or []
+        if len(vectors) != len(texts):
+            raise EmbeddingServerError(
+                f"Embedding server returned {len(vectors)} vectors for {len(texts)} texts"
+            )
+        return vectors
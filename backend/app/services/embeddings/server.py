@@ -0,0 +1,176 @@
+"""Local embedding inference server shared by API and workers.
+
+Loads the model once and groups concurrent requests into batches
+(up to EMBEDDING_SERVER_MAX_BATCH_SIZE texts, waiting at most
+EMBEDDING_SERVER_MAX_WAIT_MS for the batch to fill).
+
+Run over TCP or a Unix socket:
+    uvicorn app.services.embeddings.server:app --host 0.0.0.0 --port 8100
+    uvicorn app.services.embeddings.server:app --uds /run/embeddings/embeddings.sock
+
+Clients use EMBEDDING_PROVIDER=remote with EMBEDDING_SERVER_URL or
+EMBEDDING_SERVER_SOCKET.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+from fastapi import FastAPI, HTTPException, status
+from pydantic import BaseModel, Field
+
+from app.core.config import get_embedding_settings
+from app.services.embeddings.provider import EmbeddingProvider, build_embedding_provider
+
+logger = logging.getLogger(__name__)
+
+
+class EmbedRequest(BaseModel):
+    texts: list[str] = Field(max_length=4096)
+
+
+class EmbedResponse(BaseModel):
+    name: str
+    dim: int
+    vectors: list[list[float]]
+
+
+class ServerInfo(BaseModel):
+    name: str
+    dim: int
+    max_batch_size: int
+    max_wait_ms: int
+
+
+@dataclass(slots=True)
+class _PendingRequest:
+    texts: list[str]
+    future: asyncio.Future[list[list[float]]]
+
+
+class DynamicBatcher:
+    """Collects concurrent embed requests into one model call per batch."""
+
+    def __init__(self, provider: EmbeddingProvider, *, max_batch_size: int, max_wait_ms: int) -> None:
+        self._provider = provider
+        self._max_batch_size = max_batch_size
+        self._max_wait_s = max_wait_ms / 1000
+        self._queue: asyncio.Queue[_PendingRequest] = asyncio.Queue()
+        # Инференс сериализуем в одном потоке: параллелизм даёт сам ONNX runtime.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding-inference")
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        if not texts:
+            return []
+
+        future: asyncio.Future[list[list[float]]] = asyncio.get_running_loop().create_future()
+        await self._queue.put(_PendingRequest(texts=texts, future=future))
+        return await future
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            batch_size = len(batch[0].texts)
+            deadline = loop.time() + self._max_wait_s
+
+            while batch_size < self._max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    pending = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(pending)
+                batch_size += len(pending.texts)
+
+            texts = [text for pending in batch for text in pending.texts]
+            try:
+                vectors = await loop.run_in_executor(self._executor, self._provider.embed_texts, texts)
+            except Exception as exc:  # noqa: BLE001
+                logger.exception("Embedding batch failed | requests=%s texts=%s", len(batch), len(texts))
+                for pending in batch:
+                    if not pending.future.done():
+                        pending.future.set_exception(exc)
+                continue
+
+            offset = 0
+            for pending in batch:
+                size = len(pending.texts)
+                if not pending.future.done():
+                    pending.future.set_result(vectors[offset : offset + size])
+                offset += size
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _provider_dim(provider: EmbeddingProvider) -> int:
+    dim = getattr(provider, "dim", None)
+    if dim is None:
+        dim = len(provider.embed_text("dimension probe"))
+    return int(dim)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    settings = get_embedding_settings()
+    if settings.server_backend == "remote":
+        raise ValueError("EMBEDDING_SERVER_BACKEND cannot be 'remote'")
+
+    provider = build_embedding_provider(settings.server_backend)
+    batcher = DynamicBatcher(
+        provider,
+        max_batch_size=settings.server_max_batch_size,
+        max_wait_ms=settings.server_max_wait_ms,
+    )
+    app.state.provider = provider
+    app.state.dim = _provider_dim(provider)
+    app.state.batcher = batcher
+    app.state.settings = settings
+
+    runner = asyncio.create_task(batcher.run())
+    logger.info(
+        "Embedding server started | provider=%s max_batch_size=%s max_wait_ms=%s",
+        provider.name,
+        settings.server_max_batch_size,
+        settings.server_max_wait_ms,
+    )
+    try:
+        yield
+    finally:
+        runner.cancel()
+        batcher.shutdown()
+
+
+app = FastAPI(title="Job Search App embeddings", lifespan=lifespan)
+
+
+@app.get("/health")
+def health():
+    return {"status": "ok"}
+
+
+@app.get("/info", response_model=ServerInfo)
+def info() -> ServerInfo:
+    settings = app.state.settings
+    return ServerInfo(
+        name=app.state.provider.name,
+        dim=app.state.dim,
+        max_batch_size=settings.server_max_batch_size,
+        max_wait_ms=settings.server_max_wait_ms,
+    )
+
+
+@app.post("/embed", response_model=EmbedResponse)
+async def embed(payload: EmbedRequest) -> EmbedResponse:
+    try:
+        vectors = await app.state.batcher.embed(payload.texts)
+    except Exception as exc:  # noqa: BLE001
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(exc)) from exc
+    return EmbedResponse(name=app.state.provider.name, dim=app.state.dim, vectors=vectors)
@@ -0,0 +1,350 @@
+"""Offline bulk ingestion of HH vacancies from JSONL dumps (plain or gzip).
+
+Every line is one JSON object in one of the shapes:
+
+* a vacancy details payload (``GET /vacancies/{id}``) — it also carries all
+  search item fields;
+* a search item (``items[]`` of ``GET /vacancies``) — snippet is used as the
+  description, like ``include_details=false`` in the live import;
+* ``{"item": {...}, "details": {...}}`` — search item with its details;
+* a search page ``{"items": [...], ...}``.
+
+Records go through the same mapping (``HHImportService._map_to_vacancy_values``),
+parse cache, requirement extraction, quality guard and near-duplicate
+signatures as the live import, but in batches: one upsert per table per
+batch, parsing of unique missing descriptions (optionally in a process pool),
+one commit per batch. Embeddings are rebuilt per batch — enqueued to Celery,
+computed inline or skipped.
+
+Example:
+    python -m app.services.hh_dump_ingest /data/hh/vacancies-*.jsonl.gz --batch-size 1000
+    python -m app.services.hh_dump_ingest dump.jsonl --embeddings inline --processes 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import json
+import logging
+import os
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import IO, Any, Optional, cast
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.db.models import Vacancy
+from app.db.session import SessionLocal
+from app.services import vacancy_dedup
+from app.services.hh_import_service import HHImportService
+from app.services.vacancy_parsing import parse_cache
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+EMBEDDING_BATCH_SIZE = 256
+EMBEDDING_MODES = ("enqueue", "inline", "none")
+
+
+@dataclass(slots=True)
+class HHDumpIngestResult:
+    files: int = 0
+    lines: int = 0
+    bad_lines: int = 0
+    vacancies_seen: int = 0
+    saved_count: int = 0
+    updated_count: int = 0
+    errors_count: int = 0
+    batches: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    embedded: int = 0
+    enqueued_embedding_tasks: int = 0
+
+
+def _open_dump(path: Path) -> IO[str]:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8")
+    return path.open("r", encoding="utf-8")
+
+
+def records_from_payload(payload: dict[str, Any]) -> Iterator[tuple[dict[str, Any], Optional[dict[str, Any]]]]:
+    """(search item, details) pairs of one dump line."""
+
+    if isinstance(payload.get("items"), list):
+        for item in payload["items"]:
+            if isinstance(item, dict):
+                yield item, item if item.get("description") else None
+        return
+
+    if "item" in payload or "details" in payload:
+        details = payload.get("details") if isinstance(payload.get("details"), dict) else None
+        item = payload.get("item") if isinstance(payload.get("item"), dict) else details
+        if item is not None:
+            yield item, details
+        return
+
+    yield payload, payload if payload.get("description") else None
+
+
+def iter_dump_records(
+    paths: Iterable[Path], result: HHDumpIngestResult
+) -> Iterator[tuple[dict[str, Any], Optional[dict[str, Any]]]]:
+    for path in paths:
+        result.files += 1
+        with _open_dump(path) as fh:
+            for line_number, line in enumerate(fh, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                result.lines += 1
+                try:
+                    payload = json.loads(line)
+                except json.JSONDecodeError:
+                    result.bad_lines += 1
+                    logger.warning("Skipping malformed HH dump line | path=%s line=%s", path, line_number)
+                    continue
+                if not isinstance(payload, dict):
+                    result.bad_lines += 1
+                    continue
+                yield from records_from_payload(payload)
+
+
+class HHDumpIngestService:
+    """Bulk-imports HH dump records with the live import's mapping and derivation, batch by batch."""
+
+    def __init__(
+        self,
+        db: Session,
+        *,
+        processes: int = 1,
+        embeddings: str = "enqueue",
+        embedding_batch_size: int = EMBEDDING_BATCH_SIZE,
+    ) -> None:
+        if embeddings not in EMBEDDING_MODES:
+            raise ValueError(f"embeddings must be one of {EMBEDDING_MODES}, got {embeddings!r}")
+        self.db = db
+        self.processes = max(1, processes)
+        self.embeddings = embeddings
+        self.embedding_batch_size = max(1, embedding_batch_size)
+        self.hh_import_service = HHImportService(db=db, hh_client=cast(Any, None))
+
+    def ingest(
+        self,
+        records: Iterable[tuple[dict[str, Any], Optional[dict[str, Any]]]],
+        *,
+        result: HHDumpIngestResult | None = None,
+        batch_size: int = BATCH_SIZE,
+        limit: int | None = None,
+    ) -> HHDumpIngestResult:
+        result = result or HHDumpIngestResult()
+        batch_size = max(1, batch_size)
+        batch: list[tuple[dict[str, Any], Optional[dict[str, Any]]]] = []
+        taken = 0
+        for record in records:
+            if limit is not None and taken >= limit:
+                break
+            batch.append(record)
+            taken += 1
+            if len(batch) >= batch_size:
+                self._ingest_batch(batch, result)
+                batch = []
+        if batch:
+            self._ingest_batch(batch, result)
+        return result
+
+    def _ingest_batch(
+        self,
+        records: list[tuple[dict[str, Any], Optional[dict[str, Any]]]],
+        result: HHDumpIngestResult,
+    ) -> None:
+        started = time.perf_counter()
+        # Внутри батча одна вакансия может встретиться несколько раз: берём последнюю запись.
+        by_external_id: dict[str, tuple[dict[str, Any], Optional[dict[str, Any]]]] = {}
+        for item, details in records:
+            if item.get("id") is None:
+                result.errors_count += 1
+                continue
+            try:
+                values = HHImportService._map_to_vacancy_values(item, details)
+            except Exception:  # noqa: BLE001
+                logger.exception("Failed to map HH dump record | external_id=%s", item.get("id"))
+                result.errors_count += 1
+                continue
+            by_external_id[values["external_id"]] = (values, details)
+
+        if not by_external_id:
+            return
+
+        result.vacancies_seen += len(by_external_id)
+        try:
+            vacancy_ids, existing_count = self._bulk_upsert_vacancies(
+                [values for values, _ in (by_external_id[key] for key in sorted(by_external_id))]
+            )
+
+            descriptions = {
+                external_id: values.get("description") or "" for external_id, (values, _) in by_external_id.items()
+            }
+            digest_by_external_id = {
+                external_id: parse_cache.description_hash(description) for external_id, description in descriptions.items()
+            }
+            description_by_hash = {
+                digest_by_external_id[external_id]: description for external_id, description in descriptions.items()
+            }
+            entries = parse_cache.load_entries(self.db, description_by_hash)
+            missing_hashes = sorted(
+                digest for digest in description_by_hash if digest not in entries or not parse_cache.is_current(entries[digest])
+            )
+            derived = parse_cache.derive_many(
+                [(description_by_hash[digest], entries.get(digest)) for digest in missing_hashes], self.processes
+            )
+            new_entries = {digest: entry for digest, entry in zip(missing_hashes, derived) if entry is not None}
+            entries.update(new_entries)
+            result.cache_hits += len(description_by_hash) - len(missing_hashes)
+            result.cache_misses += len(missing_hashes)
+
+            parsed_by_vacancy: list[tuple[int, dict[str, Any]]] = []
+            requirements_by_vacancy: dict[int, list[dict[str, Any]]] = {}
+            signature_items: list[tuple[int, str]] = []
+            for external_id in sorted(by_external_id):
+                values, details = by_external_id[external_id]
+                vacancy_id = vacancy_ids[external_id]
+                entry = entries.get(digest_by_external_id[external_id])
+                if entry is None:
+                    result.errors_count += 1
+                    continue
+                parsed = parse_cache.parsed_payload(entry)
+                self.hh_import_service._apply_low_quality_guard(
+                    vacancy_id=vacancy_id,
+                    external_id=external_id,
+                    parsed=parsed,
+                    section_requirements=entry["section_requirements"],
+                )
+                parsed_by_vacancy.append((vacancy_id, parsed))
+                requirements_by_vacancy[vacancy_id] = HHImportService._generated_requirement_rows(
+                    details, parsed, entry["text_requirements"]
+                )
+                signature_items.append(
+                    (vacancy_id, vacancy_dedup.signature_text(values.get("title"), parsed["plain_text"]))
+                )
+
+            parse_cache.store_entries(self.db, new_entries)
+            self.hh_import_service._bulk_upsert_vacancy_parsed(parsed_by_vacancy)
+            self.hh_import_service._bulk_replace_generated_requirements(requirements_by_vacancy)
+            vacancy_dedup.assign_clusters(self.db, signature_items)
+            self.db.commit()
+        except Exception:  # noqa: BLE001
+            self.db.rollback()
+            logger.exception("Failed to ingest HH dump batch | size=%s", len(by_external_id))
+            result.errors_count += len(by_external_id)
+            return
+
+        result.batches += 1
+        result.updated_count += existing_count
+        result.saved_count += len(by_external_id) - existing_count
+        self._rebuild_embeddings(sorted(vacancy_id for vacancy_id, _ in parsed_by_vacancy), result)
+        logger.info(
+            "HH dump batch committed | batch=%s size=%s seconds=%.2f cumulative_saved=%s cumulative_updated=%s cumulative_errors=%s",
+            result.batches,
+            len(by_external_id),
+            time.perf_counter() - started,
+            result.saved_count,
+            result.updated_count,
+            result.errors_count,
+        )
+
+    def _bulk_upsert_vacancies(self, values_list: list[dict[str, Any]]) -> tuple[dict[str, int], int]:
+        """(external_id -> vacancy id, number of already existing vacancies); one upsert for the whole batch."""
+
+        external_ids = [values["external_id"] for values in values_list]
+        existing = set(
+            self.db.execute(
+                select(Vacancy.external_id).where(Vacancy.source == "hh", Vacancy.external_id.in_(external_ids))
+            ).scalars()
+        )
+
+        stmt = insert(Vacancy).values(values_list)
+        update_fields = {key: stmt.excluded[key] for key in values_list[0] if key not in {"source", "external_id"}}
+        update_fields["updated_at"] = func.now()
+        stmt = stmt.on_conflict_do_update(constraint="uq_vacancies_source_external_id", set_=update_fields)
+        rows = self.db.execute(stmt.returning(Vacancy.external_id, Vacancy.id)).all()
+
+        return {external_id: int(vacancy_id) for external_id, vacancy_id in rows}, len(existing)
+
+    def _rebuild_embeddings(self, vacancy_ids: list[int], result: HHDumpIngestResult) -> None:
+        if self.embeddings == "none" or not vacancy_ids:
+            return
+
+        from app.tasks.embedding_tasks import rebuild_vacancy_embeddings_for_ids
+
+        for start in range(0, len(vacancy_ids), self.embedding_batch_size):
+            batch_ids = vacancy_ids[start : start + self.embedding_batch_size]
+            if self.embeddings == "inline":
+                # Вызов задачи напрямую выполняет её в текущем процессе (своя сессия, батчевый embed_texts).
+                payload = rebuild_vacancy_embeddings_for_ids(batch_ids, only_changed=True)
+                result.embedded += int(payload.get("processed") or 0)
+            else:
+                rebuild_vacancy_embeddings_for_ids.delay(batch_ids, only_changed=True)
+                result.enqueued_embedding_tasks += 1
+
+
+def ingest_files(
+    paths: Iterable[str | Path],
+    *,
+    batch_size: int = BATCH_SIZE,
+    limit: int | None = None,
+    processes: int = 1,
+    embeddings: str = "enqueue",
+    embedding_batch_size: int = EMBEDDING_BATCH_SIZE,
+) -> HHDumpIngestResult:
+    result = HHDumpIngestResult()
+    db = SessionLocal()
+    try:
+        service = HHDumpIngestService(
+            db, processes=processes, embeddings=embeddings, embedding_batch_size=embedding_batch_size
+        )
+        records = iter_dump_records((Path(path) for path in paths), result)
+        return service.ingest(records, result=result, batch_size=batch_size, limit=limit)
+    finally:
+        db.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+", help="JSONL dump files (.jsonl or .jsonl.gz)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="vacancies per DB batch")
+    parser.add_argument("--limit", type=int, default=None, help="stop after this many records")
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=max(1, int(os.getenv("HH_PARSE_PROCESSES") or "1")),
+        help="parser processes (default: HH_PARSE_PROCESSES)",
+    )
+    parser.add_argument("--embeddings", choices=EMBEDDING_MODES, default="enqueue", help="how to build embeddings")
+    parser.add_argument("--embedding-batch-size", type=int, default=EMBEDDING_BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    missing = [path for path in args.paths if not Path(path).is_file()]
+    if missing:
+        parser.error(f"dump files not found: {', '.join(missing)}")
+
+    started = time.perf_counter()
+    result = ingest_files(
+        args.paths,
+        batch_size=args.batch_size,
+        limit=args.limit,
+        processes=args.processes,
+        embeddings=args.embeddings,
+        embedding_batch_size=args.embedding_batch_size,
+    )
+    print(json.dumps({**asdict(result), "seconds": round(time.perf_counter() - started, 2)}, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,17 +4,15 @@ from datetime import datetime, timezone
 import re
 from typing import Any, Optional
 
-from sqlalchemy import delete, select
+from sqlalchemy import delete, func, select
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
 
 from app.db.models import SavedSearch, Vacancy, VacancyParsed, VacancyRequirement
 from app.integrations.hh_client import HHClient
-from app.services.requirements_extractor import (
-    extract_requirements_fallback,
-    extract_requirements_from_sections,
-)
-from app.services.vacancy_parsing import parse_hh_description
+from app.services import vacancy_dedup
+from app.services.vacancy_parsing import parse_cache
+from app.services.vacancy_parsing.stages import FEATURES_VERSION, requirements_version
 
 logger = logging.getLogger(__name__)
 
@@ -133,17 +131,21 @@ class HHImportService:
                     is_existing = self._vacancy_exists(values["source"], values["external_id"])
                     vacancy_id = self._upsert_vacancy(values)
 
-                    parsed = parse_hh_description(values.get("description") or "")
-                    section_requirements = extract_requirements_from_sections(parsed.get("sections") or {})
+                    cached = parse_cache.get_or_derive(self.db, values.get("description") or "")
+                    parsed = parse_cache.parsed_payload(cached)
                     self._apply_low_quality_guard(
                         vacancy_id=vacancy_id,
                         external_id=values["external_id"],
                         parsed=parsed,
-                        section_requirements=section_requirements,
+                        section_requirements=cached["section_requirements"],
                     )
                     self._upsert_vacancy_parsed(vacancy_id, parsed)
+                    vacancy_dedup.assign_clusters(
+                        self.db,
+                        [(vacancy_id, vacancy_dedup.signature_text(values.get("title"), parsed["plain_text"]))],
+                    )
 
-                    self._replace_generated_requirements(vacancy_id, details, parsed, section_requirements)
+                    self._replace_generated_requirements(vacancy_id, details, parsed, cached["text_requirements"])
 
                     page_embedding_ids.add(vacancy_id)
 
@@ -258,6 +260,8 @@ class HHImportService:
     def _upsert_vacancy(self, values: dict[str, Any]) -> int:
         stmt = insert(Vacancy).values(**values)
         update_fields = {k: stmt.excluded[k] for k in values if k not in {"source", "external_id"}}
+        # onupdate не срабатывает в ON CONFLICT; updated_at участвует в ETag рекомендаций.
+        update_fields["updated_at"] = func.now()
 
         stmt = stmt.on_conflict_do_update(
             constraint="uq_vacancies_source_external_id",
@@ -271,54 +275,80 @@ class HHImportService:
         vacancy_id: int,
         details: Optional[dict[str, Any]],
         parsed: dict[str, Any],
-        section_requirements: list[dict[str, Any]],
+        text_requirements: list[dict[str, Any]],
     ) -> None:
+        self._bulk_replace_generated_requirements(
+            {vacancy_id: self._generated_requirement_rows(details, parsed, text_requirements)}
+        )
+
+    def _bulk_replace_generated_requirements(self, requirements_by_vacancy: dict[int, list[dict[str, Any]]]) -> None:
+        """Replace generated skill/constraint requirements of many vacancies with one DELETE and one INSERT."""
+
+        if not requirements_by_vacancy:
+            return
+
         self.db.execute(
             delete(VacancyRequirement).where(
-                VacancyRequirement.vacancy_id == vacancy_id,
+                VacancyRequirement.vacancy_id.in_(list(requirements_by_vacancy)),
                 VacancyRequirement.kind.in_(("skill", "constraint")),
             )
         )
 
-        requirements: list[VacancyRequirement] = []
+        rows = [
+            {"vacancy_id": vacancy_id, **requirement}
+            for vacancy_id, requirements in requirements_by_vacancy.items()
+            for requirement in requirements
+        ]
+        if rows:
+            self.db.execute(insert(VacancyRequirement), rows)
+
+    @classmethod
+    def _generated_requirement_rows(
+        cls,
+        details: Optional[dict[str, Any]],
+        parsed: dict[str, Any],
+        text_requirements: list[dict[str, Any]],
+    ) -> list[dict[str, Any]]:
+        """Deduplicated skill and constraint requirement rows (without vacancy_id); no DB access.
+
+        ``text_requirements`` come from ``extract_text_skill_requirements`` (or the parse cache).
+        """
+
+        rows: list[dict[str, Any]] = []
         seen: set[tuple[str, str]] = set()
 
-        generated_skill_requirements = self._build_skill_requirements(details, parsed, section_requirements)
-        for requirement in generated_skill_requirements:
+        for requirement in cls._build_skill_requirements(details, text_requirements):
             normalized = requirement["normalized_key"]
             dedupe_key = ("skill", normalized or requirement["raw_text"])
             if dedupe_key in seen:
                 continue
             seen.add(dedupe_key)
-            requirements.append(
-                VacancyRequirement(
-                    vacancy_id=vacancy_id,
-                    kind="skill",
-                    raw_text=requirement["raw_text"],
-                    normalized_key=normalized,
-                    weight=requirement["weight"],
-                    is_hard=requirement["is_hard"],
-                )
+            rows.append(
+                {
+                    "kind": "skill",
+                    "raw_text": requirement["raw_text"],
+                    "normalized_key": normalized,
+                    "weight": requirement["weight"],
+                    "is_hard": requirement["is_hard"],
+                }
             )
 
-        for raw_text, normalized_key, is_hard in self._extract_constraints(details, parsed.get("plain_text") or ""):
+        for raw_text, normalized_key, is_hard in cls._extract_constraints(details, parsed.get("plain_text") or ""):
             dedupe_key = ("constraint", normalized_key)
             if dedupe_key in seen:
                 continue
             seen.add(dedupe_key)
-            requirements.append(
-                VacancyRequirement(
-                    vacancy_id=vacancy_id,
-                    kind="constraint",
-                    raw_text=raw_text,
-                    normalized_key=normalized_key,
-                    weight=3 if is_hard else 1,
-                    is_hard=is_hard,
-                )
+            rows.append(
+                {
+                    "kind": "constraint",
+                    "raw_text": raw_text,
+                    "normalized_key": normalized_key,
+                    "weight": 3 if is_hard else 1,
+                    "is_hard": is_hard,
+                }
             )
 
-        if requirements:
-            self.db.add_all(requirements)
+        return rows
 
     @staticmethod
     def _extract_skills(details: Optional[dict[str, Any]]) -> list[str]:
@@ -334,11 +364,11 @@ class HHImportService:
                     skills.append(cleaned)
         return skills
 
+    @classmethod
     def _build_skill_requirements(
-        self,
+        cls,
         details: Optional[dict[str, Any]],
-        parsed: dict[str, Any],
-        section_requirements: list[dict[str, Any]],
+        text_requirements: list[dict[str, Any]],
     ) -> list[dict[str, Any]]:
         skill_requirements: dict[str, dict[str, Any]] = {}
 
@@ -353,16 +383,11 @@ class HHImportService:
                     "weight": requirement["weight"],
                 }
 
-        for requirement in section_requirements:
+        for requirement in text_requirements:
             upsert_requirement(requirement)
 
-        clean_description = parsed.get("plain_text") or ""
-        if len(skill_requirements) < 3:
-            for requirement in extract_requirements_fallback(clean_description):
-                upsert_requirement(requirement)
-
-        for raw_skill in self._extract_skills(details):
-            normalized = self._normalize_requirement_value(raw_skill)
+        for raw_skill in cls._extract_skills(details):
+            normalized = cls._normalize_requirement_value(raw_skill)
             upsert_requirement(
                 {
                     "raw_text": raw_skill,
@@ -382,35 +407,59 @@ class HHImportService:
         parsed: dict[str, Any],
         section_requirements: list[dict[str, Any]],
     ) -> None:
-        quality_score = float(parsed.get("quality_score") or 0.0)
-        skills_count = len(section_requirements)
-
-        if quality_score >= 0.35 or skills_count >= 3:
+        if not self._apply_quality_features(parsed, section_requirements):
             return
 
-        sections_json = dict(parsed.get("sections") or {})
-        meta = dict(sections_json.get("meta") or {})
-        meta["low_quality"] = True
-        sections_json["meta"] = meta
-        parsed["sections"] = sections_json
-
         logger.warning(
             "HH parsed description quality guard triggered | vacancy_id=%s external_id=%s quality_score=%.4f skills_count=%s",
             vacancy_id,
             external_id,
-            quality_score,
-            skills_count,
+            float(parsed.get("quality_score") or 0.0),
+            len(section_requirements),
         )
 
+    @staticmethod
+    def _apply_quality_features(parsed: dict[str, Any], section_requirements: list[dict[str, Any]]) -> bool:
+        """Set (or clear) ``sections.meta.low_quality`` in place; returns the flag."""
+
+        quality_score = float(parsed.get("quality_score") or 0.0)
+        low_quality = quality_score < 0.35 and len(section_requirements) < 3
+
+        sections_json = dict(parsed.get("sections") or {})
+        meta = dict(sections_json.get("meta") or {})
+        meta.pop("low_quality", None)
+        if low_quality:
+            meta["low_quality"] = True
+        if meta:
+            sections_json["meta"] = meta
+        else:
+            sections_json.pop("meta", None)
+        parsed["sections"] = sections_json
+        return low_quality
+
     def _upsert_vacancy_parsed(self, vacancy_id: int, parsed: dict[str, Any]) -> None:
+        self._bulk_upsert_vacancy_parsed([(vacancy_id, parsed)])
+
+    def _bulk_upsert_vacancy_parsed(self, parsed_by_vacancy: list[tuple[int, dict[str, Any]]]) -> None:
+        if not parsed_by_vacancy:
+            return
+
         now_utc = datetime.now(timezone.utc)
+        current_requirements_version = requirements_version()
         stmt = insert(VacancyParsed).values(
-            vacancy_id=vacancy_id,
-            plain_text=parsed["plain_text"],
-            sections_json=parsed["sections"],
-            extracted_at=now_utc,
-            version=parsed["version"],
-            quality_score=parsed["quality_score"],
+            [
+                {
+                    "vacancy_id": vacancy_id,
+                    "plain_text": parsed["plain_text"],
+                    "sections_json": parsed["sections"],
+                    "extracted_at": parsed.get("extracted_at") or now_utc,
+                    "version": parsed["version"],
+                    "requirements_version": parsed.get("requirements_version") or current_requirements_version,
+                    "features_version": parsed.get("features_version") or FEATURES_VERSION,
+                    "quality_score": parsed["quality_score"],
+                }
+                for vacancy_id, parsed in parsed_by_vacancy
+            ]
         )
         stmt = stmt.on_conflict_do_update(
             index_elements=[VacancyParsed.vacancy_id],
@@ -419,6 +468,8 @@ class HHImportService:
                 "sections_json": stmt.excluded.sections_json,
                 "extracted_at": stmt.excluded.extracted_at,
                 "version": stmt.excluded.version,
+                "requirements_version": stmt.excluded.requirements_version,
+                "features_version": stmt.excluded.features_version,
                 "quality_score": stmt.excluded.quality_score,
             },
         )
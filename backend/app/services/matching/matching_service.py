@@ -37,7 +37,9 @@ from app.db.models import (
     VacancyParsed,
     VacancyRequirement,
     VacancyScore,
+    VacancyScoreExplanation,
 )
+from app.services import vacancy_dedup
 from app.services.matching.utils import (
     contains_token,
     extract_profile_tokens,
@@ -46,6 +48,7 @@ from app.services.matching.utils import (
     normalize_skill,
     tokenize,
 )
+from app.services.matching.weights import ScoreComponents, combine, get_weights, with_final
 from app.services.vacancy_parsing.requirement_markers import EXCEPTIONS
 from app.utils.text_clean import strip_html
 
@@ -62,7 +65,10 @@ class MatchingService:
         self.db = db
 
     def compute_for_pair(self, profile_id: int, vacancy_id: int) -> VacancyScore:
-        """Compute layer1/layer2/final score, persist VacancyScore and ResumeEvidence."""
+        """Compute layer1/layer2/final score, persist VacancyScore and ResumeEvidence.
+
+        Commits, but doesn't touch the response cache: callers invalidate it once per batch.
+        """
         profile = self.db.get(Profile, profile_id)
         if not profile:
             raise ValueError(f"Profile not found: {profile_id}")
@@ -150,36 +156,27 @@ class MatchingService:
 
         eligibility_ok = len(reasons_failed) == 0
 
-        penalties: list[str] = []
-        raw_score = 0.45 * semantic_score + 0.35 * hard_coverage + 0.20 * nice_coverage
+        has_salary_warning = any("зарплаты" in warning for warning in warnings)
+        components = ScoreComponents(
+            semantic=semantic_score,
+            hard=hard_coverage,
+            nice=nice_coverage,
+            eligible=eligibility_ok,
+            overqualified=overqualified,
+            salary_warning=has_salary_warning,
+            no_requirements=skill_requirements_count == 0,
+        )
+        weights = get_weights()
+        _, final_score, verdict = combine(weights, components)
 
-        if overqualified:
-            raw_score *= 0.9
+        penalties: list[str] = []
+        if components.overqualified:
             penalties.append("overqualified")
-
-        has_salary_warning = any("зарплаты" in warning for warning in warnings)
-        if has_salary_warning:
-            raw_score *= 0.95
+        if components.salary_warning:
             penalties.append("salary_warning")
-
-        if skill_requirements_count == 0:
-            raw_score = min(raw_score, 0.65)
+        if components.no_requirements:
             penalties.append("no_skill_requirements_cap")
 
-        raw_score = float(max(0.0, min(1.0, raw_score)))
-        final_score = 0.0 if not eligibility_ok else raw_score
-
-        if not eligibility_ok:
-            verdict = "reject"
-        elif raw_score >= 0.75:
-            verdict = "strong"
-        elif raw_score >= 0.50:
-            verdict = "ok"
-        elif raw_score >= 0.30:
-            verdict = "weak"
-        else:
-            verdict = "reject"
-
         explanation = {
             "warnings": self._unique(explanation_warnings),
             "eligibility": {
@@ -189,10 +186,9 @@ class MatchingService:
             },
             "ats": ats,
             "semantic": {"score": semantic_score},
+            # score/raw_score/verdict/weights_version добавляются при чтении из строки vacancy_scores
+            # (weights.with_final), чтобы смена весов не оставляла их устаревшими.
             "final": {
-                "score": final_score,
-                "raw_score": raw_score,
-                "verdict": verdict,
                 "components": {
                     "semantic": semantic_score,
                     "hard": hard_coverage,
@@ -214,9 +210,15 @@ class MatchingService:
             vacancy_id=vacancy_id,
             layer1_score=(hard_coverage + nice_coverage) / 2,
             layer2_score=semantic_score,
+            hard_coverage=hard_coverage,
+            nice_coverage=nice_coverage,
+            eligible=components.eligible,
+            overqualified=components.overqualified,
+            salary_warning=components.salary_warning,
+            no_requirements=components.no_requirements,
             final_score=final_score,
             verdict=verdict,
-            explanation=explanation,
+            weights_version=weights.version,
             computed_at=datetime.now(timezone.utc),
         )
         stmt = stmt.on_conflict_do_update(
@@ -224,14 +226,28 @@ class MatchingService:
             set_={
                 "layer1_score": stmt.excluded.layer1_score,
                 "layer2_score": stmt.excluded.layer2_score,
+                "hard_coverage": stmt.excluded.hard_coverage,
+                "nice_coverage": stmt.excluded.nice_coverage,
+                "eligible": stmt.excluded.eligible,
+                "overqualified": stmt.excluded.overqualified,
+                "salary_warning": stmt.excluded.salary_warning,
+                "no_requirements": stmt.excluded.no_requirements,
                 "final_score": stmt.excluded.final_score,
                 "verdict": stmt.excluded.verdict,
-                "explanation": stmt.excluded.explanation,
+                "weights_version": stmt.excluded.weights_version,
                 "computed_at": stmt.excluded.computed_at,
             },
+        ).returning(VacancyScore.id)
+        score_id = self.db.execute(stmt).scalar_one()
+
+        # Широкий JSONB живёт отдельно и переписывается, только если объяснение изменилось.
+        explanation_stmt = insert(VacancyScoreExplanation).values(score_id=score_id, explanation=explanation)
+        explanation_stmt = explanation_stmt.on_conflict_do_update(
+            index_elements=[VacancyScoreExplanation.score_id],
+            set_={"explanation": explanation_stmt.excluded.explanation},
+            where=VacancyScoreExplanation.explanation.is_distinct_from(explanation_stmt.excluded.explanation),
         )
-
-        self.db.execute(stmt)
+        self.db.execute(explanation_stmt)
         self.db.commit()
 
         return self.db.execute(
@@ -242,10 +258,17 @@ class MatchingService:
         ).scalar_one()
 
     def compute_recommendations(self, profile_id: int, limit: int = 50) -> list[VacancyScore]:
-        """Compute recommendations for profile from top-N semantic nearest vacancies."""
+        """Compute recommendations for profile from top-N semantic nearest vacancies.
+
+        Near-duplicates are scored once: only cluster representatives are considered,
+        and the profile's scores of cluster members (e.g. computed on a tailoring
+        miss) are dropped, since they would not be refreshed here.
+        """
         if self.db.get(ProfileEmbedding, profile_id) is None:
             raise ValueError(f"Profile embedding not found for profile_id={profile_id}")
 
+        vacancy_dedup.drop_member_scores(self.db, profile_id=profile_id)
+
         top_vacancy_rows = self.db.execute(
             text(
                 """
@@ -255,6 +278,11 @@ class MatchingService:
                 FROM vacancies v
                 JOIN profile_embeddings_v2 pe ON pe.profile_id = :profile_id
                 LEFT JOIN vacancy_embeddings_v2 ve ON ve.vacancy_id = v.id
+                LEFT JOIN vacancy_signatures vs ON vs.vacancy_id = v.id
+                WHERE vs.cluster_id IS NULL
+                   OR vs.cluster_id = v.id
+                   -- представитель удалён в обход DELETE /vacancies: участник считается вне кластера
+                   OR NOT EXISTS (SELECT 1 FROM vacancies rep WHERE rep.id = vs.cluster_id)
                 ORDER BY (ve.vacancy_id IS NULL), ve.embedding <=> pe.embedding
                 """
             ),
@@ -277,14 +305,42 @@ class MatchingService:
 
         return sorted(scores, key=lambda score: score.final_score, reverse=True)
 
+    def recompute_scores_for_vacancies(self, vacancy_ids: list[int]) -> list[tuple[int, int]]:
+        """Recompute already stored scores of the given vacancies (for every profile that has one).
+
+        Returns recomputed (profile_id, vacancy_id) pairs.
+        """
+        if not vacancy_ids:
+            return []
+
+        pairs = self.db.execute(
+            select(VacancyScore.profile_id, VacancyScore.vacancy_id)
+            .where(VacancyScore.vacancy_id.in_(vacancy_ids))
+            .order_by(VacancyScore.vacancy_id.asc(), VacancyScore.profile_id.asc())
+        ).all()
+
+        recomputed: list[tuple[int, int]] = []
+        for profile_id, vacancy_id in pairs:
+            try:
+                self.compute_for_pair(profile_id=profile_id, vacancy_id=vacancy_id)
+            except ValueError as exc:
+                logger.warning(
+                    "Skipping score recompute | profile_id=%s vacancy_id=%s reason=%s", profile_id, vacancy_id, exc
+                )
+                continue
+            recomputed.append((profile_id, vacancy_id))
+        return recomputed
+
     def get_tailoring(self, profile_id: int, vacancy_id: int) -> dict[str, Any]:
         """Return explanation and evidence list to display tailoring recommendations."""
-        score = self.db.execute(
-            select(VacancyScore).where(
+        row = self.db.execute(
+            select(VacancyScore, VacancyScoreExplanation.explanation)
+            .join(VacancyScoreExplanation, VacancyScoreExplanation.score_id == VacancyScore.id)
+            .where(
                 VacancyScore.profile_id == profile_id,
                 VacancyScore.vacancy_id == vacancy_id,
             )
-        ).scalar_one_or_none()
+        ).one_or_none()
 
         evidence_rows = self.db.execute(
             select(ResumeEvidence.evidence_text, ResumeEvidence.confidence)
@@ -296,8 +352,8 @@ class MatchingService:
         ).all()
 
         return {
-            "explanation": score.explanation if score else {},
-            "evidence": [{"text": row.evidence_text, "confidence": row.confidence} for row in evidence_rows],
+            "explanation": with_final(row.explanation, row.VacancyScore) if row is not None else {},
+            "evidence": [{"text": item.evidence_text, "confidence": item.confidence} for item in evidence_rows],
         }
 
     def _compute_layer1(
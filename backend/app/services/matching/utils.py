@@ -5,21 +5,9 @@ from __future__ import annotations
 import re
 from typing import Optional
 
-TOKEN_RE = re.compile(r"[^\W_]+(?:[.+#-][^\W_]+|[+#]+)*", re.UNICODE)
-
-# Alias graph. Every entry is expanded bidirectionally.
-_ALIAS_GROUPS: tuple[set[str], ...] = (
-    {"react", "reactjs"},
-    {"postgres", "postgresql"},
-    {"node", "node.js", "nodejs"},
-    {"javascript", "js"},
-    {"typescript", "ts"},
-    {"drf", "django rest framework", "django-rest-framework"},
-    {"oop", "ооп"},
-    {"docker compose", "docker-compose"},
-    {"grpc", "gRPC".lower()},
-)
+from app.services.skills import get_skill_taxonomy
 
+TOKEN_RE = re.compile(r"[^\W_]+(?:[.+#-][^\W_]+|[+#]+)*", re.UNICODE)
 
 def tokenize(text: str) -> list[str]:
     """Tokenize text for technical skill matching (c++, c#, node.js, django-rest-framework)."""
@@ -33,16 +21,16 @@ def normalize_skill(text: str) -> str:
     return " ".join(tokenize(text))
 
 
-def _build_alias_map() -> dict[str, set[str]]:
-    alias_map: dict[str, set[str]] = {}
-    for group in _ALIAS_GROUPS:
-        normalized_group = {" ".join(tokenize(alias)) for alias in group if tokenize(alias)}
-        for alias in normalized_group:
-            alias_map[alias] = set(normalized_group)
-    return alias_map
+def get_alias_map() -> dict[str, set[str]]:
+    """Alias graph from the taxonomy equivalences; every group is expanded bidirectionally."""
+    return get_skill_taxonomy().alias_map(tokenize)
 
 
-ALIAS_MAP: dict[str, set[str]] = _build_alias_map()
+def __getattr__(name: str):
+    # ALIAS_MAP остаётся доступным, но всегда отражает текущую (перезагружаемую) таксономию.
+    if name == "ALIAS_MAP":
+        return get_alias_map()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def contains_token(tokens_set: set[str], term_tokens: list[str]) -> bool:
@@ -62,7 +50,7 @@ def aliases_for_term(term: str) -> set[str]:
     normalized_term = normalize_skill(term)
     if not normalized_term:
         return set()
-    return ALIAS_MAP.get(normalized_term, {normalized_term})
+    return get_alias_map().get(normalized_term, {normalized_term})
 
 
 def has_uncertain_match(tokens_set: set[str], normalized_term: str) -> bool:
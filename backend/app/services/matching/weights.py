@@ -0,0 +1,228 @@
+"""Versioned scoring weights.
+
+``vacancy_scores`` stores score components (semantic, hard/nice coverage) and
+penalty flags; ``final_score``/``verdict`` are derived from them with a
+weights version from ``scoring_weights.json`` (or ``SCORING_WEIGHTS_PATH``):
+``{"active": "v1", "versions": {"v1": {"semantic": 0.45, ...}}}``.
+``SCORING_WEIGHTS_VERSION`` overrides the active version. The file is re-read
+when its mtime changes.
+
+The same formula exists in Python (``combine``, used when a pair is scored)
+and as a SQL expression (``final_score_sql``/``verdict_sql``), so any version
+can be applied at query time or to stored rows without recomputing pairs.
+The explanation JSONB keeps only components and penalties; its final
+score/verdict are rendered from the score row (``final_explanation``), so
+re-weighting never leaves them stale.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.orm import Session
+
+from app.db.models import VacancyScore
+
+DEFAULT_WEIGHTS_PATH = Path(__file__).with_name("scoring_weights.json")
+
+
+@dataclass(frozen=True, slots=True)
+class ScoringWeights:
+    version: str
+    semantic: float = 0.45
+    hard: float = 0.35
+    nice: float = 0.20
+    overqualified_factor: float = 0.9
+    salary_warning_factor: float = 0.95
+    no_requirements_cap: float = 0.65
+    strong_threshold: float = 0.75
+    ok_threshold: float = 0.50
+    weak_threshold: float = 0.30
+
+
+@dataclass(frozen=True, slots=True)
+class ScoreComponents:
+    semantic: float
+    hard: float
+    nice: float
+    eligible: bool
+    overqualified: bool
+    salary_warning: bool
+    no_requirements: bool
+
+
+@dataclass(frozen=True, slots=True)
+class WeightsConfig:
+    active: str
+    versions: dict[str, ScoringWeights]
+
+
+_WEIGHT_FIELDS = {field.name for field in fields(ScoringWeights)} - {"version"}
+
+
+def _weights_path() -> Path:
+    return Path(os.getenv("SCORING_WEIGHTS_PATH") or DEFAULT_WEIGHTS_PATH)
+
+
+@lru_cache(maxsize=4)
+def _load(path: Path, mtime: float) -> WeightsConfig:
+    with path.open(encoding="utf-8") as file:
+        payload = json.load(file)
+    if not isinstance(payload, dict) or not isinstance(payload.get("versions"), dict) or not payload["versions"]:
+        raise ValueError(f"Scoring weights {path} must be an object with a non-empty 'versions' object")
+
+    versions: dict[str, ScoringWeights] = {}
+    for version, values in payload["versions"].items():
+        unknown = set(values) - _WEIGHT_FIELDS
+        if unknown:
+            raise ValueError(f"Scoring weights {path}: unknown keys in {version!r}: {sorted(unknown)}")
+        versions[version] = ScoringWeights(version=version, **{key: float(value) for key, value in values.items()})
+
+    active = payload.get("active") or next(iter(versions))
+    return WeightsConfig(active=active, versions=versions)
+
+
+def get_weights_config() -> WeightsConfig:
+    path = _weights_path()
+    return _load(path, path.stat().st_mtime)
+
+
+def get_weights(version: str | None = None) -> ScoringWeights:
+    """Weights of ``version`` (default: the active one); ``KeyError`` for an unknown version."""
+
+    config = get_weights_config()
+    version = version or os.getenv("SCORING_WEIGHTS_VERSION") or config.active
+    try:
+        return config.versions[version]
+    except KeyError:
+        raise KeyError(f"Unknown scoring weights version: {version!r}") from None
+
+
+def _verdict(weights: ScoringWeights, eligible: bool, score: float) -> str:
+    if not eligible:
+        return "reject"
+    if score >= weights.strong_threshold:
+        return "strong"
+    if score >= weights.ok_threshold:
+        return "ok"
+    if score >= weights.weak_threshold:
+        return "weak"
+    return "reject"
+
+
+def raw_score(weights: ScoringWeights, components: ScoreComponents) -> float:
+    score = weights.semantic * components.semantic + weights.hard * components.hard + weights.nice * components.nice
+    if components.overqualified:
+        score *= weights.overqualified_factor
+    if components.salary_warning:
+        score *= weights.salary_warning_factor
+    if components.no_requirements:
+        score = min(score, weights.no_requirements_cap)
+    return float(max(0.0, min(1.0, score)))
+
+
+def combine(weights: ScoringWeights, components: ScoreComponents) -> tuple[float, float, str]:
+    """(raw_score, final_score, verdict) of one pair."""
+
+    score = raw_score(weights, components)
+    return score, (score if components.eligible else 0.0), _verdict(weights, components.eligible, score)
+
+
+def score_components(score: VacancyScore) -> ScoreComponents:
+    return ScoreComponents(
+        semantic=score.layer2_score,
+        hard=score.hard_coverage,
+        nice=score.nice_coverage,
+        eligible=score.eligible,
+        overqualified=score.overqualified,
+        salary_warning=score.salary_warning,
+        no_requirements=score.no_requirements,
+    )
+
+
+def final_explanation(score: VacancyScore, weights: ScoringWeights | None = None) -> dict[str, Any]:
+    """``explanation["final"]`` values of a score row: stored ones, or re-derived with ``weights``."""
+
+    components = score_components(score)
+    if weights is not None:
+        raw, final, verdict = combine(weights, components)
+        return {"score": final, "raw_score": raw, "verdict": verdict, "weights_version": weights.version}
+
+    try:
+        raw = raw_score(get_weights(score.weights_version), components)
+    except KeyError:
+        # Версию убрали из файла — сырой score не восстановить, показываем сохранённый.
+        raw = score.final_score
+    return {
+        "score": score.final_score,
+        "raw_score": raw,
+        "verdict": score.verdict,
+        "weights_version": score.weights_version,
+    }
+
+
+def with_final(
+    explanation: dict[str, Any] | None, score: VacancyScore, weights: ScoringWeights | None = None
+) -> dict[str, Any]:
+    """Copy of ``explanation`` with ``final`` completed from the score row."""
+
+    explanation = dict(explanation or {})
+    explanation["final"] = {**explanation.get("final", {}), **final_explanation(score, weights)}
+    return explanation
+
+
+def final_score_sql(weights: ScoringWeights):
+    """``final_score`` of ``vacancy_scores`` rows recomputed with ``weights`` (SQL expression)."""
+
+    score = (
+        weights.semantic * VacancyScore.layer2_score
+        + weights.hard * VacancyScore.hard_coverage
+        + weights.nice * VacancyScore.nice_coverage
+    )
+    score = score * case((VacancyScore.overqualified, weights.overqualified_factor), else_=1.0)
+    score = score * case((VacancyScore.salary_warning, weights.salary_warning_factor), else_=1.0)
+    score = case((VacancyScore.no_requirements, func.least(score, weights.no_requirements_cap)), else_=score)
+    score = func.greatest(0.0, func.least(1.0, score))
+    return case((VacancyScore.eligible, score), else_=0.0)
+
+
+def verdict_sql(weights: ScoringWeights, final_score=None):
+    # Для eligible-пар final_score совпадает с raw score, для остальных вердикт всегда reject.
+    final_score = final_score_sql(weights) if final_score is None else final_score
+    return case(
+        (~VacancyScore.eligible, "reject"),
+        (final_score >= weights.strong_threshold, "strong"),
+        (final_score >= weights.ok_threshold, "ok"),
+        (final_score >= weights.weak_threshold, "weak"),
+        else_="reject",
+    )
+
+
+def rescore_batch(db: Session, weights: ScoringWeights, batch_size: int) -> list[int]:
+    """Re-derive final_score/verdict of up to ``batch_size`` rows scored with another version; caller commits.
+
+    Returns profile ids of the rewritten rows (empty when nothing is left).
+    """
+
+    stale_ids = select(VacancyScore.id).where(VacancyScore.weights_version != weights.version).limit(batch_size)
+    return list(
+        db.execute(
+            update(VacancyScore)
+            .where(VacancyScore.id.in_(stale_ids))
+            .values(
+                final_score=final_score_sql(weights),
+                verdict=verdict_sql(weights),
+                weights_version=weights.version,
+                # computed_at участвует в ETag рекомендаций.
+                computed_at=func.now(),
+            )
+            .returning(VacancyScore.profile_id)
+            .execution_options(synchronize_session=False)
+        ).scalars()
+    )
@@ -0,0 +1,123 @@
+"""Profile aggregate: the profile with all its sub-resources.
+
+``profile_full_statement`` loads everything with ``selectinload`` — one query
+for the profile plus one per sub-resource table, regardless of item counts.
+``apply_profile_changes`` applies a ``ProfileFullUpdate`` batch in the
+caller's transaction and marks the profile dirty at most once, so a batch
+triggers at most one (debounced) embedding rebuild.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session, selectinload
+
+from app.db.models import (
+    CoverLetterVersion,
+    Profile,
+    ProfileAchievement,
+    ProfileCertificate,
+    ProfileEducation,
+    ProfileExperience,
+    ProfileLanguage,
+    ProfileLink,
+    ProfileProject,
+    ProfileSkill,
+    ResumeVersion,
+)
+from app.schemas.profile_full import ProfileFullUpdate, SubResourceChanges
+from app.services.profile_refresh import mark_profile_dirty
+
+
+@dataclass(frozen=True)
+class _Section:
+    model: Any
+    not_found: str
+    # Совпадает с отдельными endpoint'ами: ссылки и сопроводительные письма не влияют на эмбеддинг профиля.
+    marks_dirty: bool = True
+
+
+SECTIONS: dict[str, _Section] = {
+    "experiences": _Section(ProfileExperience, "Experience not found"),
+    "projects": _Section(ProfileProject, "Project not found"),
+    "achievements": _Section(ProfileAchievement, "Achievement not found"),
+    "education": _Section(ProfileEducation, "Education not found"),
+    "certificates": _Section(ProfileCertificate, "Certificate not found"),
+    "skills": _Section(ProfileSkill, "Skill not found"),
+    "languages": _Section(ProfileLanguage, "Language not found"),
+    "links": _Section(ProfileLink, "Link not found", marks_dirty=False),
+    "resume_versions": _Section(ResumeVersion, "Resume version not found"),
+    "cover_letter_versions": _Section(CoverLetterVersion, "Cover letter version not found", marks_dirty=False),
+}
+
+
+class ProfileItemNotFound(LookupError):
+    def __init__(self, detail: str) -> None:
+        super().__init__(detail)
+        self.detail = detail
+
+
+def profile_full_statement(profile_id: int) -> Select[tuple[Profile]]:
+    return select(Profile).where(Profile.id == profile_id).options(
+        *(selectinload(getattr(Profile, name)) for name in SECTIONS)
+    )
+
+
+def load_profile_full(db: Session, profile_id: int) -> Profile | None:
+    return db.execute(profile_full_statement(profile_id)).scalar_one_or_none()
+
+
+def _apply_section(db: Session, profile_id: int, section: _Section, changes: SubResourceChanges) -> bool:
+    model = section.model
+    target_ids = {item.id for item in changes.update} | set(changes.delete)
+    items = {}
+    if target_ids:
+        items = {
+            item.id: item
+            for item in db.execute(
+                select(model).where(model.id.in_(target_ids), model.profile_id == profile_id)
+            ).scalars()
+        }
+        if len(items) != len(target_ids):
+            raise ProfileItemNotFound(section.not_found)
+
+    for change in changes.update:
+        for field, value in change.data.model_dump(exclude_unset=True).items():
+            setattr(items[change.id], field, value)
+    for item_id in changes.delete:
+        db.delete(items[item_id])
+    db.add_all([model(profile_id=profile_id, **payload.model_dump()) for payload in changes.create])
+
+    return bool(changes.create or changes.update or changes.delete)
+
+
+def apply_profile_changes(db: Session, profile_id: int, payload: ProfileFullUpdate) -> bool:
+    """Apply the batch without committing; returns whether the profile was marked dirty.
+
+    Raises ``ProfileItemNotFound`` if the profile or any updated/deleted item
+    doesn't exist or belongs to another profile; nothing is written then.
+    """
+
+    profile = db.get(Profile, profile_id)
+    if profile is None:
+        raise ProfileItemNotFound("Profile not found")
+
+    dirty = False
+    if payload.profile is not None:
+        profile_fields = payload.profile.model_dump(exclude_unset=True)
+        for field, value in profile_fields.items():
+            setattr(profile, field, value)
+        dirty = bool(profile_fields)
+
+    for name, section in SECTIONS.items():
+        changes = getattr(payload, name)
+        if changes is not None and _apply_section(db, profile_id, section, changes) and section.marks_dirty:
+            dirty = True
+
+    if dirty:
+        db.flush()
+        mark_profile_dirty(db, profile_id)
+    return dirty
@@ -0,0 +1,48 @@
+"""Debounced ("dirty") profile embedding rebuild.
+
+Every profile write bumps ``profiles.embedding_revision`` and, after the
+transaction commits, schedules a rebuild for that revision with a countdown of
+PROFILE_REFRESH_DEBOUNCE_S. A task whose revision was superseded by a later
+write skips itself, so a burst of edits produces a single rebuild.
+"""
+
+from __future__ import annotations
+
+import logging
+
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+
+from app.core.config import get_profile_refresh_settings
+from app.db.models import Profile
+
+logger = logging.getLogger(__name__)
+
+
+def _schedule_rebuild(profile_id: int, revision: int) -> None:
+    from app.tasks.embedding_tasks import rebuild_dirty_profile_embedding
+
+    try:
+        rebuild_dirty_profile_embedding.apply_async(
+            args=[profile_id, revision],
+            countdown=get_profile_refresh_settings().debounce_s,
+        )
+    except Exception:  # noqa: BLE001
+        logger.exception("Failed to schedule profile rebuild | profile_id=%s revision=%s", profile_id, revision)
+
+
+def mark_profile_dirty(db: Session, profile_id: int) -> int | None:
+    """Помечает профиль изменённым; пересборка эмбеддинга планируется после commit."""
+
+    revision = db.execute(
+        update(Profile)
+        .where(Profile.id == profile_id)
+        .values(embedding_revision=Profile.embedding_revision + 1)
+        .returning(Profile.embedding_revision),
+        execution_options={"synchronize_session": False},
+    ).scalar_one_or_none()
+    if revision is None:
+        return None
+
+    event.listen(db, "after_commit", lambda _session: _schedule_rebuild(profile_id, revision), once=True)
+    return revision
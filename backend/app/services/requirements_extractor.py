@@ -1,46 +1,26 @@
 import re
+from functools import lru_cache
 
 from app.services.matching.utils import tokenize
+from app.services.skills import get_skill_taxonomy
 from app.services.vacancy_parsing.line_classifier import classify_line
-from app.services.vacancy_parsing.requirement_markers import STARTS_LIKE_REQUIREMENT
-
-
-_SKILL_ALIASES: dict[str, tuple[str, ...]] = {
-    "Python": ("python",),
-    "FastAPI": ("fastapi",),
-    "Django": ("django",),
-    "Flask": ("flask",),
-    "PostgreSQL": ("postgresql", "postgres"),
-    "Redis": ("redis",),
-    "Kafka": ("kafka",),
-    "RabbitMQ": ("rabbitmq", "rabbit mq"),
-    "Celery": ("celery",),
-    "Docker": ("docker",),
-    "Docker Compose": ("docker compose", "docker-compose"),
-    "Kubernetes": ("kubernetes", "k8s"),
-    "React": ("react",),
-    "TypeScript": ("typescript", "type script"),
-    "Airflow": ("airflow",),
-    "Prometheus": ("prometheus",),
-    "Grafana": ("grafana",),
-    "gRPC": ("grpc", "g rpc"),
-    "REST": ("rest", "rest api"),
-    "WebSocket": ("websocket", "web socket"),
-    "Django REST Framework": ("drf", "django rest framework"),
-    "ООП": ("ооп", "oop", "object oriented programming", "object-oriented programming"),
-    "async": ("async", "asyncio", "асинхрон", "асинхронность", "асинхронное", "асинхронный"),
-    "pytest": ("pytest", "py test"),
-    "Git": ("git",),
-}
+from app.services.vacancy_parsing.marker_engine import MARKER_ENGINE, SubstringMatcher
+
+
+_NON_WORD_RE = re.compile(r"[^\w\s-]", flags=re.UNICODE)
 
 
 def _normalize_text(text: str) -> str:
     lowered = text.lower()
-    cleaned = re.sub(r"[^\w\s-]", " ", lowered, flags=re.UNICODE)
+    cleaned = _NON_WORD_RE.sub(" ", lowered)
     cleaned = cleaned.replace("-", " ")
     return " ".join(cleaned.split())
 
 
+def _normalized_tokens(text: str) -> list[str]:
+    return _normalize_text(text).split()
+
+
 def _normalize_skill_key(text: str) -> str:
     """Normalize skill key preserving technical symbols like +, #, . and -."""
     return " ".join(tokenize(text))
@@ -52,17 +32,27 @@ _HARD_SECTION_MARKERS = ("требования", "мы ожидаем", "ожи
 _NICE_SECTION_MARKERS = ("будет плюсом", "плюсом будет", "желательно")
 _STOP_SECTION_MARKERS = ("обязанности", "условия", "мы предлагаем", "о компании", "задачи")
 
+_HARD_SECTION_MATCHER = SubstringMatcher(_HARD_SECTION_MARKERS)
+_NICE_SECTION_MATCHER = SubstringMatcher(_NICE_SECTION_MARKERS)
+_STOP_SECTION_MATCHER = SubstringMatcher(_STOP_SECTION_MARKERS)
+_SENTENCE_SPLIT_RE = re.compile(r"[\n\.!?;]+")
+
 
 def _split_sentences(text: str) -> list[str]:
-    return [chunk.strip() for chunk in re.split(r"[\n\.!?;]+", text) if chunk.strip()]
+    return [chunk.strip() for chunk in _SENTENCE_SPLIT_RE.split(text) if chunk.strip()]
+
+
+@lru_cache(maxsize=32)
+def _normalized_marker_matcher(markers: tuple[str, ...]) -> SubstringMatcher:
+    return SubstringMatcher(_normalize_text(marker) for marker in markers)
 
 
 def _find_marker_context(text: str, markers: tuple[str, ...]) -> list[str]:
-    normalized_markers = tuple(_normalize_text(marker) for marker in markers)
+    matcher = _normalized_marker_matcher(markers)
     contexts: list[str] = []
     for sentence in _split_sentences(text.lower()):
         normalized_sentence = _normalize_text(sentence)
-        if any(marker in normalized_sentence for marker in normalized_markers):
+        if matcher.contains_any(normalized_sentence):
             contexts.append(normalized_sentence)
     return contexts
 
@@ -78,13 +68,13 @@ def _extract_section_blocks(clean_text: str) -> tuple[str, str]:
             continue
 
         normalized = _normalize_text(stripped)
-        if any(marker in normalized for marker in _HARD_SECTION_MARKERS):
+        if _HARD_SECTION_MATCHER.contains_any(normalized):
             current_section = "hard"
             continue
-        if any(marker in normalized for marker in _NICE_SECTION_MARKERS):
+        if _NICE_SECTION_MATCHER.contains_any(normalized):
             current_section = "nice"
             continue
-        if any(marker in normalized for marker in _STOP_SECTION_MARKERS):
+        if _STOP_SECTION_MATCHER.contains_any(normalized):
             current_section = None
             continue
 
@@ -105,45 +95,20 @@ def _extract_skills_from_text(text: str, *, is_hard: bool) -> list[dict]:
     if not line_tokens:
         return []
 
-    requirements: list[dict] = []
-    for raw_text, aliases in _SKILL_ALIASES.items():
-        matched = False
-        for alias in aliases:
-            alias_tokens = tokenize(alias)
-            if _contains_token_sequence(line_tokens, alias_tokens):
-                matched = True
-                break
-
-        if matched:
-            requirements.append(
-                {
-                    "kind": "skill",
-                    "raw_text": raw_text,
-                    "normalized_key": _normalize_skill_key(raw_text),
-                    "is_hard": is_hard,
-                    "weight": 3 if is_hard else 1,
-                }
-            )
-    return requirements
-
-
-def _contains_token_sequence(tokens: list[str], sequence: list[str]) -> bool:
-    if not tokens or not sequence:
-        return False
-
-    sequence_len = len(sequence)
-    if sequence_len > len(tokens):
-        return False
-
-    for idx in range(len(tokens) - sequence_len + 1):
-        if tokens[idx : idx + sequence_len] == sequence:
-            return True
-    return False
+    return [
+        {
+            "kind": "skill",
+            "raw_text": skill.name,
+            "normalized_key": _normalize_skill_key(skill.name),
+            "is_hard": is_hard,
+            "weight": 3 if is_hard else 1,
+        }
+        for skill in get_skill_taxonomy().find_skills(line_tokens, tokenizer=tokenize)
+    ]
 
 
 def _starts_like_requirement(line: str) -> bool:
-    normalized = _normalize_text(line)
-    return any(normalized.startswith(prefix) for prefix in STARTS_LIKE_REQUIREMENT)
+    return MARKER_ENGINE.starts_like_requirement(_normalize_text(line))
 
 
 def _extract_skills_from_lines(lines: list[str], *, is_hard: bool) -> list[dict]:
@@ -226,6 +191,32 @@ def extract_requirements_fallback(plain_text: str) -> list[dict]:
     return extract_skill_requirements(plain_text)
 
 
+def extract_text_skill_requirements(plain_text: str, section_requirements: list[dict]) -> list[dict]:
+    """Skill requirements that depend only on the description: sections first, plain-text fallback if < 3."""
+
+    requirements: dict[str, dict] = {}
+
+    def upsert(requirement: dict) -> None:
+        key = requirement["normalized_key"] or requirement["raw_text"]
+        existing = requirements.get(key)
+        if existing is None or (requirement["is_hard"] and not existing["is_hard"]):
+            requirements[key] = {
+                "raw_text": requirement["raw_text"],
+                "normalized_key": requirement["normalized_key"],
+                "is_hard": requirement["is_hard"],
+                "weight": requirement["weight"],
+            }
+
+    for requirement in section_requirements:
+        upsert(requirement)
+
+    if len(requirements) < 3:
+        for requirement in extract_requirements_fallback(plain_text):
+            upsert(requirement)
+
+    return list(requirements.values())
+
+
 def extract_requirements_from_description(clean_text: str) -> list[dict]:
     hard_block, nice_block = _extract_section_blocks(clean_text)
     extracted = [
@@ -247,23 +238,12 @@ def extract_skill_requirements(text: str) -> list[dict]:
     if not normalized_text:
         return []
 
-    padded_text = f" {normalized_text} "
     hard_contexts = _find_marker_context(text, _HARD_MARKERS)
     nice_contexts = _find_marker_context(text, _NICE_MARKERS)
     requirements: list[dict] = []
 
-    for raw_text, aliases in _SKILL_ALIASES.items():
-        matched = False
-        for alias in aliases:
-            normalized_alias = _normalize_text(alias)
-            if normalized_alias and f" {normalized_alias} " in padded_text:
-                matched = True
-                break
-
-        if not matched:
-            continue
-
-        normalized_skill = _normalize_skill_key(raw_text)
+    for skill in get_skill_taxonomy().find_skills(normalized_text.split(), tokenizer=_normalized_tokens):
+        normalized_skill = _normalize_skill_key(skill.name)
         in_hard_context = any(f" {normalized_skill} " in f" {context} " for context in hard_contexts)
         in_nice_context = any(f" {normalized_skill} " in f" {context} " for context in nice_contexts)
         is_hard = in_hard_context and not in_nice_context
@@ -271,7 +251,7 @@ def extract_skill_requirements(text: str) -> list[dict]:
         requirements.append(
             {
                 "kind": "skill",
-                "raw_text": raw_text,
+                "raw_text": skill.name,
                 "normalized_key": normalized_skill,
                 "is_hard": is_hard,
                 "weight": 3 if is_hard else 1,
@@ -0,0 +1,148 @@
+"""HTTP caching of per-profile matching responses.
+
+Strong ETags are computed from cheap validators (profile ``updated_at`` and
+``embedding_revision``, ``max(vacancy_scores.computed_at)``, row counts) plus
+the request parameters, so polling clients get 304 without re-running the
+joins. When ``RESPONSE_CACHE_REDIS_URL`` is set, rendered JSON bodies are also
+kept in Redis: one hash per profile (field = endpoint + parameters, value =
+ETag + body). Whoever commits scores drops the profile hashes once per batch
+(``invalidate_profiles``, or ``invalidate_profiles_async`` on the event loop);
+a stored body is served only if its ETag equals the current one.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Iterable
+
+import redis
+import redis.asyncio as aioredis
+from fastapi import Response, status
+from pydantic import BaseModel
+
+from app.core.config import get_response_cache_settings
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "resp:profile:"
+
+
+def make_etag(*parts: Any) -> str:
+    raw = json.dumps(parts, default=str, separators=(",", ":"))
+    return '"' + hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match сравнивается слабо: W/"x" совпадает с "x".
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in if_none_match.split(","))
+
+
+def _headers(etag: str) -> dict[str, str]:
+    # no-cache: клиент может хранить ответ, но обязан ревалидировать его по ETag.
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=_headers(etag))
+
+
+def json_response(body: bytes, etag: str) -> Response:
+    return Response(content=body, media_type="application/json", headers=_headers(etag))
+
+
+def _profile_key(profile_id: int) -> str:
+    return f"{_KEY_PREFIX}{profile_id}"
+
+
+@lru_cache(maxsize=1)
+def _async_client() -> aioredis.Redis | None:
+    settings = get_response_cache_settings()
+    return aioredis.from_url(settings.redis_url) if settings.enabled else None
+
+
+@lru_cache(maxsize=1)
+def _sync_client() -> redis.Redis | None:
+    settings = get_response_cache_settings()
+    return redis.from_url(settings.redis_url) if settings.enabled else None
+
+
+async def get_cached(profile_id: int, field: str, etag: str) -> bytes | None:
+    client = _async_client()
+    if client is None:
+        return None
+    try:
+        raw = await client.hget(_profile_key(profile_id), field)
+    except redis.RedisError:
+        logger.warning("Response cache read failed | profile_id=%s field=%s", profile_id, field, exc_info=True)
+        return None
+    if raw is None:
+        return None
+    cached_etag, _, body = raw.partition(b"\n")
+    return body if cached_etag.decode() == etag else None
+
+
+async def put_cached(profile_id: int, field: str, etag: str, body: bytes) -> None:
+    client = _async_client()
+    if client is None:
+        return
+    key = _profile_key(profile_id)
+    try:
+        async with client.pipeline(transaction=False) as pipe:
+            pipe.hset(key, field, etag.encode() + b"\n" + body)
+            pipe.expire(key, get_response_cache_settings().ttl_s)
+            await pipe.execute()
+    except redis.RedisError:
+        logger.warning("Response cache write failed | profile_id=%s field=%s", profile_id, field, exc_info=True)
+
+
+def invalidate_profiles(profile_ids: Iterable[int]) -> None:
+    """Drop cached responses of the profiles; a no-op when the cache is disabled."""
+
+    client = _sync_client()
+    keys = [_profile_key(profile_id) for profile_id in set(profile_ids)]
+    if client is None or not keys:
+        return
+    try:
+        client.delete(*keys)
+    except redis.RedisError:
+        # Не критично: устаревшее тело не отдаётся, пока ETag не совпадёт.
+        logger.warning("Response cache invalidation failed | profiles=%s", len(keys), exc_info=True)
+
+
+async def invalidate_profiles_async(profile_ids: Iterable[int]) -> None:
+    """``invalidate_profiles`` for the event loop."""
+
+    client = _async_client()
+    keys = [_profile_key(profile_id) for profile_id in set(profile_ids)]
+    if client is None or not keys:
+        return
+    try:
+        await client.delete(*keys)
+    except redis.RedisError:
+        logger.warning("Response cache invalidation failed | profiles=%s", len(keys), exc_info=True)
+
+
+async def cached_json_response(
+    profile_id: int,
+    field: str,
+    etag: str,
+    if_none_match: str | None,
+    render: Callable[[], Awaitable[BaseModel]],
+) -> Response:
+    """304 if the client has ``etag``, else the cached body, else ``render()`` (and cache it)."""
+
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    body = await get_cached(profile_id, field, etag)
+    if body is None:
+        body = (await render()).model_dump_json().encode("utf-8")
+        await put_cached(profile_id, field, etag, body)
+    return json_response(body, etag)
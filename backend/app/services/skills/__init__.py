@@ -0,0 +1,5 @@
+"""Skill taxonomy shared by requirement extraction and matching."""
+
+from .taxonomy import Skill, SkillTaxonomy, get_skill_taxonomy, load_skill_taxonomy, reload_skill_taxonomy
+
+__all__ = ["Skill", "SkillTaxonomy", "get_skill_taxonomy", "load_skill_taxonomy", "reload_skill_taxonomy"]
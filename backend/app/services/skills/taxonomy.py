@@ -0,0 +1,185 @@
+"""Data-file driven skill taxonomy compiled into token tries.
+
+The taxonomy lives in ``skill_taxonomy.json`` (or ``SKILL_TAXONOMY_PATH``):
+``{"version": 1, "skills": [{"name": "PostgreSQL", "aliases": ["postgres"]}, ...],
+"equivalences": [["node", "node.js", "nodejs"], ...]}``.
+Skill aliases are extraction triggers: they are tokenized and inserted into a
+trie, so all skills in a line are found in one pass over its tokens.
+Equivalences are matching-only: spellings treated as the same term when a
+requirement is compared with a resume, never extracted on their own (bare
+``node``/``js`` would fire on "Kubernetes node pools" or "Node.js"). The file is re-read when
+its mtime changes (checked at most every ``SKILL_TAXONOMY_RELOAD_INTERVAL_S``
+seconds), so workers pick up edits without a restart.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+Tokenizer = Callable[[str], list[str]]
+
+DEFAULT_TAXONOMY_PATH = Path(__file__).with_name("skill_taxonomy.json")
+
+_END = None
+
+
+@dataclass(frozen=True, slots=True)
+class Skill:
+    name: str
+    aliases: tuple[str, ...]
+
+
+class TokenTrie:
+    """Trie over token sequences; values are skill indices."""
+
+    def __init__(self, entries: Iterable[tuple[Sequence[str], int]]) -> None:
+        self._root: dict = {}
+        for tokens, value in entries:
+            if not tokens:
+                continue
+            node = self._root
+            for token in tokens:
+                node = node.setdefault(token, {})
+            node.setdefault(_END, set()).add(value)
+
+    def find_all(self, tokens: Sequence[str]) -> set[int]:
+        """Values of every entry that occurs as a contiguous token subsequence."""
+        found: set[int] = set()
+        root = self._root
+        token_count = len(tokens)
+        for start in range(token_count):
+            node = root.get(tokens[start])
+            position = start + 1
+            while node is not None:
+                values = node.get(_END)
+                if values:
+                    found.update(values)
+                if position >= token_count:
+                    break
+                node = node.get(tokens[position])
+                position += 1
+        return found
+
+
+class SkillTaxonomy:
+    def __init__(
+        self,
+        skills: Sequence[Skill],
+        *,
+        equivalences: Sequence[Sequence[str]] = (),
+        version: int = 1,
+    ) -> None:
+        self.skills = tuple(skills)
+        self.equivalences = tuple(tuple(group) for group in equivalences)
+        self.version = version
+        self._tries: dict[Tokenizer, TokenTrie] = {}
+        self._alias_maps: dict[Tokenizer, dict[str, set[str]]] = {}
+
+    def _trie(self, tokenizer: Tokenizer) -> TokenTrie:
+        trie = self._tries.get(tokenizer)
+        if trie is None:
+            trie = TokenTrie(
+                (tokenizer(alias), index) for index, skill in enumerate(self.skills) for alias in skill.aliases
+            )
+            self._tries[tokenizer] = trie
+        return trie
+
+    def find_skills(self, tokens: Sequence[str], *, tokenizer: Tokenizer) -> list[Skill]:
+        """Skills whose alias occurs in ``tokens`` (produced by ``tokenizer``), in taxonomy order."""
+        if not tokens:
+            return []
+        return [self.skills[index] for index in sorted(self._trie(tokenizer).find_all(tokens))]
+
+    def alias_map(self, tokenizer: Tokenizer) -> dict[str, set[str]]:
+        """Normalized spelling -> every normalized spelling of its equivalence group."""
+        alias_map = self._alias_maps.get(tokenizer)
+        if alias_map is None:
+            alias_map = {}
+            for equivalence in self.equivalences:
+                group = {" ".join(tokenizer(alias)) for alias in equivalence}
+                group.discard("")
+                for alias in group:
+                    alias_map[alias] = group
+            self._alias_maps[tokenizer] = alias_map
+        return alias_map
+
+
+def load_skill_taxonomy(path: str | Path) -> SkillTaxonomy:
+    with open(path, encoding="utf-8") as fh:
+        payload = json.load(fh)
+
+    if not isinstance(payload, dict) or not isinstance(payload.get("skills"), list):
+        raise ValueError(f"Skill taxonomy {path} must be an object with a 'skills' list")
+
+    skills: list[Skill] = []
+    for entry in payload["skills"]:
+        name = (entry.get("name") or "").strip() if isinstance(entry, dict) else ""
+        if not name:
+            raise ValueError(f"Skill taxonomy {path} contains an entry without a name: {entry!r}")
+        aliases = tuple(dict.fromkeys(alias.strip() for alias in entry.get("aliases") or [name] if alias.strip()))
+        skills.append(Skill(name=name, aliases=aliases))
+
+    equivalences = payload.get("equivalences") or []
+    if not isinstance(equivalences, list) or not all(
+        isinstance(group, list) and all(isinstance(alias, str) for alias in group) for group in equivalences
+    ):
+        raise ValueError(f"Skill taxonomy {path}: 'equivalences' must be a list of string lists")
+
+    return SkillTaxonomy(skills, equivalences=equivalences, version=int(payload.get("version", 1)))
+
+
+def _taxonomy_path() -> Path:
+    return Path(os.getenv("SKILL_TAXONOMY_PATH") or DEFAULT_TAXONOMY_PATH)
+
+
+def _reload_interval_s() -> float:
+    return float(os.getenv("SKILL_TAXONOMY_RELOAD_INTERVAL_S") or "10")
+
+
+_lock = threading.Lock()
+_taxonomy: SkillTaxonomy | None = None
+_loaded_key: tuple[Path, float] | None = None
+_checked_at = 0.0
+
+
+def get_skill_taxonomy() -> SkillTaxonomy:
+    """Current taxonomy; reloaded when the data file changes."""
+    global _taxonomy, _loaded_key, _checked_at
+
+    taxonomy = _taxonomy
+    if taxonomy is not None and time.monotonic() - _checked_at < _reload_interval_s():
+        return taxonomy
+
+    with _lock:
+        path = _taxonomy_path()
+        try:
+            key = (path, path.stat().st_mtime)
+            if _taxonomy is None or key != _loaded_key:
+                _taxonomy = load_skill_taxonomy(path)
+                _loaded_key = key
+                logger.info("Skill taxonomy loaded | path=%s skills=%s", path, len(_taxonomy.skills))
+        except (OSError, ValueError):
+            if _taxonomy is None:
+                raise
+            logger.exception("Failed to reload skill taxonomy, keeping previous version | path=%s", path)
+        _checked_at = time.monotonic()
+        return _taxonomy
+
+
+def reload_skill_taxonomy() -> SkillTaxonomy:
+    """Force re-reading the taxonomy file on the next access."""
+    global _checked_at, _loaded_key
+
+    with _lock:
+        _checked_at = 0.0
+        _loaded_key = None
+    return get_skill_taxonomy()
@@ -0,0 +1,102 @@
+"""Batched upsert of vacancies from the API (manual and other non-HH sources).
+
+One chunk = one transaction: vacancies are upserted on (source, external_id)
+with a single statement, requirements of ``manual`` vacancies are extracted
+for the whole chunk and replaced with one DELETE + one INSERT. Embeddings are
+scheduled by the caller once for all chunks.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import delete, func, literal_column
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.db.models import Vacancy, VacancyRequirement
+from app.services.requirements_extractor import extract_skill_requirements
+
+CHUNK_SIZE = 500
+
+_VACANCY_FIELDS = (
+    "title",
+    "company_name",
+    "location",
+    "salary_from",
+    "salary_to",
+    "currency",
+    "description",
+    "url",
+    "status",
+)
+
+
+@dataclass(slots=True)
+class BulkUpsertResult:
+    vacancy_ids: list[int] = field(default_factory=list)
+    created: int = 0
+    updated: int = 0
+
+
+def upsert_vacancies(db: Session, payloads: list[dict[str, Any]]) -> BulkUpsertResult:
+    """Upsert a chunk of ``VacancyCreate`` payloads; caller commits.
+
+    Duplicate (source, external_id) inside the chunk: the last payload wins.
+    """
+
+    result = BulkUpsertResult()
+    by_key = {(payload["source"], payload["external_id"]): payload for payload in payloads}
+    if not by_key:
+        return result
+
+    # Фиксированный порядок ключей: параллельные загрузки не дедлокаются на одних и тех же строках.
+    stmt = insert(Vacancy).values([by_key[key] for key in sorted(by_key)])
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_vacancies_source_external_id",
+        set_={**{name: stmt.excluded[name] for name in _VACANCY_FIELDS}, "updated_at": func.now()},
+    )
+    rows = db.execute(
+        stmt.returning(
+            Vacancy.id,
+            Vacancy.source,
+            Vacancy.description,
+            # xmax = 0 только у строк, вставленных этим оператором.
+            literal_column("xmax = 0").label("inserted"),
+        )
+    ).all()
+
+    manual_rows = [row for row in rows if row.source == "manual"]
+    _replace_manual_requirements(db, {row.id: row.description for row in manual_rows})
+
+    result.vacancy_ids = [int(row.id) for row in rows]
+    result.created = sum(1 for row in rows if row.inserted)
+    result.updated = len(rows) - result.created
+    return result
+
+
+def _replace_manual_requirements(db: Session, description_by_vacancy: dict[int, str | None]) -> None:
+    if not description_by_vacancy:
+        return
+
+    db.execute(
+        delete(VacancyRequirement).where(
+            VacancyRequirement.vacancy_id.in_(list(description_by_vacancy)),
+            VacancyRequirement.kind.in_(("skill", "constraint")),
+        )
+    )
+    rows = [
+        {
+            "vacancy_id": vacancy_id,
+            "kind": requirement["kind"],
+            "raw_text": requirement["raw_text"],
+            "normalized_key": requirement["normalized_key"],
+            "is_hard": requirement["is_hard"],
+            "weight": requirement["weight"],
+        }
+        for vacancy_id, description in description_by_vacancy.items()
+        for requirement in extract_skill_requirements(description or "")
+    ]
+    if rows:
+        db.execute(insert(VacancyRequirement), rows)
@@ -0,0 +1,355 @@
+"""Near-duplicate vacancy detection with MinHash + LSH.
+
+Each vacancy (title + parsed plain text) gets a 64-value MinHash signature
+over word 3-shingles, stored in ``vacancy_signatures`` together with 16 LSH
+band hashes (4 rows per band; GIN-indexed ``bigint[]``). Candidates are the
+vacancies sharing at least one band; they are near-duplicates when the
+estimated Jaccard similarity is at least ``VACANCY_DEDUP_THRESHOLD``.
+
+Near-duplicates share ``cluster_id`` — the smallest vacancy id in the
+cluster, which is the cluster representative. Incremental assignment merges
+clusters; a vacancy whose text changed leaves its cluster and is matched
+again, and a deleted or changed representative hands its cluster over to the
+smallest remaining member. ``recluster_all`` rebuilds clusters from scratch
+(splits clusters whose remaining members stopped matching).
+
+Only representatives are scored, so a vacancy that becomes a member of
+another cluster loses its ``vacancy_scores`` rows (``drop_member_scores``):
+nothing would refresh them and a stale member score could outrank its
+representative in recommendations.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+import zlib
+from collections.abc import Iterable
+from datetime import datetime, timezone
+
+import numpy as np
+from sqlalchemy import delete, exists, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.core.config import get_vacancy_dedup_settings
+from app.db.models import Vacancy, VacancyScore, VacancySignature
+
+logger = logging.getLogger(__name__)
+
+SIGNATURE_VERSION = "minhash64_b16r4_v1"
+NUM_PERMUTATIONS = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+SHINGLE_SIZE = 3
+
+_PRIME = np.uint64(4294967291)  # наибольшее простое < 2**32: (a*x + b) не переполняет uint64
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _permutation_params() -> tuple[np.ndarray, np.ndarray]:
+    # Параметры выводятся из sha256, а не из генератора numpy: подписи не должны зависеть от версии numpy.
+    values = [
+        int.from_bytes(hashlib.sha256(f"minhash:{index}".encode()).digest()[:8], "big") for index in range(NUM_PERMUTATIONS * 2)
+    ]
+    a = np.array([1 + value % (int(_PRIME) - 1) for value in values[:NUM_PERMUTATIONS]], dtype=np.uint64)
+    b = np.array([value % int(_PRIME) for value in values[NUM_PERMUTATIONS:]], dtype=np.uint64)
+    return a, b
+
+
+_PERM_A, _PERM_B = _permutation_params()
+
+
+def signature_text(title: str | None, plain_text: str | None) -> str:
+    return "\n".join(part for part in (title, plain_text) if part)
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _shingle_hashes(text: str) -> np.ndarray:
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < SHINGLE_SIZE:
+        shingles = {" ".join(words)} if words else {""}
+    else:
+        shingles = {" ".join(words[index : index + SHINGLE_SIZE]) for index in range(len(words) - SHINGLE_SIZE + 1)}
+    return np.fromiter((zlib.crc32(shingle.encode("utf-8")) for shingle in shingles), dtype=np.uint64)
+
+
+def minhash_signature(text: str) -> list[int]:
+    hashes = _shingle_hashes(text)
+    # (shingles, permutations) -> минимум по шинглам для каждой перестановки.
+    permuted = (hashes[:, None] * _PERM_A[None, :] + _PERM_B[None, :]) % _PRIME
+    return [int(value) for value in permuted.min(axis=0)]
+
+
+def lsh_bands(signature: list[int]) -> list[int]:
+    bands: list[int] = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS_PER_BAND : (band + 1) * ROWS_PER_BAND]
+        payload = band.to_bytes(2, "big") + b"".join(value.to_bytes(4, "big") for value in rows)
+        bands.append(int.from_bytes(hashlib.blake2b(payload, digest_size=8).digest(), "big", signed=True))
+    return bands
+
+
+def estimated_jaccard(left: list[int], right: list[int]) -> float:
+    if len(left) != len(right) or not left:
+        return 0.0
+    return float(np.count_nonzero(np.asarray(left) == np.asarray(right))) / len(left)
+
+
+def reelect_representatives(db: Session, former_ids: Iterable[int]) -> list[int]:
+    """Give clusters represented by ``former_ids`` a new representative — the smallest remaining member.
+
+    Called when a representative is deleted or its text changed; caller commits.
+    Returns ids of the new representatives.
+    """
+
+    former = sorted(set(former_ids))
+    if not former:
+        return []
+    remaining = (
+        select(VacancySignature.cluster_id, func.min(VacancySignature.vacancy_id).label("representative_id"))
+        .where(VacancySignature.cluster_id.in_(former), VacancySignature.vacancy_id.not_in(former))
+        .group_by(VacancySignature.cluster_id)
+        .subquery()
+    )
+    return sorted(
+        set(
+            db.execute(
+                update(VacancySignature)
+                .where(
+                    VacancySignature.cluster_id == remaining.c.cluster_id,
+                    VacancySignature.vacancy_id.not_in(former),
+                )
+                .values(cluster_id=remaining.c.representative_id)
+                .returning(VacancySignature.cluster_id)
+                .execution_options(synchronize_session=False)
+            ).scalars()
+        )
+    )
+
+
+def drop_member_scores(
+    db: Session, *, vacancy_ids: Iterable[int] | None = None, profile_id: int | None = None
+) -> int:
+    """Delete scores of vacancies that belong to another vacancy's cluster; caller commits.
+
+    Members whose representative no longer exists keep their scores — they are
+    scored as standalone vacancies. Returns the number of deleted rows.
+    """
+
+    members = select(VacancySignature.vacancy_id).where(
+        VacancySignature.cluster_id != VacancySignature.vacancy_id,
+        exists().where(Vacancy.id == VacancySignature.cluster_id),
+    )
+    if vacancy_ids is not None:
+        ids = sorted(set(vacancy_ids))
+        if not ids:
+            return 0
+        members = members.where(VacancySignature.vacancy_id.in_(ids))
+    stmt = delete(VacancyScore).where(VacancyScore.vacancy_id.in_(members))
+    if profile_id is not None:
+        stmt = stmt.where(VacancyScore.profile_id == profile_id)
+    return db.execute(stmt.execution_options(synchronize_session=False)).rowcount
+
+
+def _merge_clusters(db: Session, parent: dict[int, int]) -> None:
+    others_by_target: dict[int, list[int]] = {}
+    for cluster_id, target in parent.items():
+        if cluster_id != target:
+            others_by_target.setdefault(target, []).append(cluster_id)
+    for target, others in others_by_target.items():
+        db.execute(
+            update(VacancySignature)
+            .where(VacancySignature.cluster_id.in_(others))
+            .values(cluster_id=target)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def assign_clusters(db: Session, items: Iterable[tuple[int, str]]) -> dict[int, int]:
+    """Compute signatures of ``(vacancy_id, text)`` pairs and merge them into clusters; caller commits.
+
+    A vacancy whose text changed leaves its old cluster (a representative
+    hands the cluster over to the smallest remaining member) and is matched
+    again. Returns vacancy_id -> cluster_id for the vacancies with new signatures.
+    """
+
+    settings = get_vacancy_dedup_settings()
+    if not settings.enabled:
+        return {}
+
+    texts = dict(items)
+    if not texts:
+        return {}
+
+    stored = {
+        row.vacancy_id: row
+        for row in db.execute(
+            select(
+                VacancySignature.vacancy_id,
+                VacancySignature.cluster_id,
+                VacancySignature.text_hash,
+                VacancySignature.version,
+            ).where(VacancySignature.vacancy_id.in_(list(texts)))
+        )
+    }
+
+    now_utc = datetime.now(timezone.utc)
+    rows: list[dict] = []
+    for vacancy_id, text in texts.items():
+        digest = text_hash(text)
+        previous = stored.get(vacancy_id)
+        if previous is not None and previous.text_hash == digest and previous.version == SIGNATURE_VERSION:
+            continue
+        signature = minhash_signature(text)
+        rows.append(
+            {
+                "vacancy_id": vacancy_id,
+                "minhash": signature,
+                "lsh_bands": lsh_bands(signature),
+                "cluster_id": vacancy_id,
+                "text_hash": digest,
+                "version": SIGNATURE_VERSION,
+                "computed_at": now_utc,
+            }
+        )
+    if not rows:
+        return {}
+
+    stmt = insert(VacancySignature).values(rows)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[VacancySignature.vacancy_id],
+            set_={
+                "minhash": stmt.excluded.minhash,
+                "lsh_bands": stmt.excluded.lsh_bands,
+                # Новый текст — заново ищем дубликаты: старый кластер мог перестать совпадать.
+                "cluster_id": stmt.excluded.cluster_id,
+                "text_hash": stmt.excluded.text_hash,
+                "version": stmt.excluded.version,
+                "computed_at": stmt.excluded.computed_at,
+            },
+        )
+    )
+    reelect_representatives(
+        db,
+        [
+            row["vacancy_id"]
+            for row in rows
+            if (previous := stored.get(row["vacancy_id"])) is not None and previous.cluster_id == row["vacancy_id"]
+        ],
+    )
+
+    # Кандидаты всей пачки одним запросом; совпадение по бакету проверяется уже в Python.
+    all_bands = sorted({band for row in rows for band in row["lsh_bands"]})
+    candidates_by_band: dict[int, list] = {}
+    for candidate in db.execute(
+        select(
+            VacancySignature.vacancy_id,
+            VacancySignature.minhash,
+            VacancySignature.lsh_bands,
+            VacancySignature.cluster_id,
+        ).where(VacancySignature.lsh_bands.overlap(all_bands), VacancySignature.version == SIGNATURE_VERSION)
+    ):
+        for band in candidate.lsh_bands:
+            candidates_by_band.setdefault(band, []).append(candidate)
+
+    parent: dict[int, int] = {}
+
+    def find(cluster_id: int) -> int:
+        parent.setdefault(cluster_id, cluster_id)
+        while parent[cluster_id] != cluster_id:
+            parent[cluster_id] = parent[parent[cluster_id]]
+            cluster_id = parent[cluster_id]
+        return cluster_id
+
+    for row in rows:
+        vacancy_id = row["vacancy_id"]
+        seen: set[int] = set()
+        for band in row["lsh_bands"]:
+            for candidate in candidates_by_band.get(band, ()):
+                if candidate.vacancy_id == vacancy_id or candidate.vacancy_id in seen:
+                    continue
+                seen.add(candidate.vacancy_id)
+                if estimated_jaccard(row["minhash"], candidate.minhash) >= settings.threshold:
+                    root_own, root_other = find(vacancy_id), find(candidate.cluster_id)
+                    if root_own != root_other:
+                        parent[max(root_own, root_other)] = min(root_own, root_other)
+
+    resolved = {cluster_id: find(cluster_id) for cluster_id in list(parent)}
+    _merge_clusters(db, resolved)
+    # Влитые кластеры теряют представителя: его score больше никто не пересчитает.
+    drop_member_scores(db, vacancy_ids=[cluster_id for cluster_id, root in resolved.items() if cluster_id != root])
+    return {row["vacancy_id"]: resolved.get(row["vacancy_id"], row["vacancy_id"]) for row in rows}
+
+
+def recluster_all(db: Session) -> dict[str, int]:
+    """Rebuild every cluster from stored signatures with union-find; caller commits."""
+
+    threshold = get_vacancy_dedup_settings().threshold
+    rows = db.execute(
+        select(VacancySignature.vacancy_id, VacancySignature.minhash, VacancySignature.lsh_bands).where(
+            VacancySignature.version == SIGNATURE_VERSION
+        )
+    ).all()
+
+    parent = {row.vacancy_id: row.vacancy_id for row in rows}
+
+    def find(vacancy_id: int) -> int:
+        while parent[vacancy_id] != vacancy_id:
+            parent[vacancy_id] = parent[parent[vacancy_id]]
+            vacancy_id = parent[vacancy_id]
+        return vacancy_id
+
+    signatures = {row.vacancy_id: row.minhash for row in rows}
+    buckets: dict[int, list[int]] = {}
+    for row in rows:
+        for band_hash in row.lsh_bands:
+            buckets.setdefault(band_hash, []).append(row.vacancy_id)
+
+    checked: set[tuple[int, int]] = set()
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        for index, left in enumerate(members):
+            for right in members[index + 1 :]:
+                pair = (left, right) if left < right else (right, left)
+                if pair in checked:
+                    continue
+                checked.add(pair)
+                if estimated_jaccard(signatures[left], signatures[right]) >= threshold:
+                    root_left, root_right = find(left), find(right)
+                    if root_left != root_right:
+                        parent[max(root_left, root_right)] = min(root_left, root_right)
+
+    # Корень union-find — минимальный id в компоненте, т.е. представитель кластера.
+    cluster_by_vacancy = {vacancy_id: find(vacancy_id) for vacancy_id in parent}
+    if cluster_by_vacancy:
+        db.execute(
+            update(VacancySignature),
+            [
+                {"vacancy_id": vacancy_id, "cluster_id": cluster_id}
+                for vacancy_id, cluster_id in cluster_by_vacancy.items()
+            ],
+        )
+
+    dropped_scores = drop_member_scores(db)
+
+    duplicates = sum(1 for vacancy_id, cluster_id in cluster_by_vacancy.items() if vacancy_id != cluster_id)
+    logger.info(
+        "Vacancy clusters rebuilt: signatures=%s duplicates=%s dropped_scores=%s",
+        len(cluster_by_vacancy),
+        duplicates,
+        dropped_scores,
+    )
+    return {
+        "signatures": len(cluster_by_vacancy),
+        "clusters": len(set(cluster_by_vacancy.values())),
+        "duplicates": duplicates,
+        "pairs_checked": len(checked),
+        "dropped_scores": dropped_scores,
+    }
@@ -0,0 +1,154 @@
+"""Precomputed "similar vacancies" lists.
+
+``vacancy_neighbors`` keeps the top-N nearest vacancies (cosine similarity of
+``vacancy_embeddings_v2`` vectors of the same model) per vacancy; near-duplicates
+of the vacancy itself (same ``vacancy_signatures.cluster_id``) are skipped.
+
+When embeddings change, ``refresh_neighbors`` recomputes the lists of the
+changed vacancies, the lists that contained them, and the lists the changed
+vacancies now enter (similarity is symmetric: X enters Y's list iff Y is among
+X's candidates and beats Y's current last neighbor). Vacancies without a list
+are served by ``live_neighbors`` — a direct ANN query.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.db.models import VacancyEmbedding, VacancyNeighbor, VacancySignature
+
+NEIGHBORS_TOP_N = 20
+
+
+def _own_cluster(db: Session, vacancy_id: int) -> int | None:
+    return db.execute(
+        select(VacancySignature.cluster_id).where(VacancySignature.vacancy_id == vacancy_id)
+    ).scalar_one_or_none()
+
+
+def live_neighbors(db: Session, vacancy_id: int, limit: int = NEIGHBORS_TOP_N) -> tuple[str | None, list[tuple[int, float]]]:
+    """(model name, [(neighbor_id, similarity)]) by an ANN query; (None, []) if the vacancy has no embedding."""
+
+    source = db.execute(
+        select(VacancyEmbedding.embedding, VacancyEmbedding.model_name).where(VacancyEmbedding.vacancy_id == vacancy_id)
+    ).one_or_none()
+    if source is None:
+        return None, []
+
+    # Вектор передаётся константой, чтобы ORDER BY ... <=> шёл по ANN-индексу.
+    distance = VacancyEmbedding.embedding.cosine_distance(source.embedding)
+    stmt = (
+        select(VacancyEmbedding.vacancy_id, (1 - distance).label("similarity"))
+        .where(VacancyEmbedding.model_name == source.model_name, VacancyEmbedding.vacancy_id != vacancy_id)
+        .order_by(distance)
+        .limit(limit)
+    )
+    cluster_id = _own_cluster(db, vacancy_id)
+    if cluster_id is not None:
+        # Дубликаты несут точный вектор представителя (distance 0) — отсекаем их до LIMIT,
+        # иначе большой кластер целиком занимает топ.
+        stmt = stmt.outerjoin(VacancySignature, VacancySignature.vacancy_id == VacancyEmbedding.vacancy_id).where(
+            VacancySignature.cluster_id.is_distinct_from(cluster_id)
+        )
+    return source.model_name, [(int(row.vacancy_id), float(row.similarity)) for row in db.execute(stmt)]
+
+
+def _write_list(db: Session, vacancy_id: int, model_name: str | None, neighbors: list[tuple[int, float]], now_utc: datetime) -> None:
+    db.execute(delete(VacancyNeighbor).where(VacancyNeighbor.vacancy_id == vacancy_id))
+    if model_name is None or not neighbors:
+        return
+    db.execute(
+        insert(VacancyNeighbor),
+        [
+            {
+                "vacancy_id": vacancy_id,
+                "neighbor_id": neighbor_id,
+                "rank": rank,
+                "similarity": similarity,
+                "model_name": model_name,
+                "computed_at": now_utc,
+            }
+            for rank, (neighbor_id, similarity) in enumerate(neighbors, start=1)
+        ],
+    )
+
+
+def refresh_neighbors(db: Session, vacancy_ids: list[int], top_n: int = NEIGHBORS_TOP_N) -> dict[str, int]:
+    """Incrementally refresh neighbor lists after embeddings of ``vacancy_ids`` changed; caller commits."""
+
+    changed = sorted(set(vacancy_ids))
+    if not changed:
+        return {"changed": 0, "refreshed": 0}
+
+    now_utc = datetime.now(timezone.utc)
+    refreshed: set[int] = set()
+    entering: dict[int, float] = {}
+    for vacancy_id in changed:
+        model_name, neighbors = live_neighbors(db, vacancy_id, top_n)
+        _write_list(db, vacancy_id, model_name, neighbors, now_utc)
+        refreshed.add(vacancy_id)
+        for neighbor_id, similarity in neighbors:
+            entering[neighbor_id] = max(similarity, entering.get(neighbor_id, -1.0))
+
+    # Списки, где изменившиеся вакансии уже стоят: их позиция (или место в топе) могла измениться.
+    containing = set(
+        db.execute(
+            select(VacancyNeighbor.vacancy_id).where(
+                VacancyNeighbor.neighbor_id.in_(changed), VacancyNeighbor.vacancy_id.not_in(refreshed)
+            )
+        ).scalars()
+    )
+
+    # Списки, в которые изменившиеся вакансии теперь входят: сходство лучше последнего соседа или список неполон.
+    candidate_ids = sorted(set(entering) - refreshed - containing)
+    if candidate_ids:
+        tails = {
+            row.vacancy_id: (row.count, row.min_similarity)
+            for row in db.execute(
+                select(
+                    VacancyNeighbor.vacancy_id,
+                    func.count().label("count"),
+                    func.min(VacancyNeighbor.similarity).label("min_similarity"),
+                )
+                .where(VacancyNeighbor.vacancy_id.in_(candidate_ids))
+                .group_by(VacancyNeighbor.vacancy_id)
+            )
+        }
+        for candidate_id in candidate_ids:
+            count, min_similarity = tails.get(candidate_id, (0, None))
+            # Вакансии без списка не трогаем: их обслужит live-запрос и полный пересчёт.
+            if count and (count < top_n or entering[candidate_id] > min_similarity):
+                containing.add(candidate_id)
+
+    for vacancy_id in sorted(containing):
+        model_name, neighbors = live_neighbors(db, vacancy_id, top_n)
+        _write_list(db, vacancy_id, model_name, neighbors, now_utc)
+        refreshed.add(vacancy_id)
+
+    return {"changed": len(changed), "refreshed": len(refreshed)}
+
+
+def rebuild_neighbors(db: Session, vacancy_ids: list[int], top_n: int = NEIGHBORS_TOP_N) -> int:
+    """Recompute the lists of ``vacancy_ids`` only (full rebuild in batches); caller commits."""
+
+    now_utc = datetime.now(timezone.utc)
+    for vacancy_id in vacancy_ids:
+        model_name, neighbors = live_neighbors(db, vacancy_id, top_n)
+        _write_list(db, vacancy_id, model_name, neighbors, now_utc)
+    return len(vacancy_ids)
+
+
+def stored_neighbors(db: Session, vacancy_id: int, limit: int) -> list[tuple[int, float]]:
+    return [
+        (int(row.neighbor_id), float(row.similarity))
+        for row in db.execute(
+            select(VacancyNeighbor.neighbor_id, VacancyNeighbor.similarity)
+            .where(VacancyNeighbor.vacancy_id == vacancy_id)
+            .order_by(VacancyNeighbor.rank.asc())
+            .limit(limit)
+        )
+    ]
@@ -0,0 +1,287 @@
+"""Benchmark of the parsing hot paths against their reference implementations.
+
+Runs HTML-to-text conversion, header detection, line classification,
+marker-context search and section-block extraction on a sample of stored
+vacancy descriptions, once with the reference implementations (HTMLParser,
+linear marker scans) and once with the optimized ones, checks that every
+output is identical and reports the speedup.
+
+Example:
+    python -m app.services.vacancy_parsing.benchmark --sample 500 --repeat 3
+    python -m app.services.vacancy_parsing.benchmark --sample 200 --min-length 5000
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+
+from sqlalchemy import func, select
+
+from app.db.models import Vacancy
+from app.db.session import ReadSessionLocal
+from app.services import requirements_extractor
+from app.services.vacancy_parsing import hh_parser
+from app.services.vacancy_parsing.line_classifier import classify_line, is_section_header, normalize_line
+from app.services.vacancy_parsing.requirement_markers import (
+    EXCEPTIONS,
+    LINE_MARKERS,
+    SECTION_HEADERS,
+    STARTS_LIKE_REQUIREMENT,
+)
+from app.utils.text_clean import strip_html, strip_html_reference
+
+
+# Reference implementations: linear scans over the marker lists.
+
+
+def _reference_is_section_header(line: str) -> str | None:
+    normalized = normalize_line(line).rstrip(":")
+    if not normalized:
+        return None
+    for section, markers in SECTION_HEADERS.items():
+        for marker in markers:
+            if normalized == normalize_line(marker).rstrip(":"):
+                return section
+    return None
+
+
+def _reference_header_section_from_prefix(prefix: str) -> str | None:
+    section = _reference_is_section_header(prefix)
+    if section:
+        return section
+
+    normalized_prefix = hh_parser._normalize_line(prefix).lower().rstrip(":-–—")
+    if not normalized_prefix:
+        return None
+    for candidate_section, markers in SECTION_HEADERS.items():
+        for marker in markers:
+            if hh_parser._normalize_line(marker).lower().rstrip(":-–—") == normalized_prefix:
+                return candidate_section
+    return None
+
+
+def _reference_classify_line(line: str, current_section: str | None) -> str:
+    normalized = normalize_line(line)
+    if not normalized:
+        return "other"
+    nice_markers = LINE_MARKERS["nice"]
+    must_markers = LINE_MARKERS["must"]
+    if current_section == "nice_to_have":
+        return "nice"
+    if current_section == "requirements":
+        return "nice" if any(marker in normalized for marker in nice_markers) else "must"
+    if any(marker in normalized for marker in nice_markers):
+        return "nice"
+    if any(marker in normalized for marker in must_markers):
+        only_patterns = EXCEPTIONS.get("only_format_patterns", [])
+        if "только" in normalized and any(re.search(pattern, normalized) for pattern in only_patterns):
+            return "other"
+        return "must"
+    if any(normalized.startswith(prefix) for prefix in STARTS_LIKE_REQUIREMENT):
+        return "must"
+    return "other"
+
+
+def _reference_find_marker_context(text: str, markers: tuple[str, ...]) -> list[str]:
+    normalized_markers = tuple(requirements_extractor._normalize_text(marker) for marker in markers)
+    contexts: list[str] = []
+    for sentence in requirements_extractor._split_sentences(text.lower()):
+        normalized_sentence = requirements_extractor._normalize_text(sentence)
+        if any(marker in normalized_sentence for marker in normalized_markers):
+            contexts.append(normalized_sentence)
+    return contexts
+
+
+def _reference_extract_section_blocks(clean_text: str) -> tuple[str, str]:
+    hard_lines: list[str] = []
+    nice_lines: list[str] = []
+    current_section: str | None = None
+    for raw_line in clean_text.splitlines():
+        stripped = raw_line.strip()
+        if not stripped:
+            continue
+        normalized = requirements_extractor._normalize_text(stripped)
+        if any(marker in normalized for marker in requirements_extractor._HARD_SECTION_MARKERS):
+            current_section = "hard"
+            continue
+        if any(marker in normalized for marker in requirements_extractor._NICE_SECTION_MARKERS):
+            current_section = "nice"
+            continue
+        if any(marker in normalized for marker in requirements_extractor._STOP_SECTION_MARKERS):
+            current_section = None
+            continue
+        content = stripped.lstrip("-•*0123456789.) ").strip()
+        if not content or current_section is None:
+            continue
+        if current_section == "hard":
+            hard_lines.append(content)
+        else:
+            nice_lines.append(content)
+    return "\n".join(hard_lines), "\n".join(nice_lines)
+
+
+@dataclass(slots=True)
+class StageResult:
+    stage: str
+    calls: int
+    reference_seconds: float
+    optimized_seconds: float
+    speedup: float
+    identical: bool
+
+
+def _lines_with_prefixes(plain_texts: list[str]) -> tuple[list[str], list[str]]:
+    lines: list[str] = []
+    prefixes: list[str] = []
+    for plain_text in plain_texts:
+        for raw_line in plain_text.splitlines():
+            line = hh_parser._normalize_line(hh_parser._strip_bullet_prefix(raw_line))
+            if not line:
+                continue
+            lines.append(line)
+            separator_match = hh_parser._HEADER_SEPARATOR_RE.search(line)
+            if separator_match:
+                prefixes.append(line[: separator_match.start()])
+    return lines, prefixes
+
+
+def _measure(fn: Callable[[], list], repeat: int) -> tuple[float, list]:
+    best = float("inf")
+    result: list = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def run_benchmark(descriptions: list[str], *, repeat: int = 3) -> list[StageResult]:
+    plain_texts = [strip_html(description) for description in descriptions]
+    lines, prefixes = _lines_with_prefixes(plain_texts)
+    sections = (None, "requirements", "nice_to_have", "other")
+    hard = requirements_extractor._HARD_MARKERS
+    nice = requirements_extractor._NICE_MARKERS
+
+    stages: list[tuple[str, int, Callable[[], list], Callable[[], list]]] = [
+        (
+            "strip_html",
+            len(descriptions),
+            lambda: [strip_html_reference(description) for description in descriptions],
+            lambda: [strip_html(description) for description in descriptions],
+        ),
+        (
+            "is_section_header",
+            len(lines),
+            lambda: [_reference_is_section_header(line) for line in lines],
+            lambda: [is_section_header(line) for line in lines],
+        ),
+        (
+            "_header_section_from_prefix",
+            len(prefixes),
+            lambda: [_reference_header_section_from_prefix(prefix) for prefix in prefixes],
+            lambda: [hh_parser._header_section_from_prefix(prefix) for prefix in prefixes],
+        ),
+        (
+            "classify_line",
+            len(lines) * len(sections),
+            lambda: [_reference_classify_line(line, section) for section in sections for line in lines],
+            lambda: [classify_line(line, section) for section in sections for line in lines],
+        ),
+        (
+            "_find_marker_context",
+            len(plain_texts) * 2,
+            lambda: [_reference_find_marker_context(text, markers) for markers in (hard, nice) for text in plain_texts],
+            lambda: [
+                requirements_extractor._find_marker_context(text, markers)
+                for markers in (hard, nice)
+                for text in plain_texts
+            ],
+        ),
+        (
+            "_extract_section_blocks",
+            len(plain_texts),
+            lambda: [_reference_extract_section_blocks(text) for text in plain_texts],
+            lambda: [requirements_extractor._extract_section_blocks(text) for text in plain_texts],
+        ),
+    ]
+
+    results: list[StageResult] = []
+    for stage, calls, reference_fn, optimized_fn in stages:
+        reference_seconds, reference_output = _measure(reference_fn, repeat)
+        optimized_seconds, optimized_output = _measure(optimized_fn, repeat)
+        results.append(
+            StageResult(
+                stage=stage,
+                calls=calls,
+                reference_seconds=round(reference_seconds, 6),
+                optimized_seconds=round(optimized_seconds, 6),
+                speedup=round(reference_seconds / optimized_seconds, 2) if optimized_seconds > 0 else 0.0,
+                identical=reference_output == optimized_output,
+            )
+        )
+
+    parse_seconds, _ = _measure(lambda: [hh_parser.parse_hh_description(d) for d in descriptions], repeat)
+    results.append(
+        StageResult(
+            stage="parse_hh_description",
+            calls=len(descriptions),
+            reference_seconds=0.0,
+            optimized_seconds=round(parse_seconds, 6),
+            speedup=0.0,
+            identical=all(result.identical for result in results),
+        )
+    )
+    return results
+
+
+def load_sample_descriptions(sample_size: int, *, min_length: int = 0) -> list[str]:
+    db = ReadSessionLocal()
+    try:
+        return list(
+            db.execute(
+                select(Vacancy.description)
+                .where(Vacancy.description.is_not(None), func.length(Vacancy.description) >= min_length)
+                .order_by(func.random())
+                .limit(sample_size)
+            )
+            .scalars()
+            .all()
+        )
+    finally:
+        db.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sample", type=int, default=500, help="number of vacancies to parse")
+    parser.add_argument("--min-length", type=int, default=0, help="only descriptions at least this long")
+    parser.add_argument("--repeat", type=int, default=3, help="best-of-N timing")
+    parser.add_argument("--json", dest="json_path", default=None, help="write results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    descriptions = load_sample_descriptions(args.sample, min_length=args.min_length)
+    if not descriptions:
+        parser.error("no vacancies found to benchmark on")
+
+    results = run_benchmark(descriptions, repeat=args.repeat)
+    for result in results:
+        print(
+            f"{result.stage}: calls={result.calls} reference={result.reference_seconds}s "
+            f"optimized={result.optimized_seconds}s speedup=x{result.speedup} identical={result.identical}"
+        )
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as fh:
+            json.dump([asdict(result) for result in results], fh, ensure_ascii=False, indent=2)
+
+    if not all(result.identical for result in results):
+        raise SystemExit("optimized parsing output differs from the reference implementation")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,436 @@
+"""Golden-corpus benchmark of the parsing and matching CPU hot paths.
+
+Runs ``strip_html``, ``parse_hh_description``, ``classify_line``,
+``extract_requirements_from_sections``, ``tokenize`` and
+``find_evidence_snippet`` over a checked-in corpus of anonymized HH
+descriptions and reports, per function, throughput and p50/p99 latency of a
+single call. Results are compared with a JSON baseline (regressions are
+flagged when throughput drops or p99 grows by more than ``--tolerance``), and
+output digests of every document are compared with the recorded golden
+outputs, so an optimization that changes results is caught before it lands.
+
+Corpus: ``golden/corpus.jsonl.gz`` (one ``{"id": ..., "description": ...}``
+per line); when it is absent the small synthetic ``golden/seed_corpus.jsonl``
+is used. A corpus is exported from the database with anonymization (emails,
+phones, links, handles and the employer name are replaced).
+
+Example:
+    python -m app.services.vacancy_parsing.golden_benchmark export --sample 3000
+    python -m app.services.vacancy_parsing.golden_benchmark run --repeat 5
+    python -m app.services.vacancy_parsing.golden_benchmark run --update-baseline --update-golden
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import json
+import platform
+import re
+import sys
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from app.services.matching.utils import find_evidence_snippet, tokenize
+from app.services.requirements_extractor import extract_requirements_from_sections
+from app.services.vacancy_parsing.hh_parser import parse_hh_description
+from app.services.vacancy_parsing.line_classifier import classify_line
+from app.utils.text_clean import strip_html
+
+GOLDEN_DIR = Path(__file__).with_name("golden")
+DEFAULT_CORPUS_PATH = GOLDEN_DIR / "corpus.jsonl.gz"
+SEED_CORPUS_PATH = GOLDEN_DIR / "seed_corpus.jsonl"
+DEFAULT_BASELINE_PATH = GOLDEN_DIR / "baseline.json"
+DEFAULT_GOLDEN_PATH = GOLDEN_DIR / "golden_outputs.json"
+
+# Навыки, которых заведомо нет в большинстве текстов: find_evidence_snippet проходит и ветку алиасов.
+_ABSENT_NEEDLES = ("kubernetes", "c++", "node.js")
+
+
+@dataclass(frozen=True, slots=True)
+class CorpusDocument:
+    id: str
+    description: str
+    plain_text: str
+    sections: dict[str, Any]
+    requirements: list[dict[str, Any]]
+
+
+@dataclass(frozen=True, slots=True)
+class BenchFunction:
+    name: str
+    fn: Callable[..., Any]
+    calls: Callable[[CorpusDocument], list[tuple[Any, ...]]]
+
+
+@dataclass(slots=True)
+class FunctionResult:
+    function: str
+    calls: int
+    seconds: float
+    calls_per_sec: float
+    p50_us: float
+    p99_us: float
+    identical: bool | None = None
+    mismatched_documents: list[str] = field(default_factory=list)
+    regressions: list[str] = field(default_factory=list)
+
+
+def _classify_line_calls(document: CorpusDocument) -> list[tuple[Any, ...]]:
+    return [
+        (line, section_name)
+        for section_name, section in document.sections.items()
+        for line in (section.get("lines") or [])
+    ]
+
+
+def _evidence_calls(document: CorpusDocument) -> list[tuple[Any, ...]]:
+    needles = [requirement["normalized_key"] or requirement["raw_text"] for requirement in document.requirements]
+    return [(document.plain_text, needle) for needle in (*needles, *_ABSENT_NEEDLES)]
+
+
+BENCH_FUNCTIONS: tuple[BenchFunction, ...] = (
+    BenchFunction("strip_html", strip_html, lambda document: [(document.description,)]),
+    BenchFunction("parse_hh_description", parse_hh_description, lambda document: [(document.description,)]),
+    BenchFunction("classify_line", classify_line, _classify_line_calls),
+    BenchFunction(
+        "extract_requirements_from_sections",
+        extract_requirements_from_sections,
+        lambda document: [(document.sections,)],
+    ),
+    BenchFunction("tokenize", tokenize, lambda document: [(document.plain_text,)]),
+    BenchFunction("find_evidence_snippet", find_evidence_snippet, _evidence_calls),
+)
+
+
+def _open_text(path: Path):
+    return gzip.open(path, "rt", encoding="utf-8") if path.suffix == ".gz" else open(path, encoding="utf-8")
+
+
+def _iter_corpus(path: Path) -> Iterator[dict[str, str]]:
+    with _open_text(path) as fh:
+        for line in fh:
+            if line.strip():
+                yield json.loads(line)
+
+
+def resolve_corpus_path(path: str | None) -> Path:
+    if path:
+        return Path(path)
+    return DEFAULT_CORPUS_PATH if DEFAULT_CORPUS_PATH.exists() else SEED_CORPUS_PATH
+
+
+def corpus_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    for record in _iter_corpus(path):
+        digest.update(record["id"].encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(record["description"].encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def load_corpus(path: Path) -> list[CorpusDocument]:
+    documents: list[CorpusDocument] = []
+    for record in _iter_corpus(path):
+        parsed = parse_hh_description(record["description"])
+        documents.append(
+            CorpusDocument(
+                id=str(record["id"]),
+                description=record["description"],
+                plain_text=parsed["plain_text"],
+                sections=parsed["sections"],
+                requirements=extract_requirements_from_sections(parsed["sections"]),
+            )
+        )
+    return documents
+
+
+def _output_digest(outputs: list[Any]) -> str:
+    payload = json.dumps(outputs, ensure_ascii=False, sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_function(
+    bench: BenchFunction, documents: list[CorpusDocument], *, repeat: int
+) -> tuple[FunctionResult, dict[str, str]]:
+    """Time every call of ``bench`` (best of ``repeat`` passes) and digest its outputs per document."""
+
+    calls_by_document = [(document.id, bench.calls(document)) for document in documents]
+    fn = bench.fn
+    perf_counter_ns = time.perf_counter_ns
+
+    best_latencies: list[int] = []
+    best_total = None
+    digests: dict[str, str] = {}
+    for attempt in range(max(1, repeat)):
+        latencies: list[int] = []
+        for document_id, calls in calls_by_document:
+            outputs = []
+            for args in calls:
+                started = perf_counter_ns()
+                output = fn(*args)
+                latencies.append(perf_counter_ns() - started)
+                outputs.append(output)
+            if attempt == 0:
+                digests[document_id] = _output_digest(outputs)
+        total = sum(latencies)
+        if best_total is None or total < best_total:
+            best_total, best_latencies = total, latencies
+
+    best_latencies.sort()
+    seconds = (best_total or 0) / 1e9
+    return (
+        FunctionResult(
+            function=bench.name,
+            calls=len(best_latencies),
+            seconds=round(seconds, 6),
+            calls_per_sec=round(len(best_latencies) / seconds, 1) if seconds > 0 else 0.0,
+            p50_us=round(_percentile(best_latencies, 0.50) / 1e3, 2),
+            p99_us=round(_percentile(best_latencies, 0.99) / 1e3, 2),
+        ),
+        digests,
+    )
+
+
+def check_golden(result: FunctionResult, digests: dict[str, str], golden: dict[str, Any] | None) -> None:
+    expected = ((golden or {}).get("functions") or {}).get(result.function)
+    if expected is None:
+        return
+    result.mismatched_documents = sorted(
+        document_id for document_id, digest in digests.items() if expected.get(document_id) != digest
+    )
+    result.identical = not result.mismatched_documents and set(expected) == set(digests)
+
+
+def check_baseline(result: FunctionResult, baseline: dict[str, Any] | None, *, tolerance: float) -> None:
+    expected = ((baseline or {}).get("functions") or {}).get(result.function)
+    if not expected:
+        return
+    if expected.get("calls_per_sec") and result.calls_per_sec < expected["calls_per_sec"] * (1 - tolerance):
+        result.regressions.append(f"calls_per_sec {result.calls_per_sec} < baseline {expected['calls_per_sec']}")
+    if expected.get("p99_us") and result.p99_us > expected["p99_us"] * (1 + tolerance):
+        result.regressions.append(f"p99_us {result.p99_us} > baseline {expected['p99_us']}")
+
+
+def run_suite(
+    documents: list[CorpusDocument],
+    *,
+    repeat: int = 3,
+    functions: set[str] | None = None,
+    baseline: dict[str, Any] | None = None,
+    golden: dict[str, Any] | None = None,
+    tolerance: float = 0.1,
+) -> tuple[list[FunctionResult], dict[str, dict[str, str]]]:
+    results: list[FunctionResult] = []
+    digests_by_function: dict[str, dict[str, str]] = {}
+    for bench in BENCH_FUNCTIONS:
+        if functions and bench.name not in functions:
+            continue
+        result, digests = run_function(bench, documents, repeat=repeat)
+        check_golden(result, digests, golden)
+        check_baseline(result, baseline, tolerance=tolerance)
+        results.append(result)
+        digests_by_function[bench.name] = digests
+    return results, digests_by_function
+
+
+def _read_json(path: Path) -> dict[str, Any] | None:
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def _write_json(path: Path, payload: dict[str, Any]) -> None:
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(payload, fh, ensure_ascii=False, indent=2, sort_keys=True)
+        fh.write("\n")
+
+
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_URL_RE = re.compile(r"(?:https?://|www\.)[^\s<>\"']*[^\s<>\"'.,;:!?)]", re.IGNORECASE)
+_PHONE_RE = re.compile(r"(?:\+7|\b8)[\s(-]*\d{3}[\s)-]*\d{3}[\s-]*\d{2}[\s-]*\d{2}\b")
+_HANDLE_RE = re.compile(r"(?<![\w@])@[A-Za-z][\w]{3,}")
+
+
+def anonymize_description(description: str, company_name: str | None = None) -> str:
+    text = _EMAIL_RE.sub("user@example.com", description)
+    text = _URL_RE.sub("https://example.com", text)
+    text = _PHONE_RE.sub("+7 000 000-00-00", text)
+    text = _HANDLE_RE.sub("@user", text)
+    if company_name and len(company_name.strip()) >= 3:
+        text = re.sub(re.escape(company_name.strip()), "Компания", text, flags=re.IGNORECASE)
+    return text
+
+
+def export_corpus(out_path: Path, *, sample_size: int, min_length: int = 0) -> int:
+    """Write a random anonymized sample of stored HH descriptions as gzipped JSONL."""
+
+    from sqlalchemy import func, select
+
+    from app.db.models import Vacancy
+    from app.db.session import ReadSessionLocal
+
+    db = ReadSessionLocal()
+    try:
+        rows = db.execute(
+            select(Vacancy.description, Vacancy.company_name)
+            .where(
+                Vacancy.source == "hh",
+                Vacancy.description.is_not(None),
+                func.length(Vacancy.description) >= min_length,
+            )
+            .order_by(func.random())
+            .limit(sample_size)
+        ).all()
+    finally:
+        db.close()
+
+    seen: set[str] = set()
+    written = 0
+    with gzip.open(out_path, "wt", encoding="utf-8") as fh:
+        for description, company_name in rows:
+            anonymized = anonymize_description(description, company_name)
+            digest = hashlib.sha256(anonymized.encode("utf-8")).hexdigest()
+            if digest in seen:
+                continue
+            seen.add(digest)
+            written += 1
+            # id не связан с вакансией в БД: корпус не должен позволять найти исходное объявление.
+            fh.write(json.dumps({"id": f"doc-{written:05d}", "description": anonymized}, ensure_ascii=False) + "\n")
+    return written
+
+
+def _print_results(results: list[FunctionResult]) -> None:
+    for result in results:
+        status = {True: "identical", False: "DIFFERENT", None: "no golden"}[result.identical]
+        print(
+            f"{result.function}: calls={result.calls} {result.calls_per_sec}/s "
+            f"p50={result.p50_us}us p99={result.p99_us}us {status}"
+        )
+        if result.mismatched_documents:
+            print(f"  mismatched documents ({len(result.mismatched_documents)}): {result.mismatched_documents[:10]}")
+        for regression in result.regressions:
+            print(f"  REGRESSION: {regression}")
+
+
+def _run(args: argparse.Namespace) -> int:
+    corpus_path = resolve_corpus_path(args.corpus)
+    baseline_path = Path(args.baseline)
+    golden_path = Path(args.golden)
+    digest = corpus_digest(corpus_path)
+    documents = load_corpus(corpus_path)
+    if not documents:
+        print(f"corpus {corpus_path} is empty", file=sys.stderr)
+        return 2
+
+    golden = _read_json(golden_path)
+    if golden is not None and golden.get("corpus_sha256") != digest and not args.update_golden:
+        print(f"golden outputs in {golden_path} were recorded for another corpus; use --update-golden", file=sys.stderr)
+        return 2
+    baseline = _read_json(baseline_path)
+    if baseline is not None and baseline.get("corpus_sha256") != digest:
+        print(f"baseline {baseline_path} was recorded for another corpus, regressions are not checked")
+        baseline = None
+
+    functions = set(args.functions.split(",")) if args.functions else None
+    results, digests = run_suite(
+        documents,
+        repeat=args.repeat,
+        functions=functions,
+        baseline=None if args.update_baseline else baseline,
+        golden=None if args.update_golden else golden,
+        tolerance=args.tolerance,
+    )
+    print(f"corpus: {corpus_path} documents={len(documents)}")
+    _print_results(results)
+
+    meta = {
+        "corpus": corpus_path.name,
+        "corpus_sha256": digest,
+        "documents": len(documents),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+    }
+    if args.update_golden:
+        previous = (golden or {}).get("functions") if golden and golden.get("corpus_sha256") == digest else {}
+        _write_json(golden_path, {**meta, "functions": {**(previous or {}), **digests}})
+        print(f"golden outputs written to {golden_path}")
+    if args.update_baseline:
+        previous = (baseline or {}).get("functions") or {}
+        _write_json(
+            baseline_path,
+            {
+                **meta,
+                "functions": {
+                    **previous,
+                    **{
+                        result.function: {
+                            "calls": result.calls,
+                            "calls_per_sec": result.calls_per_sec,
+                            "p50_us": result.p50_us,
+                            "p99_us": result.p99_us,
+                        }
+                        for result in results
+                    },
+                },
+            },
+        )
+        print(f"baseline written to {baseline_path}")
+
+    if args.json_path:
+        _write_json(Path(args.json_path), {**meta, "results": [asdict(result) for result in results]})
+
+    if any(result.identical is False for result in results):
+        print("outputs differ from the golden corpus", file=sys.stderr)
+        return 1
+    if args.fail_on_regression and any(result.regressions for result in results):
+        print("performance regressions against the baseline", file=sys.stderr)
+        return 1
+    return 0
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="benchmark the corpus and check golden outputs")
+    run_parser.add_argument("--corpus", default=None, help="JSONL(.gz) corpus; default golden/corpus.jsonl.gz or the seed")
+    run_parser.add_argument("--baseline", default=str(DEFAULT_BASELINE_PATH))
+    run_parser.add_argument("--golden", default=str(DEFAULT_GOLDEN_PATH))
+    run_parser.add_argument("--repeat", type=int, default=3, help="best-of-N passes")
+    run_parser.add_argument("--tolerance", type=float, default=0.1, help="allowed relative slowdown")
+    run_parser.add_argument("--functions", default=None, help="comma-separated subset of functions")
+    run_parser.add_argument("--update-baseline", action="store_true")
+    run_parser.add_argument("--update-golden", action="store_true")
+    run_parser.add_argument("--fail-on-regression", action="store_true", help="exit 1 on performance regressions")
+    run_parser.add_argument("--json", dest="json_path", default=None, help="write results as JSON to this path")
+
+    export_parser = subparsers.add_parser("export", help="export an anonymized corpus from the database")
+    export_parser.add_argument("--sample", type=int, default=3000)
+    export_parser.add_argument("--min-length", type=int, default=0)
+    export_parser.add_argument("--out", default=str(DEFAULT_CORPUS_PATH))
+
+    args = parser.parse_args(argv)
+    if args.command == "export":
+        written = export_corpus(Path(args.out), sample_size=args.sample, min_length=args.min_length)
+        print(f"exported {written} anonymized descriptions to {args.out}")
+        return
+
+    raise SystemExit(_run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,7 +5,7 @@ import re
 from app.utils.text_clean import strip_html
 
 from .line_classifier import is_section_header
-from .requirement_markers import SECTION_HEADERS
+from .marker_engine import MARKER_ENGINE
 
 VERSION = "hh_sections_v2"
 
@@ -14,6 +14,7 @@ _BULLET_PREFIX_RE = re.compile(
     flags=re.IGNORECASE,
 )
 _WHITESPACE_RE = re.compile(r"\s+")
+_HEADER_SEPARATOR_RE = re.compile(r"\s*[:\-–—]\s*")
 
 
 def _normalize_line(value: str) -> str:
@@ -31,20 +32,7 @@ def _strip_bullet_prefix(value: str) -> str:
 
 
 def _header_section_from_prefix(prefix: str) -> str | None:
-    section = is_section_header(prefix)
-    if section:
-        return section
-
-    normalized_prefix = _normalize_line(prefix).lower().rstrip(":-–—")
-    if not normalized_prefix:
-        return None
-
-    for candidate_section, markers in SECTION_HEADERS.items():
-        for marker in markers:
-            marker_value = _normalize_line(marker).lower().rstrip(":-–—")
-            if marker_value == normalized_prefix:
-                return candidate_section
-    return None
+    return MARKER_ENGINE.section_for_header(prefix) or MARKER_ENGINE.section_for_header_prefix(prefix)
 
 
 def _detect_header(line: str) -> tuple[str | None, str]:
@@ -56,7 +44,7 @@ def _detect_header(line: str) -> tuple[str | None, str]:
     if direct_section:
         return direct_section, ""
 
-    separator_match = re.search(r"\s*[:\-–—]\s*", cleaned_line)
+    separator_match = _HEADER_SEPARATOR_RE.search(cleaned_line)
     if not separator_match:
         return None, ""
 
@@ -2,40 +2,21 @@
 
 from __future__ import annotations
 
-import re
 from typing import Literal
 
-from .requirement_markers import EXCEPTIONS, LINE_MARKERS, SECTION_HEADERS, STARTS_LIKE_REQUIREMENT
+from .marker_engine import MARKER_ENGINE, normalize_marker_text
 
 LineClass = Literal["must", "nice", "other"]
 
 
 def normalize_line(s: str) -> str:
     """Normalize line text for marker matching."""
-    return " ".join(s.lower().strip().split())
+    return normalize_marker_text(s)
 
 
 def is_section_header(line: str) -> str | None:
     """Return section key for header-like line, otherwise None."""
-    normalized = normalize_line(line).rstrip(":")
-    if not normalized:
-        return None
-
-    for section, markers in SECTION_HEADERS.items():
-        for marker in markers:
-            marker_norm = normalize_line(marker).rstrip(":")
-            if normalized == marker_norm:
-                return section
-
-    return None
-
-
-def _contains_any(line: str, markers: list[str]) -> bool:
-    return any(marker in line for marker in markers)
-
-
-def _matches_any_pattern(line: str, patterns: list[str]) -> bool:
-    return any(re.search(pattern, line) for pattern in patterns)
+    return MARKER_ENGINE.section_for_header(line)
 
 
 def classify_line(line: str, current_section: str | None) -> LineClass:
@@ -44,27 +25,23 @@ def classify_line(line: str, current_section: str | None) -> LineClass:
     if not normalized:
         return "other"
 
-    nice_markers = LINE_MARKERS["nice"]
-    must_markers = LINE_MARKERS["must"]
-
     if current_section == "nice_to_have":
         return "nice"
 
     if current_section == "requirements":
-        if _contains_any(normalized, nice_markers):
+        if MARKER_ENGINE.nice.contains_any(normalized):
             return "nice"
         return "must"
 
-    if _contains_any(normalized, nice_markers):
+    if MARKER_ENGINE.nice.contains_any(normalized):
         return "nice"
 
-    if _contains_any(normalized, must_markers):
-        only_patterns = EXCEPTIONS.get("only_format_patterns", [])
-        if "только" in normalized and _matches_any_pattern(normalized, only_patterns):
+    if MARKER_ENGINE.must.contains_any(normalized):
+        if "только" in normalized and MARKER_ENGINE.matches_exception("only_format_patterns", normalized):
             return "other"
         return "must"
 
-    if any(normalized.startswith(prefix) for prefix in STARTS_LIKE_REQUIREMENT):
+    if MARKER_ENGINE.starts_like_requirement(normalized):
         return "must"
 
     return "other"
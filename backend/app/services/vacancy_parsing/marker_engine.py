@@ -0,0 +1,109 @@
+"""Compiled lexical marker engine, built once at import.
+
+Section headers are resolved through exact-match dicts, substring markers
+through a single trie-shaped regex per marker set, and exception patterns
+are precompiled. All lookups return the same results as scanning the marker
+lists from ``requirement_markers`` one by one.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Mapping
+
+from .requirement_markers import EXCEPTIONS, LINE_MARKERS, SECTION_HEADERS, STARTS_LIKE_REQUIREMENT
+
+_HEADER_SUFFIX_CHARS = ":"
+_HEADER_PREFIX_SUFFIX_CHARS = ":-–—"
+
+
+def normalize_marker_text(value: str) -> str:
+    """Lowercase and collapse whitespace (same rules as line normalization)."""
+    return " ".join(value.lower().strip().split())
+
+
+def _trie_pattern(markers: Iterable[str]) -> str:
+    trie: dict = {}
+    for marker in markers:
+        node = trie
+        for char in marker:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        optional = "" in node
+        if len(branches) == 1 and not optional:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        return group + "?" if optional else group
+
+    return build(trie)
+
+
+class SubstringMatcher:
+    """``any(marker in text for marker in markers)`` as one compiled automaton."""
+
+    __slots__ = ("markers", "_pattern")
+
+    def __init__(self, markers: Iterable[str]) -> None:
+        self.markers = tuple(dict.fromkeys(marker for marker in markers if marker))
+        self._pattern = re.compile(_trie_pattern(self.markers)) if self.markers else None
+
+    def contains_any(self, text: str) -> bool:
+        return self._pattern is not None and self._pattern.search(text) is not None
+
+
+def _build_header_index(headers: Mapping[str, Iterable[str]], strip_chars: str) -> dict[str, str]:
+    index: dict[str, str] = {}
+    for section, markers in headers.items():
+        for marker in markers:
+            # Первый раздел в порядке SECTION_HEADERS выигрывает, как и при линейном обходе.
+            index.setdefault(normalize_marker_text(marker).rstrip(strip_chars), section)
+    index.pop("", None)
+    return index
+
+
+class MarkerEngine:
+    def __init__(
+        self,
+        *,
+        section_headers: Mapping[str, Iterable[str]],
+        line_markers: Mapping[str, Iterable[str]],
+        starts_like_requirement: Iterable[str],
+        exceptions: Mapping[str, Iterable[str]],
+    ) -> None:
+        self._headers = _build_header_index(section_headers, _HEADER_SUFFIX_CHARS)
+        self._header_prefixes = _build_header_index(section_headers, _HEADER_PREFIX_SUFFIX_CHARS)
+        self.nice = SubstringMatcher(line_markers.get("nice", ()))
+        self.must = SubstringMatcher(line_markers.get("must", ()))
+        self._requirement_prefixes = tuple(starts_like_requirement)
+        self._exceptions = {
+            name: tuple(re.compile(pattern) for pattern in patterns) for name, patterns in exceptions.items()
+        }
+
+    def section_for_header(self, line: str) -> str | None:
+        """Section key for a whole header line (trailing ':' ignored)."""
+        normalized = normalize_marker_text(line).rstrip(_HEADER_SUFFIX_CHARS)
+        return self._headers.get(normalized) if normalized else None
+
+    def section_for_header_prefix(self, prefix: str) -> str | None:
+        """Section key for the text before a header separator (trailing ':-–—' ignored)."""
+        normalized = normalize_marker_text(prefix).rstrip(_HEADER_PREFIX_SUFFIX_CHARS)
+        return self._header_prefixes.get(normalized) if normalized else None
+
+    def starts_like_requirement(self, normalized: str) -> bool:
+        return normalized.startswith(self._requirement_prefixes)
+
+    def matches_exception(self, name: str, text: str) -> bool:
+        return any(pattern.search(text) for pattern in self._exceptions.get(name, ()))
+
+
+MARKER_ENGINE = MarkerEngine(
+    section_headers=SECTION_HEADERS,
+    line_markers=LINE_MARKERS,
+    starts_like_requirement=STARTS_LIKE_REQUIREMENT,
+    exceptions=EXCEPTIONS,
+)
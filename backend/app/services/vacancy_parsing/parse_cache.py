@@ -0,0 +1,185 @@
+"""Parse/extract results shared by identical descriptions.
+
+Reposted vacancies and multi-city clones carry the same description under
+different external ids. Everything that depends only on the description —
+plain text, sections, quality score, section requirements and the text skill
+list (sections + plain-text fallback) — is stored in ``vacancy_parse_cache``
+keyed by (sha256 of the description, ``PARSE_VERSION``). Requirements are
+reused only while their ``requirements_version`` is current; otherwise they are
+re-extracted from the cached sections without re-parsing. Per-vacancy parts
+(HH key skills, constraints, the quality guard) are applied by the caller.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import multiprocessing
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.db.models import VacancyParseCache
+from app.services.requirements_extractor import extract_requirements_from_sections, extract_text_skill_requirements
+from app.services.vacancy_parsing.hh_parser import parse_hh_description
+from app.services.vacancy_parsing.stages import PARSE_VERSION, requirements_version
+
+logger = logging.getLogger(__name__)
+
+
+def description_hash(description: str) -> str:
+    return hashlib.sha256((description or "").encode("utf-8")).hexdigest()
+
+
+def is_current(entry: dict[str, Any]) -> bool:
+    return entry["version"] == PARSE_VERSION and entry["requirements_version"] == requirements_version()
+
+
+def derive_description(description: str, cached: dict[str, Any] | None = None) -> dict[str, Any]:
+    """Cache entry for a description; reuses the parse part of ``cached`` if it has the current parser version.
+
+    Pure CPU, no DB access: safe to run in a child process.
+    """
+
+    if cached is not None and cached["version"] == PARSE_VERSION:
+        plain_text = cached["plain_text"]
+        sections = cached["sections"]
+        quality_score = cached["quality_score"]
+    else:
+        parsed = parse_hh_description(description or "")
+        plain_text = parsed["plain_text"]
+        sections = parsed["sections"]
+        quality_score = parsed["quality_score"]
+
+    section_requirements = extract_requirements_from_sections(sections)
+    return {
+        "plain_text": plain_text,
+        "sections": sections,
+        "quality_score": quality_score,
+        "version": PARSE_VERSION,
+        "requirements_version": requirements_version(),
+        "section_requirements": section_requirements,
+        "text_requirements": extract_text_skill_requirements(plain_text, section_requirements),
+    }
+
+
+def _derive_safe(job: tuple[str, dict[str, Any] | None]) -> dict[str, Any] | None:
+    try:
+        return derive_description(*job)
+    except Exception:  # noqa: BLE001
+        logger.exception("Failed to parse HH vacancy description")
+        return None
+
+
+def derive_many(jobs: list[tuple[str, dict[str, Any] | None]], processes: int) -> list[dict[str, Any] | None]:
+    """``derive_description`` for many ``(description, cached)`` jobs, None where parsing failed."""
+
+    # Дочерние процессы prefork-воркера Celery — демоны и не могут порождать пул.
+    if processes > 1 and len(jobs) > 1 and multiprocessing.current_process().daemon:
+        logger.warning("HH_PARSE_PROCESSES=%s ignored in a daemonic worker process, parsing sequentially", processes)
+        processes = 1
+
+    if processes <= 1:
+        return [_derive_safe(job) for job in jobs]
+
+    chunksize = max(1, len(jobs) // (processes * 4))
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(_derive_safe, jobs, chunksize=chunksize))
+
+
+def parsed_payload(entry: dict[str, Any]) -> dict[str, Any]:
+    """``parse_hh_description``-shaped dict for a cache entry; sections are copied, so the guard may mutate them."""
+
+    return {
+        "plain_text": entry["plain_text"],
+        "sections": dict(entry["sections"]),
+        "quality_score": entry["quality_score"],
+        "version": entry["version"],
+    }
+
+
+def load_entries(db: Session, hashes: Iterable[str]) -> dict[str, dict[str, Any]]:
+    unique_hashes = sorted(set(hashes))
+    if not unique_hashes:
+        return {}
+
+    rows = db.execute(
+        select(VacancyParseCache).where(
+            VacancyParseCache.description_hash.in_(unique_hashes),
+            VacancyParseCache.parser_version == PARSE_VERSION,
+        )
+    ).scalars()
+    return {
+        row.description_hash: {
+            "plain_text": row.plain_text,
+            "sections": row.sections_json,
+            "quality_score": row.quality_score,
+            "version": row.parser_version,
+            "requirements_version": row.requirements_version,
+            "section_requirements": row.section_requirements,
+            "text_requirements": row.text_requirements,
+        }
+        for row in rows
+    }
+
+
+def store_entries(db: Session, entries: dict[str, dict[str, Any]]) -> None:
+    if not entries:
+        return
+
+    now_utc = datetime.now(timezone.utc)
+    # Порядок ключей фиксирован, чтобы параллельные чанки не ловили дедлоки на одних и тех же строках.
+    stmt = insert(VacancyParseCache).values(
+        [
+            {
+                "description_hash": digest,
+                "parser_version": entry["version"],
+                "plain_text": entry["plain_text"],
+                "sections_json": entry["sections"],
+                "quality_score": entry["quality_score"],
+                "requirements_version": entry["requirements_version"],
+                "section_requirements": entry["section_requirements"],
+                "text_requirements": entry["text_requirements"],
+                "updated_at": now_utc,
+            }
+            for digest, entry in sorted(entries.items())
+        ]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[VacancyParseCache.description_hash, VacancyParseCache.parser_version],
+        set_={
+            "plain_text": stmt.excluded.plain_text,
+            "sections_json": stmt.excluded.sections_json,
+            "quality_score": stmt.excluded.quality_score,
+            "requirements_version": stmt.excluded.requirements_version,
+            "section_requirements": stmt.excluded.section_requirements,
+            "text_requirements": stmt.excluded.text_requirements,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    db.execute(stmt)
+
+
+def get_or_derive(db: Session, description: str) -> dict[str, Any]:
+    """Cache entry for one description; derives and stores it on a miss (caller commits)."""
+
+    digest = description_hash(description)
+    entry = load_entries(db, [digest]).get(digest)
+    if entry is not None and is_current(entry):
+        return entry
+
+    entry = derive_description(description, entry)
+    store_entries(db, {digest: entry})
+    return entry
+
+
+def purge_stale_entries(db: Session) -> int:
+    """Drop entries of other parser versions; they can never be hit again."""
+
+    result = db.execute(delete(VacancyParseCache).where(VacancyParseCache.parser_version != PARSE_VERSION))
+    return int(result.rowcount or 0)
@@ -0,0 +1,46 @@
+"""Version stamps of the derived vacancy artifacts.
+
+Each stage is stamped separately, so a backfill redoes only the stages whose
+code changed (and everything downstream of them):
+
+    parse (plain text, sections) -> requirements -> features (quality guard)
+                                                 -> embedding text -> embedding -> scores
+
+Bump a constant when the output of its stage changes:
+
+* ``PARSE_VERSION`` — ``hh_parser`` / ``strip_html``;
+* ``REQUIREMENTS_VERSION`` — ``requirements_extractor``, ``requirement_markers``,
+  generated skill/constraint rows; the skill taxonomy version is appended
+  automatically;
+* ``FEATURES_VERSION`` — the low-quality guard (``sections_json.meta``);
+* ``EMBEDDING_TEXT_VERSION`` — the vacancy text fed to the embedding model.
+"""
+
+from __future__ import annotations
+
+import hashlib
+
+from app.services.skills import get_skill_taxonomy
+from app.services.vacancy_parsing.hh_parser import VERSION as PARSE_VERSION
+
+REQUIREMENTS_VERSION = "requirements_v1"
+FEATURES_VERSION = "features_v1"
+EMBEDDING_TEXT_VERSION = "vacancy_text_v1"
+
+__all__ = [
+    "EMBEDDING_TEXT_VERSION",
+    "FEATURES_VERSION",
+    "PARSE_VERSION",
+    "REQUIREMENTS_VERSION",
+    "embedding_text_hash",
+    "requirements_version",
+]
+
+
+def requirements_version() -> str:
+    """Requirements stamp; changes with the extractor version and with the hot-reloaded skill taxonomy."""
+    return f"{REQUIREMENTS_VERSION}+taxonomy{get_skill_taxonomy().version}"
+
+
+def embedding_text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
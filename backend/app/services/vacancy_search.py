@@ -0,0 +1,220 @@
+"""Search over the local vacancy store.
+
+Lexical search uses the generated ``search_vector`` columns (title on
+``vacancies`` with weight A, ``vacancy_parsed.plain_text`` with weight B; each
+with Russian and English stemming) and their GIN indexes. Hybrid search fuses
+the lexical ranking with the pgvector ranking of the embedded query by
+Reciprocal Rank Fusion. Query embeddings are cached in-process (LRU with TTL),
+so repeated searches don't call the embedding model.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Literal
+
+from sqlalchemy import cast, func, literal, select, union
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.orm import Session
+
+from app.core.config import get_vacancy_search_settings
+from app.db.models import Vacancy, VacancyEmbedding, VacancyParsed
+from app.services.embeddings.provider import get_embedding_provider
+
+SearchMode = Literal["lexical", "hybrid"]
+SearchLanguage = Literal["auto", "russian", "english"]
+
+
+@dataclass(slots=True)
+class SearchHit:
+    vacancy_id: int
+    score: float
+    lexical_rank: float | None = None
+    semantic: float | None = None
+
+
+class QueryEmbeddingCache:
+    """Thread-safe LRU of query embeddings keyed by (provider name, normalized query)."""
+
+    def __init__(self, max_size: int, ttl_s: float) -> None:
+        self.max_size = max_size
+        self.ttl_s = ttl_s
+        self._items: OrderedDict[tuple[str, str], tuple[float, list[float]]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple[str, str]) -> list[float] | None:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None or (self.ttl_s and time.monotonic() - item[0] > self.ttl_s):
+                self._items.pop(key, None)
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def put(self, key: tuple[str, str], vector: list[float]) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._items[key] = (time.monotonic(), vector)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+
+_query_embedding_cache: QueryEmbeddingCache | None = None
+
+
+def get_query_embedding_cache() -> QueryEmbeddingCache:
+    global _query_embedding_cache
+    if _query_embedding_cache is None:
+        settings = get_vacancy_search_settings()
+        _query_embedding_cache = QueryEmbeddingCache(
+            settings.query_embedding_cache_size, settings.query_embedding_cache_ttl_s
+        )
+    return _query_embedding_cache
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def embed_query(query: str) -> tuple[str, list[float]]:
+    """(model name, vector) for a search query, from the cache when possible."""
+
+    provider = get_embedding_provider()
+    key = (provider.name, normalize_query(query))
+    cache = get_query_embedding_cache()
+    vector = cache.get(key)
+    if vector is None:
+        vector = provider.embed_text(key[1])
+        cache.put(key, vector)
+    return provider.name, vector
+
+
+def _tsquery(query: str, language: SearchLanguage):
+    configs = ("russian", "english") if language == "auto" else (language,)
+    parts = [func.websearch_to_tsquery(cast(literal(config), REGCONFIG), query) for config in configs]
+    expression = parts[0]
+    for part in parts[1:]:
+        # || над tsquery — OR: документ находится по любой из морфологий.
+        expression = expression.op("||")(part)
+    return expression
+
+
+def _filters(source: str | None, status: str | None) -> list:
+    clauses = []
+    if source is not None:
+        clauses.append(Vacancy.source == source)
+    if status is not None:
+        clauses.append(Vacancy.status == status)
+    return clauses
+
+
+def lexical_ranking(
+    db: Session,
+    query: str,
+    *,
+    language: SearchLanguage = "auto",
+    limit: int,
+    offset: int = 0,
+    source: str | None = None,
+    status: str | None = None,
+) -> list[tuple[int, float]]:
+    tsquery = _tsquery(query, language)
+    # Два отдельных индексных поиска (по заголовку и по тексту) вместо OR через JOIN, который GIN не покрывает.
+    matches = union(
+        select(Vacancy.id.label("vacancy_id")).where(Vacancy.search_vector.bool_op("@@")(tsquery)),
+        select(VacancyParsed.vacancy_id.label("vacancy_id")).where(VacancyParsed.search_vector.bool_op("@@")(tsquery)),
+    ).subquery()
+    rank = func.ts_rank_cd(Vacancy.search_vector, tsquery) + func.coalesce(
+        func.ts_rank_cd(VacancyParsed.search_vector, tsquery), 0.0
+    )
+    stmt = (
+        select(Vacancy.id, rank.label("rank"))
+        .join(matches, matches.c.vacancy_id == Vacancy.id)
+        .outerjoin(VacancyParsed, VacancyParsed.vacancy_id == Vacancy.id)
+        .where(*_filters(source, status))
+        .order_by(rank.desc(), Vacancy.id.desc())
+        .limit(limit)
+        .offset(offset)
+    )
+    return [(int(row.id), float(row.rank)) for row in db.execute(stmt)]
+
+
+def semantic_ranking(
+    db: Session,
+    model_name: str,
+    vector: list[float],
+    *,
+    limit: int,
+    source: str | None = None,
+    status: str | None = None,
+) -> list[tuple[int, float]]:
+    distance = VacancyEmbedding.embedding.cosine_distance(vector)
+    stmt = (
+        select(VacancyEmbedding.vacancy_id, (1 - distance).label("semantic"))
+        .join(Vacancy, Vacancy.id == VacancyEmbedding.vacancy_id)
+        .where(VacancyEmbedding.model_name == model_name, *_filters(source, status))
+        .order_by(distance)
+        .limit(limit)
+    )
+    return [(int(row.vacancy_id), float(row.semantic)) for row in db.execute(stmt)]
+
+
+def reciprocal_rank_fusion(
+    lexical: list[tuple[int, float]],
+    semantic: list[tuple[int, float]],
+    *,
+    k: int,
+    semantic_weight: float,
+) -> list[SearchHit]:
+    hits: dict[int, SearchHit] = {}
+    for position, (vacancy_id, rank) in enumerate(lexical, start=1):
+        hit = hits.setdefault(vacancy_id, SearchHit(vacancy_id=vacancy_id, score=0.0))
+        hit.lexical_rank = rank
+        hit.score += (1.0 - semantic_weight) / (k + position)
+    for position, (vacancy_id, similarity) in enumerate(semantic, start=1):
+        hit = hits.setdefault(vacancy_id, SearchHit(vacancy_id=vacancy_id, score=0.0))
+        hit.semantic = similarity
+        hit.score += semantic_weight / (k + position)
+    return sorted(hits.values(), key=lambda hit: (-hit.score, -hit.vacancy_id))
+
+
+def search_vacancies(
+    db: Session,
+    query: str,
+    *,
+    mode: SearchMode = "lexical",
+    language: SearchLanguage = "auto",
+    limit: int = 20,
+    offset: int = 0,
+    semantic_weight: float = 0.5,
+    source: str | None = None,
+    status: str | None = None,
+) -> list[SearchHit]:
+    if mode == "lexical":
+        return [
+            SearchHit(vacancy_id=vacancy_id, score=rank, lexical_rank=rank)
+            for vacancy_id, rank in lexical_ranking(
+                db, query, language=language, limit=limit, offset=offset, source=source, status=status
+            )
+        ]
+
+    settings = get_vacancy_search_settings()
+    candidates = max(settings.hybrid_candidates, offset + limit)
+    lexical = lexical_ranking(db, query, language=language, limit=candidates, source=source, status=status)
+    model_name, vector = embed_query(query)
+    semantic = semantic_ranking(db, model_name, vector, limit=candidates, source=source, status=status)
+    fused = reciprocal_rank_fusion(lexical, semantic, k=settings.rrf_k, semantic_weight=semantic_weight)
+    return fused[offset : offset + limit]
@@ -3,13 +3,20 @@
 from app.tasks.embedding_tasks import (
     build_profile_embedding,
     build_vacancy_embedding,
+    rebuild_dirty_profile_embedding,
     rebuild_profile_embeddings,
     rebuild_vacancy_embeddings,
 )
 from app.tasks.hh_import_tasks import import_hh_vacancies_task, sync_saved_search_task
-from app.tasks.matching_tasks import compute_profile_recommendations
+from app.tasks.neighbor_tasks import rebuild_vacancy_neighbors, refresh_vacancy_neighbors
+from app.tasks.matching_tasks import compute_profile_recommendations, recompute_vacancy_scores
 from app.tasks.profile_backfill_tasks import backfill_profile
-from app.tasks.vacancy_parsing_tasks import backfill_hh_parsed
+from app.tasks.vacancy_parsing_tasks import (
+    backfill_hh_parsed,
+    backfill_hh_parsed_chunk,
+    finalize_hh_parsed_backfill,
+    rebuild_vacancy_clusters,
+)
 
 __all__ = [
     "import_hh_vacancies_task",
@@ -18,7 +25,14 @@ __all__ = [
     "build_profile_embedding",
     "rebuild_vacancy_embeddings",
     "rebuild_profile_embeddings",
+    "rebuild_dirty_profile_embedding",
     "compute_profile_recommendations",
+    "recompute_vacancy_scores",
+    "refresh_vacancy_neighbors",
+    "rebuild_vacancy_neighbors",
     "backfill_profile",
     "backfill_hh_parsed",
+    "backfill_hh_parsed_chunk",
+    "finalize_hh_parsed_backfill",
+    "rebuild_vacancy_clusters",
 ]
@@ -1,14 +1,25 @@
 import logging
 from datetime import datetime, timezone
+from typing import Any
 
-from sqlalchemy import delete, select
+from sqlalchemy import delete, select, text, update
 from sqlalchemy.dialects.postgresql import insert
 
 from app.celery_app import celery_app
-from app.db.models import Profile, ProfileEmbedding, Vacancy, VacancyEmbedding, VacancyParsed, VacancyRequirement
+from app.core.config import get_profile_refresh_settings
+from app.db.models import (
+    Profile,
+    ProfileEmbedding,
+    Vacancy,
+    VacancyEmbedding,
+    VacancyParsed,
+    VacancyRequirement,
+    VacancySignature,
+)
 from app.db.session import SessionLocal
 from app.services.embeddings.profile_text_builder import build_profile_document, build_profile_documents
 from app.services.embeddings.provider import get_embedding_provider
+from app.services.vacancy_parsing.stages import EMBEDDING_TEXT_VERSION, embedding_text_hash
 from app.utils.text_clean import strip_html
 
 logger = logging.getLogger(__name__)
@@ -33,11 +44,13 @@ def _build_vacancy_text(vacancy: Vacancy, key_skills: list[str], parsed_plain_te
     return "\n\n".join(part for part in parts if part)
 
 
-def _upsert_vacancy_embedding(db, vacancy_id: int, vector: list[float], model_name: str) -> None:
+def _upsert_vacancy_embedding(db, vacancy_id: int, vector: list[float], model_name: str, text: str) -> None:
     stmt = insert(VacancyEmbedding).values(
         vacancy_id=vacancy_id,
         embedding=vector,
         model_name=model_name,
+        text_version=EMBEDDING_TEXT_VERSION,
+        text_hash=embedding_text_hash(text),
         updated_at=datetime.now(timezone.utc),
     )
     stmt = stmt.on_conflict_do_update(
@@ -45,12 +58,78 @@ def _upsert_vacancy_embedding(db, vacancy_id: int, vector: list[float], model_na
         set_={
             "embedding": stmt.excluded.embedding,
             "model_name": stmt.excluded.model_name,
+            "text_version": stmt.excluded.text_version,
+            "text_hash": stmt.excluded.text_hash,
             "updated_at": stmt.excluded.updated_at,
         },
     )
     db.execute(stmt)
 
 
+def _cluster_representatives(db, vacancy_ids: list[int]) -> dict[int, int]:
+    """vacancy_id -> representative id for near-duplicates that are not representatives themselves."""
+    if not vacancy_ids:
+        return {}
+    return dict(
+        db.execute(
+            select(VacancySignature.vacancy_id, VacancySignature.cluster_id).where(
+                VacancySignature.vacancy_id.in_(vacancy_ids),
+                VacancySignature.cluster_id != VacancySignature.vacancy_id,
+            )
+        ).all()
+    )
+
+
+def _stored_vectors(db, vacancy_ids: list[int], model_name: str) -> dict[int, list[float]]:
+    if not vacancy_ids:
+        return {}
+    return {
+        row.vacancy_id: list(row.embedding)
+        for row in db.execute(
+            select(VacancyEmbedding.vacancy_id, VacancyEmbedding.embedding).where(
+                VacancyEmbedding.vacancy_id.in_(vacancy_ids),
+                VacancyEmbedding.model_name == model_name,
+            )
+        )
+    }
+
+
+def _fan_out_representative_embeddings(db, representative_ids: list[int]) -> list[int]:
+    """Copy re-embedded representative vectors to their near-duplicates; returns the updated vacancy ids."""
+    if not representative_ids:
+        return []
+    return list(
+        db.execute(
+            text(
+                """
+                UPDATE vacancy_embeddings_v2 AS member
+                SET embedding = rep.embedding, updated_at = rep.updated_at
+                FROM vacancy_signatures vs, vacancy_embeddings_v2 rep
+                WHERE vs.vacancy_id = member.vacancy_id
+                  AND vs.cluster_id = rep.vacancy_id
+                  AND rep.vacancy_id = ANY(:representative_ids)
+                  AND member.vacancy_id <> rep.vacancy_id
+                  AND member.model_name = rep.model_name
+                RETURNING member.vacancy_id
+                """
+            ),
+            {"representative_ids": representative_ids},
+        ).scalars()
+    )
+
+
+def _schedule_neighbor_refresh(vacancy_ids: list[int]) -> None:
+    if not vacancy_ids:
+        return
+
+    from app.tasks.neighbor_tasks import refresh_vacancy_neighbors
+
+    try:
+        refresh_vacancy_neighbors.delay(sorted(set(vacancy_ids)))
+    except Exception:  # noqa: BLE001
+        logger.exception("Failed to enqueue vacancy neighbors refresh | size=%s", len(vacancy_ids))
+
+
 def _upsert_profile_embedding(db, profile_id: int, vector: list[float], model_name: str) -> None:
     stmt = insert(ProfileEmbedding).values(
         profile_id=profile_id,
@@ -89,12 +168,25 @@ def build_vacancy_embedding(vacancy_id: int) -> dict[str, str | int]:
         ).scalar_one_or_none()
 
         provider = get_embedding_provider()
-        text = _build_vacancy_text(vacancy, key_skills, parsed_plain_text=parsed_plain_text)
-        vector = provider.embed_text(text)
-        _upsert_vacancy_embedding(db, vacancy_id=vacancy_id, vector=vector, model_name=provider.name)
+        vacancy_text = _build_vacancy_text(vacancy, key_skills, parsed_plain_text=parsed_plain_text)
+        # Near-duplicate берёт вектор представителя кластера, если тот уже посчитан той же моделью.
+        representative_id = _cluster_representatives(db, [vacancy_id]).get(vacancy_id)
+        vector = _stored_vectors(db, [representative_id], provider.name).get(representative_id) if representative_id else None
+        if vector is None:
+            vector = provider.embed_text(vacancy_text)
+        _upsert_vacancy_embedding(db, vacancy_id=vacancy_id, vector=vector, model_name=provider.name, text=vacancy_text)
+        # Представитель раздаёт новый вектор своим дубликатам, как и в пакетной пересборке.
+        copied_ids = [] if representative_id else _fan_out_representative_embeddings(db, [vacancy_id])
         db.commit()
 
-        return {"status": "ok", "vacancy_id": vacancy_id}
+        _schedule_neighbor_refresh([vacancy_id, *copied_ids])
+
+        return {
+            "status": "ok",
+            "vacancy_id": vacancy_id,
+            "representative_id": representative_id or vacancy_id,
+            "copied_to": len(copied_ids),
+        }
     except Exception:  # noqa: BLE001
         db.rollback()
         logger.exception("Failed to build vacancy embedding | vacancy_id=%s", vacancy_id)
@@ -127,6 +219,48 @@ def build_profile_embedding(profile_id: int) -> dict[str, str | int]:
         db.close()
 
 
+@celery_app.task(name="app.tasks.embedding_tasks.rebuild_dirty_profile_embedding")
+def rebuild_dirty_profile_embedding(profile_id: int, revision: int) -> dict[str, str | int]:
+    """Debounced rebuild: runs only for the latest profile revision (see app.services.profile_refresh)."""
+
+    db = SessionLocal()
+    try:
+        state = db.execute(
+            select(Profile.embedding_revision, Profile.embedding_built_revision).where(Profile.id == profile_id)
+        ).one_or_none()
+        if state is None:
+            return {"status": "skipped", "reason": "profile_not_found", "profile_id": profile_id}
+        if state.embedding_revision != revision:
+            return {"status": "skipped", "reason": "superseded", "profile_id": profile_id, "revision": revision}
+        if state.embedding_built_revision == revision:
+            return {"status": "skipped", "reason": "up_to_date", "profile_id": profile_id, "revision": revision}
+
+        provider = get_embedding_provider()
+        vector = provider.embed_text(build_profile_document(db, profile_id))
+        _upsert_profile_embedding(db, profile_id=profile_id, vector=vector, model_name=provider.name)
+        db.execute(
+            update(Profile)
+            .where(Profile.id == profile_id, Profile.embedding_revision == revision)
+            .values(embedding_built_revision=revision, updated_at=Profile.updated_at),
+            execution_options={"synchronize_session": False},
+        )
+        db.commit()
+    except Exception:  # noqa: BLE001
+        db.rollback()
+        logger.exception("Failed to rebuild dirty profile embedding | profile_id=%s revision=%s", profile_id, revision)
+        raise
+    finally:
+        db.close()
+
+    settings = get_profile_refresh_settings()
+    if settings.refresh_recommendations:
+        from app.tasks.matching_tasks import compute_profile_recommendations
+
+        compute_profile_recommendations.delay(profile_id, settings.recommendations_limit)
+
+    return {"status": "ok", "profile_id": profile_id, "revision": revision}
+
+
 @celery_app.task(name="app.tasks.embedding_tasks.rebuild_vacancy_embeddings")
 def rebuild_vacancy_embeddings(limit: int | None = None) -> dict[str, int]:
     db = SessionLocal()
@@ -167,10 +301,14 @@ def rebuild_vacancy_embeddings(limit: int | None = None) -> dict[str, int]:
                 )
 
             vectors = provider.embed_texts(texts)
-            for vacancy_id, vector in zip(prepared_ids, vectors, strict=False):
-                _upsert_vacancy_embedding(db, vacancy_id=vacancy_id, vector=vector, model_name=provider.name)
+            for vacancy_id, vector, text in zip(prepared_ids, vectors, texts, strict=False):
+                _upsert_vacancy_embedding(db, vacancy_id=vacancy_id, vector=vector, model_name=provider.name, text=text)
 
         db.commit()
+
+        from app.tasks.neighbor_tasks import rebuild_vacancy_neighbors
+
+        rebuild_vacancy_neighbors.delay()
         return {"status": "ok", "processed": len(vacancy_ids)}
     except Exception:  # noqa: BLE001
         db.rollback()
@@ -181,23 +319,55 @@ def rebuild_vacancy_embeddings(limit: int | None = None) -> dict[str, int]:
 
 
 @celery_app.task(name="app.tasks.embedding_tasks.rebuild_vacancy_embeddings_for_ids")
-def rebuild_vacancy_embeddings_for_ids(vacancy_ids: list[int]) -> dict[str, int]:
+def rebuild_vacancy_embeddings_for_ids(
+    vacancy_ids: list[int],
+    only_changed: bool = False,
+    rescore_ids: list[int] | None = None,
+) -> dict[str, Any]:
+    """Re-embed the given vacancies.
+
+    With ``only_changed`` existing vectors are kept when the embedding text
+    (hash and ``EMBEDDING_TEXT_VERSION``) and the model are the same; the ids
+    actually re-embedded are returned in ``rebuilt_ids``. With ``rescore_ids``
+    (may be empty) stored scores of the re-embedded vacancies and of
+    ``rescore_ids`` are recomputed afterwards. Near-duplicates get the vector
+    of their cluster representative instead of a model call, and members of
+    re-embedded representatives are updated as well.
+    """
+
     db = SessionLocal()
     try:
         unique_ids = sorted(set(vacancy_ids))
         if not unique_ids:
-            return {"status": "ok", "processed": 0}
+            return {"status": "ok", "processed": 0, "skipped": 0, "rebuilt_ids": []}
 
-        db.execute(delete(VacancyEmbedding).where(VacancyEmbedding.vacancy_id.in_(unique_ids)))
+        if not only_changed:
+            db.execute(delete(VacancyEmbedding).where(VacancyEmbedding.vacancy_id.in_(unique_ids)))
 
         provider = get_embedding_provider()
-        processed = 0
+        rebuilt_ids: list[int] = []
+        computed_vectors: dict[int, list[float]] = {}
+        skipped = 0
+        copied = 0
         for start in range(0, len(unique_ids), EMBED_BATCH_SIZE):
             batch_ids = unique_ids[start : start + EMBED_BATCH_SIZE]
             vacancies = db.execute(select(Vacancy).where(Vacancy.id.in_(batch_ids))).scalars().all()
             parsed_text_by_vacancy_id = dict(
                 db.execute(select(VacancyParsed.vacancy_id, VacancyParsed.plain_text).where(VacancyParsed.vacancy_id.in_(batch_ids))).all()
             )
+            stored_by_vacancy_id = {}
+            if only_changed:
+                stored_by_vacancy_id = {
+                    row.vacancy_id: (row.model_name, row.text_version, row.text_hash)
+                    for row in db.execute(
+                        select(
+                            VacancyEmbedding.vacancy_id,
+                            VacancyEmbedding.model_name,
+                            VacancyEmbedding.text_version,
+                            VacancyEmbedding.text_hash,
+                        ).where(VacancyEmbedding.vacancy_id.in_(batch_ids))
+                    )
+                }
 
             texts = []
             prepared_ids = []
@@ -207,22 +377,80 @@ def rebuild_vacancy_embeddings_for_ids(vacancy_ids: list[int]) -> dict[str, int]
                     VacancyRequirement.kind == "skill",
                 )
                 key_skills = list(db.execute(skills_stmt).scalars().all())
+                text = _build_vacancy_text(
+                    vacancy,
+                    key_skills,
+                    parsed_plain_text=parsed_text_by_vacancy_id.get(vacancy.id),
+                )
+                if stored_by_vacancy_id.get(vacancy.id) == (provider.name, EMBEDDING_TEXT_VERSION, embedding_text_hash(text)):
+                    skipped += 1
+                    continue
                 prepared_ids.append(vacancy.id)
-                texts.append(
-                    _build_vacancy_text(
-                        vacancy,
-                        key_skills,
-                        parsed_plain_text=parsed_text_by_vacancy_id.get(vacancy.id),
-                    )
+                texts.append(text)
+
+            if not texts:
+                continue
+
+            # Near-duplicates не эмбеддим: копируем вектор представителя (уже посчитанный или сохранённый).
+            representative_by_id = _cluster_representatives(db, prepared_ids)
+            prepared_set = set(prepared_ids)
+            computed_vectors.update(
+                _stored_vectors(
+                    db,
+                    sorted(
+                        {
+                            representative_id
+                            for representative_id in representative_by_id.values()
+                            if representative_id not in computed_vectors and representative_id not in prepared_set
+                        }
+                    ),
+                    provider.name,
                 )
+            )
+            copy_ids = {
+                vacancy_id
+                for vacancy_id, representative_id in representative_by_id.items()
+                if representative_id in computed_vectors
+                or (representative_id in prepared_set and representative_id not in representative_by_id)
+            }
+            embed_items = [(vacancy_id, text) for vacancy_id, text in zip(prepared_ids, texts) if vacancy_id not in copy_ids]
+            vectors = provider.embed_texts([text for _, text in embed_items]) if embed_items else []
+            for (vacancy_id, text), vector in zip(embed_items, vectors, strict=False):
+                _upsert_vacancy_embedding(db, vacancy_id=vacancy_id, vector=vector, model_name=provider.name, text=text)
+                computed_vectors[vacancy_id] = vector
+                rebuilt_ids.append(vacancy_id)
+            for vacancy_id, text in zip(prepared_ids, texts):
+                if vacancy_id not in copy_ids:
+                    continue
+                vector = computed_vectors[representative_by_id[vacancy_id]]
+                _upsert_vacancy_embedding(db, vacancy_id=vacancy_id, vector=vector, model_name=provider.name, text=text)
+                rebuilt_ids.append(vacancy_id)
+                copied += 1
+
+        rebuilt_set = set(rebuilt_ids)
+        rebuilt_ids.extend(
+            vacancy_id
+            for vacancy_id in _fan_out_representative_embeddings(db, sorted(rebuilt_set))
+            if vacancy_id not in rebuilt_set
+        )
+        db.commit()
 
-            vectors = provider.embed_texts(texts)
-            for vacancy_id, vector in zip(prepared_ids, vectors, strict=False):
-                _upsert_vacancy_embedding(db, vacancy_id=vacancy_id, vector=vector, model_name=provider.name)
-                processed += 1
+        _schedule_neighbor_refresh(rebuilt_ids)
 
-        db.commit()
-        return {"status": "ok", "processed": processed}
+        if rescore_ids is not None:
+            score_ids = sorted(set(rebuilt_ids) | set(rescore_ids))
+            if score_ids:
+                from app.tasks.matching_tasks import recompute_vacancy_scores
+
+                recompute_vacancy_scores.delay(score_ids)
+
+        return {
+            "status": "ok",
+            "processed": len(rebuilt_ids),
+            "skipped": skipped,
+            "copied_from_representative": copied,
+            "rebuilt_ids": rebuilt_ids,
+        }
     except Exception:  # noqa: BLE001
         db.rollback()
         logger.exception("Failed to rebuild vacancy embeddings for ids")
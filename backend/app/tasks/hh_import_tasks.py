@@ -6,7 +6,7 @@ from sqlalchemy import select
 
 from app.celery_app import celery_app
 from app.db.models import SavedSearch
-from app.db.session import SessionLocal
+from app.db.session import ReadSessionLocal, SessionLocal
 from app.integrations.hh_client import HHClient
 from app.services.hh_import_service import HHImportFilters, HHImportService
 
@@ -40,7 +40,7 @@ def import_hh_vacancies_task(params: dict[str, Any]) -> dict[str, int]:
 def schedule_saved_search_sync() -> dict[str, int]:
     """Beat task that enqueues sync jobs for all active saved searches."""
 
-    db = SessionLocal()
+    db = ReadSessionLocal()
     try:
         stmt = select(SavedSearch.id).where(SavedSearch.is_active.is_(True))
         saved_search_ids = list(db.execute(stmt).scalars().all())
@@ -3,6 +3,8 @@ import logging
 from app.celery_app import celery_app
 from app.db.session import SessionLocal
 from app.services.matching.matching_service import MatchingService
+from app.services.matching.weights import get_weights, rescore_batch
+from app.services.response_cache import invalidate_profiles
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +17,7 @@ def compute_profile_recommendations(profile_id: int, limit: int = 50) -> dict:
     try:
         service = MatchingService(db)
         scores = service.compute_recommendations(profile_id=profile_id, limit=limit)
+        invalidate_profiles([profile_id])
 
         return {
             "profile_id": profile_id,
@@ -45,3 +48,48 @@ def compute_profile_recommendations(profile_id: int, limit: int = 50) -> dict:
         raise
     finally:
         db.close()
+
+
+@celery_app.task(name="app.tasks.matching_tasks.recompute_vacancy_scores")
+def recompute_vacancy_scores(vacancy_ids: list[int]) -> dict:
+    """Recompute stored scores of vacancies whose requirements or embedding changed."""
+
+    db = SessionLocal()
+    try:
+        recomputed = MatchingService(db).recompute_scores_for_vacancies(sorted(set(vacancy_ids)))
+        invalidate_profiles(profile_id for profile_id, _ in recomputed)
+        return {"status": "ok", "vacancies": len(set(vacancy_ids)), "recomputed": len(recomputed)}
+    except Exception:  # noqa: BLE001
+        db.rollback()
+        logger.exception("Failed to recompute vacancy scores | vacancies=%s", len(vacancy_ids))
+        raise
+    finally:
+        db.close()
+
+
+@celery_app.task(name="app.tasks.matching_tasks.apply_scoring_weights")
+def apply_scoring_weights(version: str | None = None, batch_size: int = 5000) -> dict:
+    """Re-derive stored final scores with a weights version (default: active) without recomputing pairs."""
+
+    db = SessionLocal()
+    try:
+        weights = get_weights(version)
+        rows = 0
+        profile_ids: set[int] = set()
+        while True:
+            batch_profile_ids = rescore_batch(db, weights, batch_size)
+            if not batch_profile_ids:
+                break
+            db.commit()
+            invalidate_profiles(batch_profile_ids)
+            rows += len(batch_profile_ids)
+            profile_ids.update(batch_profile_ids)
+
+        logger.info("Scoring weights applied | version=%s rows=%s profiles=%s", weights.version, rows, len(profile_ids))
+        return {"status": "ok", "weights_version": weights.version, "rows": rows, "profiles": len(profile_ids)}
+    except Exception:  # noqa: BLE001
+        db.rollback()
+        logger.exception("Failed to apply scoring weights | version=%s", version)
+        raise
+    finally:
+        db.close()
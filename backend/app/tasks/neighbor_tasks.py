@@ -0,0 +1,54 @@
+import logging
+
+from sqlalchemy import select
+
+from app.celery_app import celery_app
+from app.db.models import VacancyEmbedding
+from app.db.session import SessionLocal
+from app.services.vacancy_neighbors import NEIGHBORS_TOP_N, rebuild_neighbors, refresh_neighbors
+
+logger = logging.getLogger(__name__)
+
+REBUILD_BATCH_SIZE = 500
+
+
+@celery_app.task(name="app.tasks.neighbor_tasks.refresh_vacancy_neighbors")
+def refresh_vacancy_neighbors(vacancy_ids: list[int], top_n: int = NEIGHBORS_TOP_N) -> dict[str, int | str]:
+    """Refresh precomputed similar-vacancy lists affected by changed embeddings."""
+
+    db = SessionLocal()
+    try:
+        stats = refresh_neighbors(db, vacancy_ids, top_n)
+        db.commit()
+        return {"status": "ok", **stats}
+    except Exception:  # noqa: BLE001
+        db.rollback()
+        logger.exception("Failed to refresh vacancy neighbors | size=%s", len(vacancy_ids))
+        raise
+    finally:
+        db.close()
+
+
+@celery_app.task(name="app.tasks.neighbor_tasks.rebuild_vacancy_neighbors")
+def rebuild_vacancy_neighbors(
+    batch_size: int = REBUILD_BATCH_SIZE, top_n: int = NEIGHBORS_TOP_N
+) -> dict[str, int | str]:
+    """Recompute the similar-vacancy list of every vacancy with an embedding."""
+
+    db = SessionLocal()
+    try:
+        vacancy_ids = list(
+            db.execute(select(VacancyEmbedding.vacancy_id).order_by(VacancyEmbedding.vacancy_id.asc())).scalars().all()
+        )
+        batch_size = max(1, batch_size)
+        processed = 0
+        for start in range(0, len(vacancy_ids), batch_size):
+            processed += rebuild_neighbors(db, vacancy_ids[start : start + batch_size], top_n)
+            db.commit()
+        return {"status": "ok", "processed": processed}
+    except Exception:  # noqa: BLE001
+        db.rollback()
+        logger.exception("Failed to rebuild vacancy neighbors")
+        raise
+    finally:
+        db.close()
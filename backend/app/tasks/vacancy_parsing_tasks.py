@@ -1,132 +1,481 @@
+"""Backfill of ``vacancy_parsed`` and generated requirements for HH vacancies.
+
+``backfill_hh_parsed`` selects vacancies with at least one stale stage (see
+``app.services.vacancy_parsing.stages``) and fans them out as a chord of
+``backfill_hh_parsed_chunk`` tasks. Each chunk loads its descriptions and
+stored artifacts in one query, recomputes only the stale stages (in a process
+pool when ``HH_PARSE_PROCESSES`` > 1 and the worker allows child processes),
+and writes parsed rows and changed requirements with one statement each.
+Embeddings are rebuilt only when their text moved, and stored scores only for
+vacancies whose requirements, plain text or embedding changed.
+``finalize_hh_parsed_backfill`` aggregates the chunk results; progress of the
+running group is reported by ``/tasks/{task_id}``.
+"""
+
 import logging
+import os
 from typing import Any, cast
 
-from sqlalchemy import outerjoin, select
+from celery import chord, group
+from sqlalchemy import or_, select
 
 from app.celery_app import celery_app
-from app.db.models import Vacancy, VacancyParsed
+from app.db.models import Vacancy, VacancyEmbedding, VacancyParsed, VacancyRequirement
 from app.db.session import SessionLocal
+from app.services import vacancy_dedup
 from app.services.hh_import_service import HHImportService
 from app.services.requirements_extractor import extract_requirements_from_sections
-from app.services.vacancy_parsing import parse_hh_description
-from app.services.vacancy_parsing.hh_parser import VERSION as HH_PARSER_VERSION
+from app.services.vacancy_parsing import parse_cache
+from app.services.vacancy_parsing.stages import (
+    EMBEDDING_TEXT_VERSION,
+    FEATURES_VERSION,
+    PARSE_VERSION,
+    requirements_version,
+)
 from app.tasks.embedding_tasks import rebuild_vacancy_embeddings_for_ids
 
 logger = logging.getLogger(__name__)
 
-COMMIT_BATCH_SIZE = 100
+CHUNK_SIZE = 1000
 EMBEDDING_BATCH_SIZE = 256
 RECOMMENDATION_PROFILES = (1, 2)
 
 
-@celery_app.task(name="app.tasks.vacancy_parsing_tasks.backfill_hh_parsed")
-def backfill_hh_parsed(
-    limit: int | None = None,
-    only_missing: bool = True,
+def _parse_processes() -> int:
+    return max(1, int(os.getenv("HH_PARSE_PROCESSES") or "1"))
+
+
+STAGE_PARSE = "parse"
+STAGE_REQUIREMENTS = "requirements"
+STAGE_FEATURES = "features"
+
+
+def stale_stages(stored: dict[str, Any] | None, *, force: bool = False) -> frozenset[str]:
+    """Stages to recompute for a stored ``vacancy_parsed`` row; a stale stage invalidates the ones after it."""
+
+    if force or stored is None or stored["version"] != PARSE_VERSION:
+        return frozenset((STAGE_PARSE, STAGE_REQUIREMENTS, STAGE_FEATURES))
+    if stored["requirements_version"] != requirements_version():
+        return frozenset((STAGE_REQUIREMENTS, STAGE_FEATURES))
+    if stored["features_version"] != FEATURES_VERSION:
+        return frozenset((STAGE_FEATURES,))
+    return frozenset()
+
+
+def derive_vacancy_stages(
+    entry: dict[str, Any] | None,
+    stored: dict[str, Any] | None,
+    stages: frozenset[str],
+) -> tuple[dict[str, Any], list[dict[str, Any]] | None]:
+    """Parsed payload and generated requirement rows (None if not recomputed).
+
+    ``entry`` is the parse cache entry of the description; it is required
+    unless only the features stage is stale.
+    """
+
+    if entry is not None:
+        parsed = parse_cache.parsed_payload(entry)
+        section_requirements = entry["section_requirements"]
+        if STAGE_PARSE not in stages and stored is not None:
+            parsed["extracted_at"] = stored["extracted_at"]
+    else:
+        parsed = {
+            "plain_text": stored["plain_text"],
+            "sections": dict(stored["sections_json"] or {}),
+            "quality_score": stored["quality_score"],
+            "version": stored["version"],
+            "extracted_at": stored["extracted_at"],
+        }
+        section_requirements = extract_requirements_from_sections(parsed["sections"])
+
+    requirement_rows = None
+    if STAGE_REQUIREMENTS in stages:
+        requirement_rows = HHImportService._generated_requirement_rows(None, parsed, entry["text_requirements"])
+    HHImportService._apply_quality_features(parsed, section_requirements)
+    return parsed, requirement_rows
+
+
+def _select_target_ids(db, *, limit: int | None, only_missing: bool, include_embeddings: bool) -> list[int]:
+    stmt = select(Vacancy.id).where(Vacancy.source == "hh").order_by(Vacancy.id.asc())
+    if only_missing:
+        stale = [
+            VacancyParsed.vacancy_id.is_(None),
+            VacancyParsed.version != PARSE_VERSION,
+            VacancyParsed.requirements_version.is_distinct_from(requirements_version()),
+            VacancyParsed.features_version.is_distinct_from(FEATURES_VERSION),
+        ]
+        if include_embeddings:
+            stale.append(VacancyEmbedding.text_version.is_distinct_from(EMBEDDING_TEXT_VERSION))
+        stmt = (
+            stmt.outerjoin(VacancyParsed, Vacancy.id == VacancyParsed.vacancy_id)
+            .outerjoin(VacancyEmbedding, Vacancy.id == VacancyEmbedding.vacancy_id)
+            .where(or_(*stale))
+        )
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return list(db.execute(stmt).scalars().all())
+
+
+def _requirement_key(row: dict[str, Any]) -> tuple:
+    return (row["kind"], row["raw_text"], row["normalized_key"], row["weight"], row["is_hard"])
+
+
+def _stored_requirements(db, vacancy_ids: list[int]) -> dict[int, list[tuple]]:
+    stored: dict[int, list[tuple]] = {vacancy_id: [] for vacancy_id in vacancy_ids}
+    if not vacancy_ids:
+        return stored
+    rows = db.execute(
+        select(
+            VacancyRequirement.vacancy_id,
+            VacancyRequirement.kind,
+            VacancyRequirement.raw_text,
+            VacancyRequirement.normalized_key,
+            VacancyRequirement.weight,
+            VacancyRequirement.is_hard,
+        ).where(
+            VacancyRequirement.vacancy_id.in_(vacancy_ids),
+            VacancyRequirement.kind.in_(("skill", "constraint")),
+        )
+    ).all()
+    for row in rows:
+        stored[row.vacancy_id].append(_requirement_key(row._mapping))
+    return stored
+
+
+@celery_app.task(name="app.tasks.vacancy_parsing_tasks.backfill_hh_parsed_chunk")
+def backfill_hh_parsed_chunk(
+    vacancy_ids: list[int],
     schedule_embeddings: bool = True,
-    schedule_recommendations: bool = True,
     embedding_batch_size: int = EMBEDDING_BATCH_SIZE,
-    recommendations_limit: int = 50,
+    force: bool = False,
+    schedule_scores: bool = True,
 ) -> dict[str, Any]:
     db = SessionLocal()
     try:
-        stmt = select(Vacancy.id).where(Vacancy.source == "hh").order_by(Vacancy.id.asc())
-        if only_missing:
-            vacancy_parsed_join = outerjoin(Vacancy, VacancyParsed, Vacancy.id == VacancyParsed.vacancy_id)
-            stmt = (
-                select(Vacancy.id)
-                .select_from(vacancy_parsed_join)
-                .where(Vacancy.source == "hh")
-                .where((VacancyParsed.vacancy_id.is_(None)) | (VacancyParsed.version != HH_PARSER_VERSION))
-                .order_by(Vacancy.id.asc())
+        rows = db.execute(
+            select(
+                Vacancy.id,
+                Vacancy.title,
+                Vacancy.description,
+                VacancyParsed.vacancy_id.label("parsed_vacancy_id"),
+                VacancyParsed.plain_text,
+                VacancyParsed.sections_json,
+                VacancyParsed.quality_score,
+                VacancyParsed.version,
+                VacancyParsed.extracted_at,
+                VacancyParsed.requirements_version,
+                VacancyParsed.features_version,
+                VacancyEmbedding.text_version.label("embedding_text_version"),
             )
-        if limit is not None:
-            stmt = stmt.limit(limit)
+            .outerjoin(VacancyParsed, Vacancy.id == VacancyParsed.vacancy_id)
+            .outerjoin(VacancyEmbedding, Vacancy.id == VacancyEmbedding.vacancy_id)
+            .where(Vacancy.id.in_(vacancy_ids))
+        ).all()
 
-        vacancy_ids = list(db.execute(stmt).scalars().all())
-        if not vacancy_ids:
-            return {
-                "status": "ok",
-                "processed": 0,
-                "errors": 0,
-                "enqueued_embedding_tasks": 0,
-                "enqueued_embeddings": 0,
-                "enqueued_recommendations": 0,
-            }
+        job_vacancies: list[tuple[int, str | None, dict[str, Any] | None, frozenset[str]]] = []
+        embedding_stale_ids: set[int] = set()
+        description_by_hash: dict[str, str] = {}
+        for row in rows:
+            stored = (
+                {key: value for key, value in row._mapping.items() if key not in ("title", "description")}
+                if row.parsed_vacancy_id is not None
+                else None
+            )
+            stages = stale_stages(stored, force=force)
+            if row.embedding_text_version != EMBEDDING_TEXT_VERSION:
+                embedding_stale_ids.add(row.id)
+            if stages:
+                digest = None
+                if stages & {STAGE_PARSE, STAGE_REQUIREMENTS}:
+                    digest = parse_cache.description_hash(row.description or "")
+                    description_by_hash[digest] = row.description or ""
+                job_vacancies.append((row.id, digest, stored, stages))
 
-        hh_import_service = HHImportService(db=db, hh_client=cast(Any, None))
-        processed = 0
-        errors = 0
-        processed_vacancy_ids: list[int] = []
+        # Одинаковые описания разбираются один раз: сначала общий кеш, затем пул процессов по уникальным хешам.
+        entries = parse_cache.load_entries(db, description_by_hash)
+        missing_hashes = sorted(
+            digest
+            for digest in description_by_hash
+            if force or digest not in entries or not parse_cache.is_current(entries[digest])
+        )
+        derived_entries = parse_cache.derive_many(
+            [(description_by_hash[digest], None if force else entries.get(digest)) for digest in missing_hashes],
+            _parse_processes(),
+        )
+        new_entries = {digest: entry for digest, entry in zip(missing_hashes, derived_entries) if entry is not None}
+        entries.update(new_entries)
+        missing_hash_set = set(missing_hashes)
+        cache_hits = sum(1 for _, digest, _, _ in job_vacancies if digest and digest not in missing_hash_set)
 
-        for vacancy_id in vacancy_ids:
-            vacancy = db.get(Vacancy, vacancy_id)
-            if vacancy is None:
+        current_requirements_version = requirements_version()
+        parsed_by_vacancy: list[tuple[int, dict[str, Any]]] = []
+        new_requirements: dict[int, list[dict[str, Any]]] = {}
+        plain_text_changed: set[int] = set()
+        reparsed = 0
+        for vacancy_id, digest, stored, stages in job_vacancies:
+            entry = entries.get(digest) if digest else None
+            if digest and entry is None:
                 continue
-
             try:
-                parsed = parse_hh_description(vacancy.description or "")
-                section_requirements = extract_requirements_from_sections(parsed.get("sections") or {})
-                hh_import_service._upsert_vacancy_parsed(vacancy_id, parsed)
-                hh_import_service._replace_generated_requirements(
-                    vacancy_id,
-                    details=None,
-                    parsed=parsed,
-                    section_requirements=section_requirements,
-                )
-                processed += 1
-                processed_vacancy_ids.append(vacancy_id)
+                parsed, requirement_rows = derive_vacancy_stages(entry, stored, stages)
             except Exception:  # noqa: BLE001
-                db.rollback()
-                errors += 1
-                logger.exception("Failed to backfill HH parsed vacancy | vacancy_id=%s", vacancy_id)
+                logger.exception("Failed to derive HH vacancy stages | vacancy_id=%s", vacancy_id)
                 continue
+            parsed["requirements_version"] = current_requirements_version
+            parsed["features_version"] = FEATURES_VERSION
+            parsed_by_vacancy.append((vacancy_id, parsed))
+            if STAGE_PARSE in stages:
+                reparsed += 1
+                if stored is None or stored["plain_text"] != parsed["plain_text"]:
+                    plain_text_changed.add(vacancy_id)
+            if requirement_rows is not None:
+                new_requirements[vacancy_id] = requirement_rows
 
-            if processed % COMMIT_BATCH_SIZE == 0:
-                db.commit()
+        # Требования переписываем только там, где набор строк действительно изменился.
+        stored_requirements = _stored_requirements(db, list(new_requirements))
+        changed_requirements = {
+            vacancy_id: requirement_rows
+            for vacancy_id, requirement_rows in new_requirements.items()
+            if sorted(map(_requirement_key, requirement_rows)) != sorted(stored_requirements[vacancy_id])
+        }
 
-        db.commit()
+        # Подписи near-duplicate: assign_clusters сам пропускает вакансии с неизменившимся текстом.
+        plain_text_by_vacancy = {row.id: row.plain_text for row in rows if row.plain_text is not None}
+        plain_text_by_vacancy.update((vacancy_id, parsed["plain_text"]) for vacancy_id, parsed in parsed_by_vacancy)
+        title_by_vacancy = {row.id: row.title for row in rows}
+        signature_items = [
+            (vacancy_id, vacancy_dedup.signature_text(title_by_vacancy.get(vacancy_id), plain_text))
+            for vacancy_id, plain_text in sorted(plain_text_by_vacancy.items())
+        ]
+
+        errors = len(job_vacancies) - len(parsed_by_vacancy)
+        hh_import_service = HHImportService(db=db, hh_client=cast(Any, None))
+        try:
+            parse_cache.store_entries(db, new_entries)
+            hh_import_service._bulk_upsert_vacancy_parsed(parsed_by_vacancy)
+            hh_import_service._bulk_replace_generated_requirements(changed_requirements)
+            vacancy_dedup.assign_clusters(db, signature_items)
+            db.commit()
+        except Exception:  # noqa: BLE001
+            db.rollback()
+            logger.exception("Failed to write HH parsed chunk | size=%s", len(vacancy_ids))
+            return {
+                "status": "error",
+                "processed": 0,
+                "errors": len(job_vacancies),
+                "missing": len(vacancy_ids) - len(rows),
+                "enqueued_embedding_tasks": 0,
+                "enqueued_embeddings": 0,
+            }
 
+        rescore_ids = sorted(set(changed_requirements) | plain_text_changed)
+        embedding_ids = sorted(embedding_stale_ids | set(rescore_ids))
         enqueued_embedding_tasks = 0
         enqueued_embeddings = 0
-        if schedule_embeddings and processed_vacancy_ids:
+        enqueued_score_ids = 0
+        if schedule_embeddings and embedding_ids:
             batch_size = max(1, embedding_batch_size)
-            for start in range(0, len(processed_vacancy_ids), batch_size):
-                batch_ids = processed_vacancy_ids[start : start + batch_size]
-                rebuild_vacancy_embeddings_for_ids.delay(batch_ids)
+            rescore_id_set = set(rescore_ids)
+            for start in range(0, len(embedding_ids), batch_size):
+                batch_ids = embedding_ids[start : start + batch_size]
+                batch_rescore_ids = [vacancy_id for vacancy_id in batch_ids if vacancy_id in rescore_id_set]
+                rebuild_vacancy_embeddings_for_ids.delay(
+                    batch_ids,
+                    only_changed=True,
+                    rescore_ids=batch_rescore_ids if schedule_scores else None,
+                )
                 enqueued_embedding_tasks += 1
                 enqueued_embeddings += len(batch_ids)
+                enqueued_score_ids += len(batch_rescore_ids) if schedule_scores else 0
+        elif schedule_scores and rescore_ids:
+            from app.tasks.matching_tasks import recompute_vacancy_scores
 
-        enqueued_recommendations = 0
-        if schedule_recommendations:
-            try:
-                from app.tasks.matching_tasks import compute_profile_recommendations
-
-                for profile_id in RECOMMENDATION_PROFILES:
-                    compute_profile_recommendations.delay(profile_id, recommendations_limit)
-                    enqueued_recommendations += 1
-            except Exception:  # noqa: BLE001
-                logger.exception("Failed to enqueue profile recommendations recompute")
+            recompute_vacancy_scores.delay(rescore_ids)
+            enqueued_score_ids = len(rescore_ids)
 
         return {
             "status": "ok",
-            "processed": processed,
+            "processed": len(parsed_by_vacancy),
             "errors": errors,
+            "missing": len(vacancy_ids) - len(rows),
+            "reparsed": reparsed,
+            "cache_hits": cache_hits,
+            "cache_misses": len(missing_hashes),
+            "requirements_rebuilt": len(new_requirements),
+            "requirements_changed": len(changed_requirements),
+            "plain_text_changed": len(plain_text_changed),
             "enqueued_embedding_tasks": enqueued_embedding_tasks,
             "enqueued_embeddings": enqueued_embeddings,
-            "enqueued_recommendations": enqueued_recommendations,
-            "targeted": len(vacancy_ids),
-            "only_missing": only_missing,
-            "limit": limit,
-            "version": HH_PARSER_VERSION,
-            "schedule_embeddings": schedule_embeddings,
-            "schedule_recommendations": schedule_recommendations,
-            "embedding_batch_size": max(1, embedding_batch_size),
-            "recommendations_limit": recommendations_limit,
+            "enqueued_score_vacancies": enqueued_score_ids,
         }
     except Exception:  # noqa: BLE001
         db.rollback()
-        logger.exception("Failed to backfill HH parsed vacancies")
+        logger.exception("Failed to backfill HH parsed chunk | size=%s", len(vacancy_ids))
+        raise
+    finally:
+        db.close()
+
+
+@celery_app.task(name="app.tasks.vacancy_parsing_tasks.finalize_hh_parsed_backfill")
+def finalize_hh_parsed_backfill(
+    chunk_results: list[dict[str, Any]],
+    schedule_recommendations: bool = True,
+    recommendations_limit: int = 50,
+) -> dict[str, Any]:
+    totals = {
+        key: sum(int(result.get(key) or 0) for result in chunk_results)
+        for key in (
+            "processed",
+            "errors",
+            "missing",
+            "reparsed",
+            "cache_hits",
+            "cache_misses",
+            "requirements_rebuilt",
+            "requirements_changed",
+            "plain_text_changed",
+            "enqueued_embedding_tasks",
+            "enqueued_embeddings",
+            "enqueued_score_vacancies",
+        )
+    }
+
+    enqueued_recommendations = 0
+    if schedule_recommendations and totals["processed"]:
+        try:
+            from app.tasks.matching_tasks import compute_profile_recommendations
+
+            for profile_id in RECOMMENDATION_PROFILES:
+                compute_profile_recommendations.delay(profile_id, recommendations_limit)
+                enqueued_recommendations += 1
+        except Exception:  # noqa: BLE001
+            logger.exception("Failed to enqueue profile recommendations recompute")
+
+    return {
+        "status": "ok",
+        "chunks": len(chunk_results),
+        "failed_chunks": sum(1 for result in chunk_results if result.get("status") != "ok"),
+        **totals,
+        "enqueued_recommendations": enqueued_recommendations,
+        "version": PARSE_VERSION,
+    }
+
+
+@celery_app.task(name="app.tasks.vacancy_parsing_tasks.rebuild_vacancy_clusters")
+def rebuild_vacancy_clusters(batch_size: int = CHUNK_SIZE) -> dict[str, Any]:
+    """Compute missing/outdated near-duplicate signatures, then rebuild every cluster from scratch."""
+
+    db = SessionLocal()
+    try:
+        vacancy_ids = list(
+            db.execute(select(VacancyParsed.vacancy_id).order_by(VacancyParsed.vacancy_id.asc())).scalars().all()
+        )
+        batch_size = max(1, batch_size)
+        for start in range(0, len(vacancy_ids), batch_size):
+            batch_ids = vacancy_ids[start : start + batch_size]
+            rows = db.execute(
+                select(Vacancy.id, Vacancy.title, VacancyParsed.plain_text)
+                .join(VacancyParsed, Vacancy.id == VacancyParsed.vacancy_id)
+                .where(Vacancy.id.in_(batch_ids))
+                .order_by(Vacancy.id.asc())
+            ).all()
+            vacancy_dedup.assign_clusters(
+                db, [(row.id, vacancy_dedup.signature_text(row.title, row.plain_text)) for row in rows]
+            )
+            db.commit()
+
+        stats = vacancy_dedup.recluster_all(db)
+        db.commit()
+        return {"status": "ok", "version": vacancy_dedup.SIGNATURE_VERSION, **stats}
+    except Exception:  # noqa: BLE001
+        db.rollback()
+        logger.exception("Failed to rebuild vacancy clusters")
         raise
     finally:
         db.close()
+
+
+@celery_app.task(name="app.tasks.vacancy_parsing_tasks.backfill_hh_parsed")
+def backfill_hh_parsed(
+    limit: int | None = None,
+    only_missing: bool = True,
+    schedule_embeddings: bool = True,
+    schedule_recommendations: bool = True,
+    embedding_batch_size: int = EMBEDDING_BATCH_SIZE,
+    recommendations_limit: int = 50,
+    chunk_size: int = CHUNK_SIZE,
+    schedule_scores: bool = True,
+) -> dict[str, Any]:
+    """only_missing=True: vacancies with a stale stage; False: recompute every stage of every HH vacancy."""
+
+    db = SessionLocal()
+    try:
+        purged_cache_entries = parse_cache.purge_stale_entries(db)
+        db.commit()
+        vacancy_ids = _select_target_ids(
+            db, limit=limit, only_missing=only_missing, include_embeddings=schedule_embeddings
+        )
+    finally:
+        db.close()
+
+    if purged_cache_entries:
+        logger.info("Purged parse cache entries of old parser versions | count=%s", purged_cache_entries)
+
+    if not vacancy_ids:
+        return {
+            "status": "ok",
+            "processed": 0,
+            "errors": 0,
+            "enqueued_embedding_tasks": 0,
+            "enqueued_embeddings": 0,
+            "enqueued_recommendations": 0,
+        }
+
+    chunk_size = max(1, chunk_size)
+    chunk_signatures = [
+        backfill_hh_parsed_chunk.s(
+            vacancy_ids[start : start + chunk_size],
+            schedule_embeddings,
+            embedding_batch_size,
+            not only_missing,
+            schedule_scores,
+        )
+        for start in range(0, len(vacancy_ids), chunk_size)
+    ]
+    finalize_result = chord(group(chunk_signatures))(
+        finalize_hh_parsed_backfill.s(
+            schedule_recommendations=schedule_recommendations,
+            recommendations_limit=recommendations_limit,
+        )
+    )
+    # GroupResult сохраняем в backend, чтобы /tasks/{task_id} мог собрать прогресс по чанкам.
+    group_result = finalize_result.parent
+    group_result.save()
+
+    logger.info(
+        "HH parsed backfill dispatched | targeted=%s chunks=%s group_id=%s",
+        len(vacancy_ids),
+        len(chunk_signatures),
+        group_result.id,
+    )
+    return {
+        "status": "dispatched",
+        "targeted": len(vacancy_ids),
+        "chunks": len(chunk_signatures),
+        "chunk_size": chunk_size,
+        "group_id": group_result.id,
+        "finalize_task_id": finalize_result.id,
+        "only_missing": only_missing,
+        "limit": limit,
+        "versions": {
+            "parse": PARSE_VERSION,
+            "requirements": requirements_version(),
+            "features": FEATURES_VERSION,
+            "embedding_text": EMBEDDING_TEXT_VERSION,
+        },
+        "schedule_embeddings": schedule_embeddings,
+        "schedule_scores": schedule_scores,
+        "schedule_recommendations": schedule_recommendations,
+        "embedding_batch_size": max(1, embedding_batch_size),
+        "recommendations_limit": recommendations_limit,
+    }
@@ -8,8 +8,23 @@ from html.parser import HTMLParser
 _BREAK_TAGS = {"br", "p", "li"}
 _BLOCK_TAGS = {"div", "ul", "ol", "tr", "table", "section", "article"}
 _WHITESPACE_RE = re.compile(r"[ \t\f\v\u00a0]+")
+_SPACE_LIKE_CHARS = ("\t", "\f", "\v", "\u00a0")
 _EXTRA_NEWLINES_RE = re.compile(r"\n{3,}")
 
+# Быстрый путь: строгое подмножество HTML, которое HH отдаёт в описаниях (p, li, br, ul, strong, ...).
+# Теги без атрибутов или с атрибутами в кавычках, сущности вида &name; / &#123; / &#x1F;.
+# Всё остальное (комментарии, script/style, «голые» & и <, нестандартные атрибуты) уходит в HTMLParser.
+_TAG_WS = r"[ \t\n\r\f]"
+_TAG_NAME = r"[a-zA-Z][a-zA-Z0-9]*"
+_TAG_ATTRS = rf"(?:{_TAG_WS}+[a-zA-Z_:][-a-zA-Z0-9_:.]*(?:{_TAG_WS}*={_TAG_WS}*(?:\"[^\"<>]*\"|'[^'<>]*'))?)*"
+_SIMPLE_TAG_RE = re.compile(rf"<({_TAG_NAME}){_TAG_ATTRS}{_TAG_WS}*(/?)>|</({_TAG_NAME}){_TAG_WS}*>")
+# Тот же шаблон без групп — для быстрой проверки, что каждый "<" открывает простой тег.
+_SIMPLE_TAG_SCAN_RE = re.compile(rf"<{_TAG_NAME}{_TAG_ATTRS}{_TAG_WS}*/?>|</{_TAG_NAME}{_TAG_WS}*>")
+_CDATA_TAG_RE = re.compile(r"<(?:script|style)[\s/>]", re.IGNORECASE)
+_NON_ENTITY_AMPERSAND_RE = re.compile(r"&(?!(?:[a-zA-Z][-.a-zA-Z0-9]*|#[0-9]+|#[xX][0-9a-fA-F]+);)")
+# Заменитель тегов без перевода строки: не даёт склеить сущность через удалённый тег.
+_TAG_PLACEHOLDER = "\x01"
+
 
 class _HTMLStripper(HTMLParser):
     def __init__(self) -> None:
@@ -38,20 +53,100 @@ class _HTMLStripper(HTMLParser):
         return "".join(self._chunks)
 
 
-def strip_html(html: str) -> str:
-    """Convert HTML to plain text with normalized spacing/new lines."""
+def _simple_tag_replacement(tag: str, *, is_end: bool, self_closing: bool = False) -> str:
+    if is_end:
+        return "\n" if tag in _BREAK_TAGS or tag in _BLOCK_TAGS else _TAG_PLACEHOLDER
+
+    replacement = "\n" if tag in _BREAK_TAGS else ""
+    # <br/> в HTMLParser — это start + end тег.
+    if self_closing and (tag in _BREAK_TAGS or tag in _BLOCK_TAGS):
+        replacement += "\n"
+    return replacement or _TAG_PLACEHOLDER
+
+
+def _replace_simple_tag(match: re.Match[str]) -> str:
+    start_tag, self_closing, end_tag = match.group(1, 2, 3)
+    if end_tag is not None:
+        return _simple_tag_replacement(end_tag.lower(), is_end=True)
+    return _simple_tag_replacement(start_tag.lower(), is_end=False, self_closing=bool(self_closing))
 
-    if not html:
-        return ""
 
+# Самые частые теги HH заменяем str.replace до регулярки — без Python-callback на каждый тег.
+_LITERAL_TAG_REPLACEMENTS = tuple(
+    (f"<{tag}{suffix}>", _simple_tag_replacement(tag, is_end=False, self_closing=bool(suffix)))
+    for tag in ("p", "li", "br", "ul", "ol", "strong", "b", "em", "i", "div", "span")
+    for suffix in ("", "/", " /")
+) + tuple(
+    (f"</{tag}>", _simple_tag_replacement(tag, is_end=True))
+    for tag in ("p", "li", "br", "ul", "ol", "strong", "b", "em", "i", "div", "span")
+)
+
+
+def _extract_text_fast(html: str) -> str | None:
+    """Text with tags replaced like _HTMLStripper does, or None if html is outside the simple subset."""
+
+    if _TAG_PLACEHOLDER in html or _CDATA_TAG_RE.search(html):
+        return None
+    # Каждое вхождение "<" должно начинать простой тег; тогда литеральные замены совпадают с тегами.
+    if len(_SIMPLE_TAG_SCAN_RE.findall(html)) != html.count("<"):
+        return None
+
+    text = html
+    for literal, replacement in _LITERAL_TAG_REPLACEMENTS:
+        if literal in text:
+            text = text.replace(literal, replacement)
+    if "<" in text:
+        text = _SIMPLE_TAG_RE.sub(_replace_simple_tag, text)
+
+    if "&" in text and _NON_ENTITY_AMPERSAND_RE.search(text):
+        return None
+    return text.replace(_TAG_PLACEHOLDER, "")
+
+
+def _extract_text_with_parser(html: str) -> str:
     parser = _HTMLStripper()
     parser.feed(html)
     parser.close()
+    return parser.get_data()
+
 
-    text = unescape(parser.get_data())
+def _normalize_text(raw_text: str) -> str:
+    text = unescape(raw_text) if "&" in raw_text else raw_text
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    # Эквивалент _WHITESPACE_RE.sub(" ", ...) на str.replace: пробельные символы -> пробел, затем схлопываем пробелы.
+    for char in _SPACE_LIKE_CHARS:
+        if char in text:
+            text = text.replace(char, " ")
+    while "  " in text:
+        text = text.replace("  ", " ")
+    text = "\n".join([line.strip() for line in text.split("\n")])
+    if "\n\n\n" in text:
+        text = _EXTRA_NEWLINES_RE.sub("\n\n", text)
+    return text.strip()
+
+
+def strip_html_reference(html: str) -> str:
+    """Reference implementation on top of HTMLParser (used for equivalence checks)."""
+
+    if not html:
+        return ""
+
+    text = unescape(_extract_text_with_parser(html))
     text = text.replace("\r\n", "\n").replace("\r", "\n")
 
     normalized_lines = [_WHITESPACE_RE.sub(" ", line).strip() for line in text.split("\n")]
     text = "\n".join(normalized_lines)
     text = _EXTRA_NEWLINES_RE.sub("\n\n", text)
     return text.strip()
+
+
+def strip_html(html: str) -> str:
+    """Convert HTML to plain text with normalized spacing/new lines."""
+
+    if not html:
+        return ""
+
+    raw_text = _extract_text_fast(html)
+    if raw_text is None:
+        raw_text = _extract_text_with_parser(html)
+    return _normalize_text(raw_text)
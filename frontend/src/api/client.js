@@ -2,7 +2,8 @@ import { API_PREFIX, getApiBaseUrl } from '../config.js';
 
 export async function apiFetch(path, options) {
   const baseUrl = getApiBaseUrl();
-  const response = await fetch(`${baseUrl}${API_PREFIX}${path}`, options);
+  // credentials: cookie read-your-writes нужна и при явном cross-origin API base URL.
+  const response = await fetch(`${baseUrl}${API_PREFIX}${path}`, { credentials: 'include', ...options });
   const contentType = response.headers.get('content-type') ?? '';
 
   if (!response.ok) {
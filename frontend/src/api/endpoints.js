@@ -1,8 +1,27 @@
 import { DEFAULT_LIMIT, DEFAULT_PROFILE_ID } from '../config.js';
 import { apiFetch } from './client.js';
 
-export function getVacancies() {
-  return apiFetch('/vacancies');
+export function getVacancies({ limit = DEFAULT_LIMIT, cursor, ...filters } = {}) {
+  const params = new URLSearchParams({ limit: String(limit) });
+  if (cursor) {
+    params.set('cursor', cursor);
+  }
+  Object.entries(filters).forEach(([key, value]) => {
+    if (value !== undefined && value !== null && value !== '') {
+      params.set(key, String(value));
+    }
+  });
+  return apiFetch(`/vacancies?${params.toString()}`);
+}
+
+export function searchVacancies({ q, limit = DEFAULT_LIMIT, offset = 0, ...filters }) {
+  const params = new URLSearchParams({ q, limit: String(limit), offset: String(offset) });
+  Object.entries(filters).forEach(([key, value]) => {
+    if (value !== undefined && value !== null && value !== '') {
+      params.set(key, String(value));
+    }
+  });
+  return apiFetch(`/vacancies/search?${params.toString()}`);
 }
 
 export function getVacancyById(vacancyId) {
@@ -13,6 +32,20 @@ export function getProfile(profileId = DEFAULT_PROFILE_ID) {
   return apiFetch(`/profiles/${profileId}`);
 }
 
+export function getProfileFull(profileId = DEFAULT_PROFILE_ID) {
+  return apiFetch(`/profiles/${profileId}/full`);
+}
+
+export function updateProfileFull(profileId = DEFAULT_PROFILE_ID, payload) {
+  return apiFetch(`/profiles/${profileId}/full`, {
+    method: 'PUT',
+    headers: {
+      'Content-Type': 'application/json',
+    },
+    body: JSON.stringify(payload),
+  });
+}
+
 export function updateProfile(profileId = DEFAULT_PROFILE_ID, payload) {
   return apiFetch(`/profiles/${profileId}`, {
     method: 'PUT',
@@ -24,17 +24,7 @@ import {
   deleteProject,
   deleteResumeVersion,
   deleteSkill,
-  getProfile,
-  listAchievements,
-  listCertificates,
-  listCoverLetterVersions,
-  listEducation,
-  listExperiences,
-  listLanguages,
-  listLinks,
-  listProjects,
-  listResumeVersions,
-  listSkills,
+  getProfileFull,
   recomputeAllProfileData,
   recomputeRecommendations,
   updateAchievement,
@@ -122,31 +112,19 @@ export default function SettingsPage() {
       setLoading(true);
       setError('');
       try {
-        const [
-          profileData,
-          experiencesData,
-          projectsData,
-          achievementsData,
-          educationData,
-          certificatesData,
-          skillsData,
-          languagesData,
-          linksData,
-          resumeData,
-          letterData,
-        ] = await Promise.all([
-          getProfile(DEFAULT_PROFILE_ID),
-          listExperiences(DEFAULT_PROFILE_ID),
-          listProjects(DEFAULT_PROFILE_ID),
-          listAchievements(DEFAULT_PROFILE_ID),
-          listEducation(DEFAULT_PROFILE_ID),
-          listCertificates(DEFAULT_PROFILE_ID),
-          listSkills(DEFAULT_PROFILE_ID),
-          listLanguages(DEFAULT_PROFILE_ID),
-          listLinks(DEFAULT_PROFILE_ID),
-          listResumeVersions(DEFAULT_PROFILE_ID),
-          listCoverLetterVersions(DEFAULT_PROFILE_ID),
-        ]);
+        const {
+          experiences: experiencesData,
+          projects: projectsData,
+          achievements: achievementsData,
+          education: educationData,
+          certificates: certificatesData,
+          skills: skillsData,
+          languages: languagesData,
+          links: linksData,
+          resume_versions: resumeData,
+          cover_letter_versions: letterData,
+          ...profileData
+        } = await getProfileFull(DEFAULT_PROFILE_ID);
         setProfile(profileData);
         setTeamPreferencesText(JSON.stringify(profileData.team_preferences_json ?? {}, null, 2));
         setExperiences(experiencesData.sort((a, b) => (a.start_date < b.start_date ? 1 : -1)));
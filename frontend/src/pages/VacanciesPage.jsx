@@ -1,6 +1,6 @@
-import { useEffect, useMemo, useState } from 'react';
+import { useEffect, useState } from 'react';
 
-import { getTask, getVacancies, startHhImport } from '../api/endpoints.js';
+import { getTask, getVacancies, searchVacancies, startHhImport } from '../api/endpoints.js';
 import ErrorBanner from '../components/ErrorBanner.jsx';
 import Loading from '../components/Loading.jsx';
 import VacancyCard from '../components/VacancyCard.jsx';
@@ -15,12 +15,49 @@ const DEFAULT_IMPORT_PAYLOAD = {
 };
 
 const IMPORT_POLL_INTERVAL_MS = 2000;
+const VACANCIES_PAGE_SIZE = 50;
+const SEARCH_DEBOUNCE_MS = 300;
+// GET /vacancies/search принимает offset не больше 1000.
+const SEARCH_MAX_OFFSET = 1000;
+
+function buildVacancyQuery(onlyOpen, cursor) {
+  return {
+    limit: VACANCIES_PAGE_SIZE,
+    cursor,
+    status: onlyOpen ? 'open' : undefined,
+  };
+}
+
+// Поиск идёт на сервере: по загруженным страницам нашлась бы только их часть.
+// nextPage — next_cursor списка или offset следующей страницы поиска.
+async function fetchVacancyPage(query, onlyOpen, nextPage) {
+  const status = onlyOpen ? 'open' : undefined;
+  if (query) {
+    const offset = nextPage ?? 0;
+    const response = await searchVacancies({ q: query, limit: VACANCIES_PAGE_SIZE, offset, status });
+    const items = Array.isArray(response?.items) ? response.items : [];
+    const nextOffset = offset + VACANCIES_PAGE_SIZE;
+    return {
+      items,
+      nextPage: items.length === VACANCIES_PAGE_SIZE && nextOffset <= SEARCH_MAX_OFFSET ? nextOffset : null,
+    };
+  }
+
+  const response = await getVacancies(buildVacancyQuery(onlyOpen, nextPage));
+  return {
+    items: Array.isArray(response?.items) ? response.items : [],
+    nextPage: response?.next_cursor ?? null,
+  };
+}
 
 export default function VacanciesPage() {
   const [vacancies, setVacancies] = useState([]);
+  const [nextPage, setNextPage] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState('');
   const [search, setSearch] = useState('');
+  const [query, setQuery] = useState('');
   const [onlyOpen, setOnlyOpen] = useState(false);
   const [isImporting, setIsImporting] = useState(false);
   const [importTaskId, setImportTaskId] = useState('');
@@ -28,6 +65,11 @@ export default function VacanciesPage() {
   const [importError, setImportError] = useState('');
   const [importSuccess, setImportSuccess] = useState('');
 
+  useEffect(() => {
+    const timeoutId = setTimeout(() => setQuery(search.trim()), SEARCH_DEBOUNCE_MS);
+    return () => clearTimeout(timeoutId);
+  }, [search]);
+
   useEffect(() => {
     let isMounted = true;
 
@@ -36,9 +78,10 @@ export default function VacanciesPage() {
       setError('');
 
       try {
-        const response = await getVacancies();
+        const page = await fetchVacancyPage(query, onlyOpen);
         if (isMounted) {
-          setVacancies(Array.isArray(response) ? response : []);
+          setVacancies(page.items);
+          setNextPage(page.nextPage);
         }
       } catch (requestError) {
         if (isMounted) {
@@ -56,7 +99,7 @@ export default function VacanciesPage() {
     return () => {
       isMounted = false;
     };
-  }, []);
+  }, [onlyOpen, query]);
 
   useEffect(() => {
     if (!importTaskId) {
@@ -80,11 +123,12 @@ export default function VacanciesPage() {
           setImportTaskId('');
           setIsImporting(false);
 
-          const response = await getVacancies();
+          const page = await fetchVacancyPage(query, onlyOpen);
           if (!isActive) {
             return;
           }
-          setVacancies(Array.isArray(response) ? response : []);
+          setVacancies(page.items);
+          setNextPage(page.nextPage);
           setImportSuccess('Импорт вакансий завершён.');
         }
 
@@ -113,36 +157,30 @@ export default function VacanciesPage() {
       isActive = false;
       clearInterval(intervalId);
     };
-  }, [importTaskId]);
-
-  const normalizedSearch = search.trim().toLowerCase();
-
-  const filteredVacancies = useMemo(() => {
-    return vacancies.filter((vacancy) => {
-      const title = vacancy.title?.toLowerCase() ?? '';
-      const company = vacancy.company_name?.toLowerCase() ?? vacancy.company?.toLowerCase() ?? '';
-      const location = vacancy.location?.toLowerCase() ?? '';
-      const matchesSearch =
-        normalizedSearch.length === 0
-        || title.includes(normalizedSearch)
-        || company.includes(normalizedSearch)
-        || location.includes(normalizedSearch);
-
-      if (!matchesSearch) {
-        return false;
-      }
+  }, [importTaskId, onlyOpen, query]);
 
-      if (!onlyOpen) {
-        return true;
-      }
+  const emptyStateMessage = query || onlyOpen
+    ? 'Нет вакансий по текущим фильтрам. Попробуйте изменить поиск или отключить "Only open".'
+    : 'Пока нет вакансий. Импортируйте вакансии, чтобы они появились здесь.';
 
-      return vacancy.status?.toLowerCase() === 'open';
-    });
-  }, [normalizedSearch, onlyOpen, vacancies]);
+  async function handleLoadMore() {
+    if (nextPage === null) {
+      return;
+    }
 
-  const emptyStateMessage = vacancies.length === 0
-    ? 'Пока нет вакансий. Импортируйте вакансии, чтобы они появились здесь.'
-    : 'Нет вакансий по текущим фильтрам. Попробуйте изменить поиск или отключить "Only open".';
+    setLoadingMore(true);
+    setError('');
+
+    try {
+      const page = await fetchVacancyPage(query, onlyOpen, nextPage);
+      setVacancies((current) => [...current, ...page.items]);
+      setNextPage(page.nextPage);
+    } catch (requestError) {
+      setError(requestError.message || 'Failed to load vacancies.');
+    } finally {
+      setLoadingMore(false);
+    }
+  }
 
   async function handleStartImport() {
     setImportError('');
@@ -186,7 +224,7 @@ export default function VacanciesPage() {
           type="search"
           value={search}
           onChange={(event) => setSearch(event.target.value)}
-          placeholder="Search by title, company or location"
+          placeholder="Search by title or description"
           aria-label="Search vacancies"
         />
         <label className="vacancy-filters__toggle">
@@ -203,9 +241,9 @@ export default function VacanciesPage() {
       {!loading && error ? <ErrorBanner message={error} /> : null}
 
       {!loading && !error ? (
-        filteredVacancies.length > 0 ? (
+        vacancies.length > 0 ? (
           <div className="vacancy-grid">
-            {filteredVacancies.map((vacancy) => (
+            {vacancies.map((vacancy) => (
               <VacancyCard
                 key={vacancy.id}
                 title={getSafeText(vacancy.title, 'Vacancy title not specified')}
@@ -222,6 +260,17 @@ export default function VacanciesPage() {
           <p className="loading">{emptyStateMessage}</p>
         )
       ) : null}
+
+      {!loading && !error && nextPage !== null ? (
+        <button
+          className="recommendations-toolbar__button"
+          type="button"
+          onClick={handleLoadMore}
+          disabled={loadingMore}
+        >
+          {loadingMore ? 'Загрузка...' : 'Показать ещё'}
+        </button>
+      ) : null}
     </section>
   );
 }